@@ -1,18 +1,34 @@
 """Background scraper service for autonomous LinkedIn job monitoring"""
 
 import asyncio
+import time
 from dataclasses import asdict, dataclass
 from datetime import datetime
+from functools import cached_property
 
+import httpx
 from loguru import logger
 
 from linkedin_mcp_server.db import JobDatabase
 from linkedin_mcp_server.scraper import (
     create_client,
+    JobSummary,
     fetch_job_details,
     search_jobs_pages,
 )
 
+# Seconds between flushes of buffered last-run timestamps to the DB
+LAST_RUN_FLUSH_INTERVAL = 60
+
+# Jobs seen within this window are not re-fetched (details refresh at most once per window)
+RECENT_JOB_WINDOW_HOURS = 24
+# Seconds between reloads of the recently-seen job IDs from the DB
+RECENT_JOB_IDS_RELOAD_INTERVAL = 3600
+
+# Search results are shared across profiles with identical searches for this long
+SEARCH_CACHE_TTL = 300
+SEARCH_CACHE_MAXSIZE = 256
+
 
 @dataclass
 class ScrapingProfile:
@@ -30,6 +46,22 @@ class ScrapingProfile:
     created_at: str
     updated_at: str
 
+    @cached_property
+    def search_key(self) -> tuple:
+        """Hashable identity of this profile's search, for sharing results"""
+        return (self.keywords, self.location, self.distance, self.time_filter)
+
+    @cached_property
+    def search_kwargs(self) -> dict:
+        """Keyword arguments for search_jobs_pages, built once per profile"""
+        return {
+            "query": self.keywords,
+            "location": self.location,
+            "distance": self.distance,
+            "num_pages": 5,  # 50 jobs per scrape
+            "filters": {"f_TPR": self.time_filter},  # Time filter: r7200 (2h) default
+        }
+
 
 class BackgroundScraperService:
     """Autonomous background scraper service with async workers"""
@@ -42,6 +74,15 @@ class BackgroundScraperService:
         self.company_semaphore = asyncio.Semaphore(
             2
         )  # Conservative for company enrichment
+        # profile_id → last scrape timestamp, flushed to DB in batches
+        self._pending_last_run: dict[int, str] = {}
+        # profile_id → event that interrupts the worker's wait between scrapes
+        self._wakes: dict[int, asyncio.Event] = {}
+        # IDs of jobs fetched within RECENT_JOB_WINDOW_HOURS, shared by all workers
+        self._recent_job_ids: set[str] = set()
+        self._recent_job_ids_loaded_at = float("-inf")
+        # search_key → (monotonic fetch time, search results), shared by all workers
+        self._search_cache: dict[tuple, tuple[float, list[JobSummary]]] = {}
 
     async def start(self):
         """Load profiles from DB and spawn worker tasks"""
@@ -50,8 +91,8 @@ class BackgroundScraperService:
         # Seed default profile if none exist
         profiles = self.db.list_profiles()
         if not profiles:
-            self.db.seed_default_profile()
-            profiles = self.db.list_profiles()
+            seeded = self.db.seed_default_profile()
+            profiles = [seeded] if seeded else self.db.list_profiles()
 
         # Spawn worker for each enabled profile
         for profile_dict in profiles:
@@ -62,6 +103,9 @@ class BackgroundScraperService:
         # Start profile reload loop (check for new/updated/deleted profiles every 30s)
         asyncio.create_task(self._reload_profiles_loop())
 
+        # Start write-behind loop for last-run timestamps
+        asyncio.create_task(self._flush_last_run_loop())
+
         logger.info(f"Started {len(self.worker_tasks)} scraping workers")
 
     async def stop(self):
@@ -69,6 +113,10 @@ class BackgroundScraperService:
         logger.info("Stopping background scraper service...")
         self.shutdown_event.set()
 
+        # Wake all workers out of their wait between scrapes
+        for wake in self._wakes.values():
+            wake.set()
+
         # Cancel all worker tasks
         for task in self.worker_tasks.values():
             task.cancel()
@@ -76,14 +124,24 @@ class BackgroundScraperService:
         # Wait for all tasks to complete (with timeout)
         await asyncio.gather(*self.worker_tasks.values(), return_exceptions=True)
 
+        # Persist any buffered last-run timestamps
+        self._flush_last_runs()
+
         logger.info("Background scraper service stopped")
 
+    def wake_worker(self, profile_id: int):
+        """Interrupt a worker's wait so it picks up profile edits immediately"""
+        wake = self._wakes.get(profile_id)
+        if wake:
+            wake.set()
+
     async def _spawn_worker(self, profile: ScrapingProfile):
         """Spawn async worker task for a profile"""
         if profile.id in self.worker_tasks:
             logger.warning(f"Worker already exists for profile {profile.id}")
             return
 
+        self._wakes[profile.id] = asyncio.Event()
         task = asyncio.create_task(self._run_profile_worker(profile))
         self.worker_tasks[profile.id] = task
         logger.info(f"Spawned worker for profile {profile.id}")
@@ -94,6 +152,7 @@ class BackgroundScraperService:
             return
 
         task = self.worker_tasks.pop(profile_id)
+        self._wakes.pop(profile_id, None)
         task.cancel()
         try:
             await task
@@ -131,31 +190,127 @@ class BackgroundScraperService:
             except Exception as e:
                 logger.error(f"Error reloading profiles: {e}")
 
+    def _flush_last_runs(self):
+        """Write buffered last-run timestamps to the DB in a single batch"""
+        if not self._pending_last_run:
+            return
+
+        pending, self._pending_last_run = self._pending_last_run, {}
+        try:
+            self.db.update_profiles_last_run(pending)
+        except Exception as e:
+            logger.error(f"Error flushing profile last-run timestamps: {e}")
+            # Keep newer timestamps recorded while flushing
+            self._pending_last_run = {**pending, **self._pending_last_run}
+
+    async def _flush_last_run_loop(self):
+        """Flush buffered last-run timestamps every LAST_RUN_FLUSH_INTERVAL seconds"""
+        while not self.shutdown_event.is_set():
+            await asyncio.sleep(LAST_RUN_FLUSH_INTERVAL)
+            self._flush_last_runs()
+
+    async def _wait_for_wake(self, profile_id: int, timeout: float) -> bool:
+        """Wait up to timeout seconds, returning early if the worker is woken
+
+        Args:
+            profile_id: Profile whose wake event to wait on
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if woken before the timeout, False otherwise
+        """
+        wake = self._wakes.setdefault(profile_id, asyncio.Event())
+        try:
+            await asyncio.wait_for(wake.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            wake.clear()
+
     async def _run_profile_worker(self, profile: ScrapingProfile):
         """Worker loop for a single profile - scrape, wait, repeat"""
         logger.info(f"Worker started for profile {profile.id}")
 
+        woken = False
         while not self.shutdown_event.is_set():
             try:
+                if woken:
+                    # Profile was edited: reload it and scrape with the new settings
+                    profile_dict = self.db.get_profile(profile.id)
+                    if not profile_dict or not profile_dict["enabled"]:
+                        logger.info(f"Profile {profile.id} removed or disabled, stopping worker")
+                        break
+                    profile = ScrapingProfile(**profile_dict)
+                    woken = False
+
                 # Scrape jobs for this profile
                 count = await self._scrape_profile_once(profile)
                 logger.info(f"Profile {profile.id}: scraped {count} jobs")
 
-                # Update last_run timestamp
-                self.db.update_profile_last_run(
-                    profile.id, datetime.now().isoformat()
-                )
+                # Record last_run timestamp (flushed to DB in batches)
+                self._pending_last_run[profile.id] = datetime.now().isoformat()
 
-                # Wait for refresh_interval before next scrape
-                await asyncio.sleep(profile.refresh_interval)
+                # Wait for refresh_interval before next scrape, or until woken
+                woken = await self._wait_for_wake(profile.id, profile.refresh_interval)
 
             except asyncio.CancelledError:
                 logger.info(f"Worker cancelled for profile {profile.id}")
                 break
             except Exception as e:
                 logger.error(f"Error in worker for profile {profile.id}: {e}")
-                # Exponential backoff on error
-                await asyncio.sleep(min(profile.refresh_interval, 300))
+                # Exponential backoff on error; an edit during the backoff still reloads
+                if await self._wait_for_wake(profile.id, min(profile.refresh_interval, 300)):
+                    woken = True
+
+        # Deregister if this worker stopped on its own so the reload loop can respawn it
+        if self.worker_tasks.get(profile.id) is asyncio.current_task():
+            del self.worker_tasks[profile.id]
+            self._wakes.pop(profile.id, None)
+
+    def _get_recent_job_ids(self) -> set[str]:
+        """Return recently-seen job IDs, reloading them from the DB when stale
+
+        Reloading drops IDs that fell out of RECENT_JOB_WINDOW_HOURS, so those
+        jobs get their details re-fetched (and changes detected) again.
+        """
+        now = time.monotonic()
+        if now - self._recent_job_ids_loaded_at >= RECENT_JOB_IDS_RELOAD_INTERVAL:
+            self._recent_job_ids = self.db.list_recent_job_ids(since_hours=RECENT_JOB_WINDOW_HOURS)
+            self._recent_job_ids_loaded_at = now
+        return self._recent_job_ids
+
+    async def _search_profile(
+        self, client: httpx.AsyncClient, profile: ScrapingProfile
+    ) -> list[JobSummary]:
+        """Fetch search results for a profile, reusing recent results of identical searches
+
+        Args:
+            client: httpx AsyncClient
+            profile: ScrapingProfile configuration
+
+        Returns:
+            List of JobSummary search results
+        """
+        now = time.monotonic()
+        cached = self._search_cache.get(profile.search_key)
+        if cached and now - cached[0] < SEARCH_CACHE_TTL:
+            logger.info(f"Profile {profile.id}: reusing search results from another profile")
+            return cached[1]
+
+        # Fetch search results (1 page = 10 jobs)
+        summaries = await search_jobs_pages(client, **profile.search_kwargs)
+
+        # Drop expired entries, then the oldest ones if still over capacity
+        self._search_cache = {
+            key: entry for key, entry in self._search_cache.items()
+            if now - entry[0] < SEARCH_CACHE_TTL
+        }
+        while len(self._search_cache) >= SEARCH_CACHE_MAXSIZE:
+            del self._search_cache[next(iter(self._search_cache))]
+        self._search_cache[profile.search_key] = (now, summaries)
+
+        return summaries
 
     async def _scrape_profile_once(self, profile: ScrapingProfile) -> int:
         """Execute one scrape cycle for a profile
@@ -167,28 +322,25 @@ class BackgroundScraperService:
             Count of new/updated jobs
         """
         try:
-            # Build filters
-            filters = {"f_TPR": profile.time_filter}  # Time filter: r7200 (2h) default
-
-            # Fetch search results (1 page = 10 jobs)
-            async with create_client() as client:
-                summaries = await search_jobs_pages(
-                    client,
-                    query=profile.keywords,
-                    location=profile.location,
-                    distance=profile.distance,
-                    num_pages=5,  # 50 jobs per scrape
-                    filters=filters,
-                )
-
-            if not summaries:
-                logger.info(f"No jobs found for profile {profile.id}")
-                return 0
-
-            # Fetch job details with concurrency control
-            job_ids = [s.job_id for s in summaries if s.job_id != "N/A"]
-
+            # One client (and connection pool) for both search and detail requests
             async with create_client() as client:
+                summaries = await self._search_profile(client, profile)
+
+                if not summaries:
+                    logger.info(f"No jobs found for profile {profile.id}")
+                    return 0
+
+                # Only fetch details for jobs not seen recently
+                recent_job_ids = self._get_recent_job_ids()
+                job_ids = [
+                    s.job_id for s in summaries
+                    if s.job_id != "N/A" and s.job_id not in recent_job_ids
+                ]
+                if not job_ids:
+                    logger.info(f"Profile {profile.id}: all {len(summaries)} jobs seen recently")
+                    return 0
+
+                # Fetch job details concurrently, bounded by the shared semaphore
                 details = await fetch_job_details(client, job_ids, self.job_semaphore)
 
             # Convert JobDetail to dict, skip failed scrapes to avoid overwriting good data
@@ -202,43 +354,17 @@ class BackgroundScraperService:
 
                 job_dict = asdict(detail)
                 job_dict["profile_id"] = profile.id
-
-                # Detect changes (compare with existing DB record)
-                existing = self.db.get_job(detail.job_id)
-                if existing:
-                    await self._detect_job_changes(existing, job_dict)
-
                 jobs_to_upsert.append(job_dict)
 
             if skipped:
                 logger.warning(f"Profile {profile.id}: skipped {skipped}/{len(details)} jobs with N/A fields")
 
-            # Batch upsert to DB
+            # Batch upsert to DB (field changes are recorded by a DB trigger)
             count = self.db.upsert_jobs(jobs_to_upsert)
+            recent_job_ids.update(job["job_id"] for job in jobs_to_upsert)
 
             return count
 
         except Exception as e:
             logger.error(f"Error scraping profile {profile.id}: {e}")
             raise
-
-    async def _detect_job_changes(self, old_job: dict, new_job: dict):
-        """Compare old and new job records, record changes to job_changes table
-
-        Args:
-            old_job: Existing job record from database
-            new_job: New job data from scraping
-        """
-        fields_to_track = ["salary", "number_of_applicants", "raw_description"]
-
-        for field in fields_to_track:
-            old_value = old_job.get(field, "")
-            new_value = new_job.get(field, "")
-
-            if old_value != new_value:
-                self.db.record_job_change(
-                    job_id=old_job["job_id"],
-                    field_name=field,
-                    old_value=str(old_value),
-                    new_value=str(new_value),
-                )
@@ -9,14 +9,19 @@ Provides persistent storage with:
 - Job change detection audit log
 """
 
+import copy
+import queue
 import sqlite3
 import json
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime, timezone, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator, Sequence
 from loguru import logger
 
-
 def normalize_company_name(name: str) -> str:
     """
     Normalize company name for fuzzy matching.
@@ -44,6 +49,79 @@ def normalize_company_name(name: str) -> str:
     return normalized.strip()
 
 
+# Column order for jobs upserts; the statement is built once at import time
+_JOB_COLUMNS = (
+    "job_id", "title", "company", "normalized_company_name", "location",
+    "posted_date", "posted_date_iso", "scraped_at", "last_seen",
+    "salary_min", "salary_max", "salary_currency", "equity_offered",
+    "remote_eligible", "visa_sponsorship", "skills", "easy_apply",
+    "number_of_applicants", "description_summary", "key_requirements",
+    "key_responsibilities_preview", "raw_description", "employment_type",
+    "seniority_level", "job_function", "industries", "benefits_badge",
+    "company_url", "url", "profile_id", "source",
+)
+
+
+@lru_cache(maxsize=32)
+def _build_upsert_jobs_sql(columns: tuple[str, ...]) -> str:
+    """Build the jobs upsert statement for a column subset (cached per subset)."""
+    return (
+        f"INSERT INTO jobs ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)}) "
+        "ON CONFLICT(job_id) DO UPDATE SET "
+        + ", ".join(f"{col} = excluded.{col}" for col in columns if col != "job_id")
+    )
+
+
+_UPSERT_JOBS_SQL = _build_upsert_jobs_sql(_JOB_COLUMNS)
+
+# Explicit jobs select lists, so the scraped_at_epoch index helper stays out of
+# returned rows (SELECT * includes generated columns)
+_JOB_SELECT = ", ".join(_JOB_COLUMNS)
+_JOB_SELECT_J = ", ".join(f"j.{col}" for col in _JOB_COLUMNS)
+
+# Hot-path statements kept as constants so every call hits the same cached
+# prepared statement
+_UPSERT_COMPANY_SQL = """
+    INSERT INTO company_enrichment (
+        company_name, normalized_company_name, company_size, company_industry,
+        company_description, company_website, company_headquarters,
+        company_founded, company_specialties, company_linkedin_url,
+        scraped_at, next_refresh_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(normalized_company_name) DO UPDATE SET
+        company_name = excluded.company_name,
+        company_size = excluded.company_size,
+        company_industry = excluded.company_industry,
+        company_description = excluded.company_description,
+        company_website = excluded.company_website,
+        company_headquarters = excluded.company_headquarters,
+        company_founded = excluded.company_founded,
+        company_specialties = excluded.company_specialties,
+        company_linkedin_url = excluded.company_linkedin_url,
+        scraped_at = excluded.scraped_at,
+        next_refresh_at = excluded.next_refresh_at
+"""
+
+_RECORD_JOB_CHANGE_SQL = """
+    INSERT INTO job_changes (job_id, changed_at, field_name, old_value, new_value)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+# Upper bound on pooled read-only connections per database
+DEFAULT_MAX_READERS = 4
+
+# Seconds to wait for a pooled reader to be returned before reading through
+# the writer connection instead
+READ_POOL_TIMEOUT = 0.5
+
+# Rows upserted since the last ANALYZE that trigger a planner-statistics refresh
+ANALYZE_THRESHOLD = 500
+
+# Upper bound (seconds) on serving cached analytics when no data has changed,
+# so the time-relative age buckets still roll forward
+ANALYTICS_CACHE_MAX_AGE = 60.0
+
+
 class JobDatabase:
     """
     SQLite database for job caching and metadata storage.
@@ -56,27 +134,73 @@ class JobDatabase:
     - Job change detection audit log
     """
 
-    def __init__(self, db_path: Path | str):
+    # Open on-disk databases shared via get_or_create(), keyed by resolved path
+    _instances: dict[Path, "JobDatabase"] = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def get_or_create(cls, db_path: Path | str) -> "JobDatabase":
+        """
+        Return the open database for a path, connecting on first use.
+
+        Every caller asking for the same file shares one connection (and its
+        prepared-statement cache and warm page cache) instead of reopening
+        it. Each call takes a reference that close() releases; the connection
+        only closes, and leaves the registry, once every holder has closed
+        it, so the next call reconnects. ":memory:" always yields a new
+        private database.
+
+        Args:
+            db_path: Path to SQLite database file, or ":memory:"
+        """
+        if str(db_path) == ":memory:":
+            return cls(db_path)
+
+        key = Path(db_path).resolve()
+        with cls._instances_lock:
+            db = cls._instances.get(key)
+            if db is None:
+                db = cls._instances[key] = cls(key)
+            db._refs += 1
+            return db
+
+    def __init__(self, db_path: Path | str, max_readers: int = DEFAULT_MAX_READERS):
         """
         Initialize database connection.
 
         Args:
-            db_path: Path to SQLite database file
+            db_path: Path to SQLite database file, or ":memory:" for a
+                private in-memory database (no WAL, nothing persisted)
+            max_readers: Maximum number of pooled read-only connections,
+                opened lazily on demand (ignored for in-memory databases)
         """
+        self.in_memory = str(db_path) == ":memory:"
+        self._closed = False
+        self._refs = 0  # Holders handed this instance by get_or_create()
+        self.max_readers = max_readers
+        self._read_pool: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._readers: list[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+        self._rows_since_analyze = 0
+        self._analytics_cache: tuple[tuple[int, int], float, dict] | None = None
         self.db_path = Path(db_path)
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.in_memory:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Connect with WAL mode for concurrent reads
         self.conn = sqlite3.connect(
-            str(self.db_path),
+            ":memory:" if self.in_memory else str(self.db_path),
             check_same_thread=False,  # Allow multi-threaded access
             timeout=30.0,  # Wait up to 30s for locks
+            cached_statements=256,  # Keep every distinct query prepared (default is 128)
         )
         self.conn.row_factory = sqlite3.Row  # Return dicts instead of tuples
 
         # Enable WAL mode for better concurrency
         self.conn.execute("PRAGMA journal_mode=WAL")
         self.conn.execute("PRAGMA synchronous=NORMAL")  # Faster writes, still safe in WAL
+        self.conn.execute("PRAGMA temp_store=MEMORY")  # Keep temp tables/sort spills off disk
+        self.conn.execute("PRAGMA mmap_size=268435456")  # Memory-map up to 256MB for reads
         self.conn.execute("PRAGMA foreign_keys=ON")  # Enforce FK constraints
         self.conn.execute("PRAGMA recursive_triggers=ON")  # Required for FTS5 sync on INSERT OR REPLACE
 
@@ -139,6 +263,17 @@ class JobDatabase:
             )
         """)
 
+        # Integer epoch of scraped_at, so age comparisons are 8-byte integer
+        # compares (offset-normalized) instead of ISO text compares. Added via
+        # ALTER so existing databases pick it up; SQLite only allows VIRTUAL
+        # generated columns there, and idx_jobs_scraped_epoch stores the values.
+        job_columns = {row[1] for row in cursor.execute("PRAGMA table_xinfo(jobs)")}
+        if "scraped_at_epoch" not in job_columns:
+            cursor.execute("""
+                ALTER TABLE jobs ADD COLUMN scraped_at_epoch INTEGER
+                GENERATED ALWAYS AS (CAST(strftime('%s', scraped_at) AS INTEGER)) VIRTUAL
+            """)
+
         # 2. Profiles table (scraping configurations)
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS profiles (
@@ -251,35 +386,212 @@ class JobDatabase:
             END
         """)
 
-        # 8. Indexes for query performance
+        # 8. Change-tracking trigger: record changes to tracked fields as part
+        # of the upsert itself, instead of a select-then-compare pass in Python.
+        cursor.execute("DROP TRIGGER IF EXISTS jobs_track_changes")
+
+        cursor.execute("""
+            CREATE TRIGGER jobs_track_changes
+            AFTER UPDATE OF salary_min, salary_max, number_of_applicants, raw_description ON jobs
+            BEGIN
+                INSERT INTO job_changes (job_id, changed_at, field_name, old_value, new_value)
+                SELECT new.job_id, strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now'), field_name, old_value, new_value
+                FROM (
+                    SELECT 'salary_min' AS field_name, old.salary_min AS old_value, new.salary_min AS new_value
+                    WHERE old.salary_min IS NOT new.salary_min
+                    UNION ALL
+                    SELECT 'salary_max', old.salary_max, new.salary_max
+                    WHERE old.salary_max IS NOT new.salary_max
+                    UNION ALL
+                    SELECT 'number_of_applicants', old.number_of_applicants, new.number_of_applicants
+                    WHERE old.number_of_applicants IS NOT new.number_of_applicants
+                    UNION ALL
+                    SELECT 'raw_description', old.raw_description, new.raw_description
+                    WHERE old.raw_description IS NOT new.raw_description
+                );
+            END
+        """)
+
+        # 9. Per-company job counts, maintained by triggers so analytics can rank
+        # companies in O(distinct companies) instead of grouping all jobs.
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS company_counts (
+                normalized_company_name TEXT PRIMARY KEY,
+                company TEXT NOT NULL,
+                n INTEGER NOT NULL
+            )
+        """)
+
+        cursor.execute("DROP TRIGGER IF EXISTS company_counts_insert")
+        cursor.execute("DROP TRIGGER IF EXISTS company_counts_delete")
+        cursor.execute("DROP TRIGGER IF EXISTS company_counts_update")
+
+        cursor.execute("""
+            CREATE TRIGGER company_counts_insert AFTER INSERT ON jobs BEGIN
+                INSERT INTO company_counts (normalized_company_name, company, n)
+                VALUES (new.normalized_company_name, new.company, 1)
+                ON CONFLICT(normalized_company_name) DO UPDATE SET n = n + 1;
+            END
+        """)
+
+        cursor.execute("""
+            CREATE TRIGGER company_counts_delete AFTER DELETE ON jobs BEGIN
+                UPDATE company_counts SET n = n - 1
+                WHERE normalized_company_name = old.normalized_company_name;
+                DELETE FROM company_counts
+                WHERE normalized_company_name = old.normalized_company_name AND n <= 0;
+            END
+        """)
+
+        cursor.execute("""
+            CREATE TRIGGER company_counts_update AFTER UPDATE OF normalized_company_name ON jobs
+            WHEN old.normalized_company_name IS NOT new.normalized_company_name
+            BEGIN
+                UPDATE company_counts SET n = n - 1
+                WHERE normalized_company_name = old.normalized_company_name;
+                DELETE FROM company_counts
+                WHERE normalized_company_name = old.normalized_company_name AND n <= 0;
+                INSERT INTO company_counts (normalized_company_name, company, n)
+                VALUES (new.normalized_company_name, new.company, 1)
+                ON CONFLICT(normalized_company_name) DO UPDATE SET n = n + 1;
+            END
+        """)
+
+        # 10. Indexes for query performance
         # Jobs table indexes
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_company ON jobs(normalized_company_name)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_location ON jobs(location)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_posted_date ON jobs(posted_date_iso DESC)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_scraped_at ON jobs(scraped_at DESC)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_remote ON jobs(remote_eligible) WHERE remote_eligible = 1")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_visa ON jobs(visa_sponsorship) WHERE visa_sponsorship = 1")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_scraped_epoch ON jobs(scraped_at_epoch DESC)")
+        # Partial indexes for the remote/visa flags, keyed on query_jobs' default
+        # sort so flag-filtered listings need neither a full scan nor a sort.
+        # They replace the older single-column flag indexes.
+        cursor.execute("DROP INDEX IF EXISTS idx_jobs_remote")
+        cursor.execute("DROP INDEX IF EXISTS idx_jobs_visa")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_jobs_remote_posted ON jobs(posted_date_iso DESC) WHERE remote_eligible = 1"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_jobs_visa_posted ON jobs(posted_date_iso DESC) WHERE visa_sponsorship = 1"
+        )
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_profile ON jobs(profile_id)")
 
         # Applications table indexes
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_applications_job_id ON applications(job_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_applications_status ON applications(status)")
+        # (status, applied_at DESC) serves list_applications' filter and sort
+        # from one index; it supersedes the old single-column status index.
+        cursor.execute("DROP INDEX IF EXISTS idx_applications_status")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_applications_status_applied ON applications(status, applied_at DESC)"
+        )
+
+        # Job changes indexes: recent-changes range scan and per-job history
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_job_changes_changed_at ON job_changes(changed_at DESC)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_job_changes_job_id ON job_changes(job_id, changed_at DESC)")
 
         # Company enrichment indexes
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_company_normalized ON company_enrichment(normalized_company_name)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_company_refresh ON company_enrichment(next_refresh_at)")
 
+        # Company counts index for the top-companies ranking
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_company_counts_n ON company_counts(n DESC)")
+
         self.conn.commit()
 
-        # Rebuild FTS index to ensure consistency after trigger changes
+        # Rebuild FTS index and company counts to ensure consistency after trigger changes
         self.rebuild_fts()
+        self.rebuild_company_counts()
 
         logger.info("Database schema initialized successfully")
 
+    def _open_reader(self) -> sqlite3.Connection:
+        """Open a read-only connection to the database file for the read pool."""
+        conn = sqlite3.connect(
+            str(self.db_path),
+            check_same_thread=False,
+            timeout=30.0,
+            isolation_level=None,  # Autocommit: each read sees the latest committed data
+            cached_statements=256,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA query_only=ON")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")
+        return conn
+
+    @contextmanager
+    def read_conn(self) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow a pooled read-only connection.
+
+        WAL lets readers run alongside the single writer (self.conn), so
+        read-only queries don't serialize behind it. Connections are opened
+        lazily up to max_readers; beyond that callers wait up to
+        READ_POOL_TIMEOUT for one to be returned, then fall back to self.conn
+        rather than blocking (e.g. when partly consumed iter_* generators hold
+        every reader). In-memory databases are private to self.conn, which is
+        yielded instead.
+
+        Yields:
+            SQLite connection for read-only queries
+        """
+        if self.in_memory:
+            yield self.conn
+            return
+
+        try:
+            conn = self._read_pool.get_nowait()
+        except queue.Empty:
+            conn = None
+            with self._readers_lock:
+                if len(self._readers) < self.max_readers:
+                    conn = self._open_reader()
+                    self._readers.append(conn)
+            if conn is None:
+                try:
+                    conn = self._read_pool.get(timeout=READ_POOL_TIMEOUT)
+                except queue.Empty:
+                    logger.debug("Read pool exhausted, reading through the writer connection")
+                    yield self.conn
+                    return
+
+        try:
+            yield conn
+        finally:
+            self._read_pool.put(conn)
+
     def close(self) -> None:
-        """Close database connection."""
-        if self.conn:
-            self.conn.close()
+        """
+        Close database connection and any pooled readers. Safe to call more than once.
+
+        An instance shared via get_or_create() stays open until its last
+        holder closes it.
+        """
+        if self.conn and not self._closed:
+            with self._instances_lock:
+                if self._refs > 1:
+                    self._refs -= 1
+                    return
+                self._refs = 0
+                # Evict before closing so get_or_create() never hands out a closing instance
+                if not self.in_memory:
+                    key = self.db_path.resolve()
+                    if self._instances.get(key) is self:
+                        del self._instances[key]
+            with self._readers_lock:
+                for reader in self._readers:
+                    reader.close()
+                self._readers.clear()
+            try:
+                # Let SQLite refresh any statistics it deems stale, with a bounded scan
+                self.conn.execute("PRAGMA analysis_limit=400")
+                self.conn.execute("PRAGMA optimize")
+            except sqlite3.Error as e:
+                logger.warning(f"Skipping PRAGMA optimize on close: {e}")
+            finally:
+                self.conn.close()
+                self._closed = True
             logger.info("Database connection closed")
 
     def __enter__(self):
@@ -296,72 +608,128 @@ class JobDatabase:
         Repairs any index corruption caused by direct modifications
         or incorrect trigger behavior.
         """
-        self.conn.execute("INSERT INTO jobs_fts(jobs_fts) VALUES('rebuild')")
-        self.conn.commit()
+        with self.conn:
+            self.conn.execute("INSERT INTO jobs_fts(jobs_fts) VALUES('rebuild')")
         logger.info("FTS5 index rebuilt successfully")
 
+    def rebuild_company_counts(self) -> None:
+        """Recompute the company_counts summary table from the jobs table.
+
+        Backfills databases created before the table existed and repairs
+        any drift from direct modifications.
+        """
+        with self.conn:
+            self.conn.execute("DELETE FROM company_counts")
+            self.conn.execute(
+                """
+                INSERT INTO company_counts (normalized_company_name, company, n)
+                SELECT normalized_company_name, company, COUNT(*)
+                FROM jobs
+                GROUP BY normalized_company_name
+                """
+            )
+        logger.info("Company counts rebuilt successfully")
+
     # ========== Job CRUD Operations ==========
 
-    def upsert_jobs(self, jobs: list[dict]) -> int:
+    def upsert_jobs(self, jobs: Iterable[dict]) -> int:
         """
         Insert or update jobs in batch.
 
-        Uses INSERT OR REPLACE for upsert behavior. Automatically normalizes
-        company names and sets last_seen timestamp.
+        Uses INSERT ... ON CONFLICT DO UPDATE so existing rows are updated in
+        place (INSERT OR REPLACE would delete the row and cascade away its
+        application and change history). Changes to tracked fields are
+        recorded in job_changes by the jobs_track_changes trigger.
+        Automatically normalizes company names and sets last_seen timestamp.
 
         Args:
-            jobs: List of job dictionaries with all required fields
+            jobs: Iterable of job dictionaries with all required fields; rows
+                are streamed into a single executemany, so a generator works
+                without materializing the batch
 
         Returns:
             Number of jobs inserted/updated
         """
-        if not jobs:
-            return 0
+        last_seen = datetime.now(timezone.utc).isoformat()
+
+        def rows():
+            for job in jobs:
+                # Normalize company name and set last_seen if not present
+                if "normalized_company_name" not in job:
+                    job["normalized_company_name"] = normalize_company_name(job["company"])
+                if "last_seen" not in job:
+                    job["last_seen"] = last_seen
+
+                # Extract values in column order, serializing lists to JSON
+                yield tuple(
+                    json.dumps(val) if isinstance(val, (list, dict)) else val
+                    for val in map(job.get, _JOB_COLUMNS)
+                )
 
-        cursor = self.conn.cursor()
+        # One transaction for the whole batch: commits on success, rolls back on error
+        with self.conn:
+            cursor = self.conn.executemany(_UPSERT_JOBS_SQL, rows())
 
-        # Prepare jobs with normalized company names
-        for job in jobs:
-            if "normalized_company_name" not in job:
-                job["normalized_company_name"] = normalize_company_name(job["company"])
-
-            # Set last_seen to current time if not present
-            if "last_seen" not in job:
-                job["last_seen"] = datetime.now(timezone.utc).isoformat()
-
-        # Build INSERT OR REPLACE statement
-        columns = [
-            "job_id", "title", "company", "normalized_company_name", "location",
-            "posted_date", "posted_date_iso", "scraped_at", "last_seen",
-            "salary_min", "salary_max", "salary_currency", "equity_offered",
-            "remote_eligible", "visa_sponsorship", "skills", "easy_apply",
-            "number_of_applicants", "description_summary", "key_requirements",
-            "key_responsibilities_preview", "raw_description", "employment_type",
-            "seniority_level", "job_function", "industries", "benefits_badge",
-            "company_url", "url", "profile_id", "source"
-        ]
-
-        placeholders = ", ".join(["?" for _ in columns])
-        sql = f"INSERT OR REPLACE INTO jobs ({', '.join(columns)}) VALUES ({placeholders})"
-
-        # Extract values for each job, serializing lists to JSON
-        rows = []
-        for job in jobs:
-            row = []
-            for col in columns:
-                val = job.get(col)
-                if isinstance(val, (list, dict)):
-                    val = json.dumps(val)
-                row.append(val)
-            rows.append(row)
-
-        cursor.executemany(sql, rows)
-        self.conn.commit()
+        count = cursor.rowcount
+        logger.info(f"Upserted {count} jobs")
+        self._refresh_stats_after(count)
+        return count
+
+    def upsert_jobs_rows(self, columns: Sequence[str], rows: Iterable[Sequence]) -> int:
+        """
+        Insert or update jobs from pre-built value tuples in batch.
+
+        Bulk-load counterpart of upsert_jobs for callers that already hold
+        rows in column order: no per-row dicts are built, and values are
+        bound as given (no company normalization or JSON serialization).
+        last_seen is filled with the batch timestamp when not supplied.
+
+        Args:
+            columns: Job column names, in the order values appear in each row;
+                must include job_id
+            rows: Iterable of value tuples, streamed into a single executemany
+
+        Returns:
+            Number of jobs inserted/updated
+
+        Raises:
+            ValueError: If columns omit job_id or name an unknown column
+        """
+        columns = tuple(columns)
+        unknown = set(columns) - set(_JOB_COLUMNS)
+        if unknown or "job_id" not in columns:
+            raise ValueError(f"Invalid job columns: {sorted(unknown) or 'missing job_id'}")
+
+        if "last_seen" not in columns:
+            last_seen = (datetime.now(timezone.utc).isoformat(),)
+            columns += ("last_seen",)
+            rows = (tuple(row) + last_seen for row in rows)
+
+        with self.conn:
+            cursor = self.conn.executemany(_build_upsert_jobs_sql(columns), rows)
 
         count = cursor.rowcount
         logger.info(f"Upserted {count} jobs")
+        self._refresh_stats_after(count)
         return count
 
+    def _refresh_stats_after(self, count: int) -> None:
+        """
+        Refresh planner statistics once enough rows have been upserted.
+
+        Keeps sqlite_stat1 current after bulk ingest so the planner keeps
+        choosing the intended jobs indexes as the table grows.
+
+        Args:
+            count: Number of rows just upserted
+        """
+        self._rows_since_analyze += count
+        if self._rows_since_analyze >= ANALYZE_THRESHOLD:
+            with self.conn:
+                self.conn.execute("ANALYZE jobs")
+            self._rows_since_analyze = 0
+            logger.info("Refreshed planner statistics for jobs")
+
     def get_job(self, job_id: str) -> dict | None:
         """
         Retrieve a single job by ID.
@@ -373,7 +741,7 @@ class JobDatabase:
             Job dictionary or None if not found
         """
         cursor = self.conn.execute(
-            "SELECT * FROM jobs WHERE job_id = ?",
+            f"SELECT {_JOB_SELECT} FROM jobs WHERE job_id = ?",
             (job_id,)
         )
         row = cursor.fetchone()
@@ -382,6 +750,82 @@ class JobDatabase:
             return dict(row)
         return None
 
+    def list_recent_job_ids(self, since_hours: int = 24) -> set[str]:
+        """
+        Get IDs of jobs seen by a scrape within the last N hours.
+
+        Args:
+            since_hours: Look-back window in hours (based on last_seen)
+
+        Returns:
+            Set of job IDs
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=since_hours)
+        cursor = self.conn.execute(
+            "SELECT job_id FROM jobs WHERE last_seen >= ?",
+            (cutoff.isoformat(),)
+        )
+        return {row[0] for row in cursor}
+
+    @staticmethod
+    def _build_job_filters(
+        company: str | None = None,
+        location: str | None = None,
+        keywords: str | None = None,
+        posted_after_hours: int | None = None,
+        remote_only: bool = False,
+        visa_sponsorship: bool = False,
+        application_status: str | None = None,
+    ) -> tuple[list[str], list]:
+        """
+        Build WHERE clauses and parameters shared by query_jobs and count_jobs.
+
+        Clauses are emitted cheapest first: indexed flag/equality and range
+        predicates, then LIKE scans, then the FTS5 subquery, so SQLite evaluates
+        the selective, inexpensive checks before the costly text matches.
+
+        Returns:
+            Tuple of (where_clauses, params)
+        """
+        where_clauses = []
+        params = []
+
+        # Indexed flags, equality and range predicates
+        if remote_only:
+            where_clauses.append("j.remote_eligible = 1")
+
+        if visa_sponsorship:
+            where_clauses.append("j.visa_sponsorship = 1")
+
+        if application_status:
+            if application_status == "not_applied":
+                where_clauses.append("a.job_id IS NULL")
+            else:
+                where_clauses.append("a.status = ?")
+                params.append(application_status)
+
+        if posted_after_hours:
+            cutoff = datetime.now(timezone.utc) - timedelta(hours=posted_after_hours)
+            where_clauses.append("j.posted_date_iso >= ?")
+            params.append(cutoff.isoformat())
+
+        # Text scans
+        if company:
+            normalized = normalize_company_name(company)
+            where_clauses.append("j.normalized_company_name LIKE ?")
+            params.append(f"%{normalized}%")
+
+        if location:
+            where_clauses.append("LOWER(j.location) LIKE LOWER(?)")
+            params.append(f"%{location}%")
+
+        if keywords:
+            # FTS5 search - must join with jobs_fts
+            where_clauses.append("j.job_id IN (SELECT job_id FROM jobs_fts WHERE jobs_fts MATCH ?)")
+            params.append(keywords)
+
+        return where_clauses, params
+
     def query_jobs(
         self,
         company: str | None = None,
@@ -413,13 +857,10 @@ class JobDatabase:
         Returns:
             List of job dictionaries matching filters
         """
-        where_clauses = []
-        params = []
-
         # Base query with LEFT JOIN for applications and company enrichment
-        base_query = """
+        base_query = f"""
             SELECT
-                j.*,
+                {_JOB_SELECT_J},
                 a.status as application_status,
                 a.applied_at,
                 c.company_size,
@@ -429,38 +870,10 @@ class JobDatabase:
             LEFT JOIN company_enrichment c ON j.normalized_company_name = c.normalized_company_name
         """
 
-        # Build WHERE clause
-        if company:
-            normalized = normalize_company_name(company)
-            where_clauses.append("j.normalized_company_name LIKE ?")
-            params.append(f"%{normalized}%")
-
-        if location:
-            where_clauses.append("LOWER(j.location) LIKE LOWER(?)")
-            params.append(f"%{location}%")
-
-        if keywords:
-            # FTS5 search - must join with jobs_fts
-            where_clauses.append("j.job_id IN (SELECT job_id FROM jobs_fts WHERE jobs_fts MATCH ?)")
-            params.append(keywords)
-
-        if posted_after_hours:
-            cutoff = datetime.now(timezone.utc) - timedelta(hours=posted_after_hours)
-            where_clauses.append("j.posted_date_iso >= ?")
-            params.append(cutoff.isoformat())
-
-        if remote_only:
-            where_clauses.append("j.remote_eligible = 1")
-
-        if visa_sponsorship:
-            where_clauses.append("j.visa_sponsorship = 1")
-
-        if application_status:
-            if application_status == "not_applied":
-                where_clauses.append("a.job_id IS NULL")
-            else:
-                where_clauses.append("a.status = ?")
-                params.append(application_status)
+        where_clauses, params = self._build_job_filters(
+            company, location, keywords, posted_after_hours,
+            remote_only, visa_sponsorship, application_status,
+        )
 
         # Combine WHERE clauses
         if where_clauses:
@@ -479,12 +892,13 @@ class JobDatabase:
         base_query += " LIMIT ? OFFSET ?"
         params.extend([limit, offset])
 
-        # Execute query
-        cursor = self.conn.execute(base_query, params)
-        rows = cursor.fetchall()
+        with self.read_conn() as conn:
+            # Execute query
+            cursor = conn.execute(base_query, params)
+            rows = cursor.fetchall()
 
-        # Convert to list of dicts
-        return [dict(row) for row in rows]
+            # Convert to list of dicts
+            return [dict(row) for row in rows]
 
     def count_jobs(
         self,
@@ -505,9 +919,6 @@ class JobDatabase:
         Returns:
             Total count of matching jobs
         """
-        where_clauses = []
-        params = []
-
         # Base query
         base_query = """
             SELECT COUNT(DISTINCT j.job_id)
@@ -515,44 +926,18 @@ class JobDatabase:
             LEFT JOIN applications a ON j.job_id = a.job_id
         """
 
-        # Build WHERE clause (same logic as query_jobs)
-        if company:
-            normalized = normalize_company_name(company)
-            where_clauses.append("j.normalized_company_name LIKE ?")
-            params.append(f"%{normalized}%")
-
-        if location:
-            where_clauses.append("LOWER(j.location) LIKE LOWER(?)")
-            params.append(f"%{location}%")
-
-        if keywords:
-            where_clauses.append("j.job_id IN (SELECT job_id FROM jobs_fts WHERE jobs_fts MATCH ?)")
-            params.append(keywords)
-
-        if posted_after_hours:
-            cutoff = datetime.now(timezone.utc) - timedelta(hours=posted_after_hours)
-            where_clauses.append("j.posted_date_iso >= ?")
-            params.append(cutoff.isoformat())
-
-        if remote_only:
-            where_clauses.append("j.remote_eligible = 1")
-
-        if visa_sponsorship:
-            where_clauses.append("j.visa_sponsorship = 1")
-
-        if application_status:
-            if application_status == "not_applied":
-                where_clauses.append("a.job_id IS NULL")
-            else:
-                where_clauses.append("a.status = ?")
-                params.append(application_status)
+        where_clauses, params = self._build_job_filters(
+            company, location, keywords, posted_after_hours,
+            remote_only, visa_sponsorship, application_status,
+        )
 
         # Combine WHERE clauses
         if where_clauses:
             base_query += " WHERE " + " AND ".join(where_clauses)
 
-        cursor = self.conn.execute(base_query, params)
-        return cursor.fetchone()[0]
+        with self.read_conn() as conn:
+            cursor = conn.execute(base_query, params)
+            return cursor.fetchone()[0]
 
     def delete_old_jobs(self, max_age_seconds: int) -> int:
         """
@@ -568,11 +953,11 @@ class JobDatabase:
 
         cutoff = datetime.now(timezone.utc) - timedelta(seconds=max_age_seconds)
 
-        cursor = self.conn.execute(
-            "DELETE FROM jobs WHERE scraped_at < ?",
-            (cutoff.isoformat(),)
-        )
-        self.conn.commit()
+        with self.conn:
+            cursor = self.conn.execute(
+                "DELETE FROM jobs WHERE scraped_at < ?",
+                (cutoff.isoformat(),)
+            )
 
         count = cursor.rowcount
         logger.info(f"Deleted {count} old jobs (older than {max_age_seconds}s)")
@@ -602,49 +987,49 @@ class JobDatabase:
         if row:
             # Update existing profile
             profile_id = row[0]
-            self.conn.execute(
-                """
-                UPDATE profiles SET
-                    location = ?, keywords = ?, distance = ?,
-                    time_filter = ?, refresh_interval = ?, enabled = ?,
-                    updated_at = ?
-                WHERE id = ?
-                """,
-                (
-                    profile["location"],
-                    profile["keywords"],
-                    profile.get("distance", 25),
-                    profile.get("time_filter", "r86400"),
-                    profile.get("refresh_interval", 3600),
-                    profile.get("enabled", 1),
-                    now,
-                    profile_id,
+            with self.conn:
+                self.conn.execute(
+                    """
+                    UPDATE profiles SET
+                        location = ?, keywords = ?, distance = ?,
+                        time_filter = ?, refresh_interval = ?, enabled = ?,
+                        updated_at = ?
+                    WHERE id = ?
+                    """,
+                    (
+                        profile["location"],
+                        profile["keywords"],
+                        profile.get("distance", 25),
+                        profile.get("time_filter", "r86400"),
+                        profile.get("refresh_interval", 3600),
+                        profile.get("enabled", 1),
+                        now,
+                        profile_id,
+                    )
                 )
-            )
-            self.conn.commit()
             logger.info(f"Updated profile {profile_id}: {profile['name']}")
         else:
             # Insert new profile
-            cursor = self.conn.execute(
-                """
-                INSERT INTO profiles (
-                    name, location, keywords, distance, time_filter,
-                    refresh_interval, enabled, created_at, updated_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    profile["name"],
-                    profile["location"],
-                    profile["keywords"],
-                    profile.get("distance", 25),
-                    profile.get("time_filter", "r86400"),
-                    profile.get("refresh_interval", 3600),
-                    profile.get("enabled", 1),
-                    now,
-                    now,
+            with self.conn:
+                cursor = self.conn.execute(
+                    """
+                    INSERT INTO profiles (
+                        name, location, keywords, distance, time_filter,
+                        refresh_interval, enabled, created_at, updated_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        profile["name"],
+                        profile["location"],
+                        profile["keywords"],
+                        profile.get("distance", 25),
+                        profile.get("time_filter", "r86400"),
+                        profile.get("refresh_interval", 3600),
+                        profile.get("enabled", 1),
+                        now,
+                        now,
+                    )
                 )
-            )
-            self.conn.commit()
             profile_id = cursor.lastrowid
             logger.info(f"Created profile {profile_id}: {profile['name']}")
 
@@ -699,17 +1084,16 @@ class JobDatabase:
             profile_id: Profile ID to delete
             hard_delete: If True, permanently delete from database
         """
-        if hard_delete:
-            self.conn.execute("DELETE FROM profiles WHERE id = ?", (profile_id,))
-            logger.info(f"Hard deleted profile {profile_id}")
-        else:
-            self.conn.execute(
-                "UPDATE profiles SET enabled = 0, updated_at = ? WHERE id = ?",
-                (datetime.now(timezone.utc).isoformat(), profile_id)
-            )
-            logger.info(f"Soft deleted profile {profile_id}")
+        with self.conn:
+            if hard_delete:
+                self.conn.execute("DELETE FROM profiles WHERE id = ?", (profile_id,))
+            else:
+                self.conn.execute(
+                    "UPDATE profiles SET enabled = 0, updated_at = ? WHERE id = ?",
+                    (datetime.now(timezone.utc).isoformat(), profile_id)
+                )
 
-        self.conn.commit()
+        logger.info(f"{'Hard' if hard_delete else 'Soft'} deleted profile {profile_id}")
 
     def update_profile_last_run(self, profile_id: int, timestamp: str):
         """
@@ -719,14 +1103,32 @@ class JobDatabase:
             profile_id: Profile ID
             timestamp: ISO timestamp of last scrape
         """
-        self.conn.execute(
-            "UPDATE profiles SET last_scraped_at = ?, updated_at = ? WHERE id = ?",
-            (timestamp, datetime.now(timezone.utc).isoformat(), profile_id)
-        )
-        self.conn.commit()
+        with self.conn:
+            self.conn.execute(
+                "UPDATE profiles SET last_scraped_at = ?, updated_at = ? WHERE id = ?",
+                (timestamp, datetime.now(timezone.utc).isoformat(), profile_id)
+            )
         logger.info(f"Updated last_scraped_at for profile {profile_id}")
 
-    def seed_default_profile(self) -> int | None:
+    def update_profiles_last_run(self, timestamps: dict[int, str]) -> None:
+        """
+        Update last_scraped_at for several profiles in one batch.
+
+        Args:
+            timestamps: Mapping of profile ID to ISO timestamp of last scrape
+        """
+        if not timestamps:
+            return
+
+        updated_at = datetime.now(timezone.utc).isoformat()
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE profiles SET last_scraped_at = ?, updated_at = ? WHERE id = ?",
+                [(timestamp, updated_at, profile_id) for profile_id, timestamp in timestamps.items()]
+            )
+        logger.info(f"Updated last_scraped_at for {len(timestamps)} profiles")
+
+    def seed_default_profile(self) -> dict | None:
         """
         Create default profile if no profiles exist.
 
@@ -738,31 +1140,44 @@ class JobDatabase:
         - time_filter: "r86400" (24 hours)
         - refresh_interval: 7200 (2 hours)
 
+        The existence check, insert and read-back run as a single
+        INSERT ... SELECT ... RETURNING statement.
+
         Returns:
-            Profile ID if created, None if profiles already exist
+            Created profile dictionary, or None if profiles already exist
         """
-        # Check if any profiles exist
-        cursor = self.conn.execute("SELECT COUNT(*) FROM profiles")
-        count = cursor.fetchone()[0]
+        now = datetime.now(timezone.utc).isoformat()
+        with self.conn:
+            rows = self.conn.execute(
+                """
+                INSERT INTO profiles (
+                    name, location, keywords, distance, time_filter,
+                    refresh_interval, enabled, created_at, updated_at
+                )
+                SELECT ?, ?, ?, ?, ?, ?, ?, ?, ?
+                WHERE NOT EXISTS (SELECT 1 FROM profiles)
+                RETURNING *
+                """,
+                (
+                    "default",
+                    "San Francisco, CA",
+                    "AI Engineer OR ML Engineer OR Research Engineer",
+                    25,
+                    "r86400",
+                    7200,
+                    1,
+                    now,
+                    now,
+                )
+            ).fetchall()
 
-        if count > 0:
+        if not rows:
             logger.info("Profiles already exist, skipping default profile seeding")
             return None
 
-        # Create default profile
-        default_profile = {
-            "name": "default",
-            "location": "San Francisco, CA",
-            "keywords": "AI Engineer OR ML Engineer OR Research Engineer",
-            "distance": 25,
-            "time_filter": "r86400",
-            "refresh_interval": 7200,
-            "enabled": 1,
-        }
-
-        profile_id = self.upsert_profile(default_profile)
-        logger.info(f"Seeded default profile {profile_id}")
-        return profile_id
+        profile = dict(rows[0])
+        logger.info(f"Seeded default profile {profile['id']}")
+        return profile
 
     # ========== Application CRUD Operations ==========
 
@@ -786,19 +1201,19 @@ class JobDatabase:
         now = datetime.now(timezone.utc).isoformat()
 
         # Insert or update application
-        self.conn.execute(
-            """
-            INSERT INTO applications (job_id, applied_at, status, notes, created_at, updated_at)
-            VALUES (?, ?, 'applied', ?, ?, ?)
-            ON CONFLICT(job_id) DO UPDATE SET
-                applied_at = excluded.applied_at,
-                status = 'applied',
-                notes = excluded.notes,
-                updated_at = excluded.updated_at
-            """,
-            (job_id, now, notes, now, now)
-        )
-        self.conn.commit()
+        with self.conn:
+            self.conn.execute(
+                """
+                INSERT INTO applications (job_id, applied_at, status, notes, created_at, updated_at)
+                VALUES (?, ?, 'applied', ?, ?, ?)
+                ON CONFLICT(job_id) DO UPDATE SET
+                    applied_at = excluded.applied_at,
+                    status = 'applied',
+                    notes = excluded.notes,
+                    updated_at = excluded.updated_at
+                """,
+                (job_id, now, notes, now, now)
+            )
         logger.info(f"Marked job {job_id} as applied")
         return True
 
@@ -825,15 +1240,15 @@ class JobDatabase:
 
         now = datetime.now(timezone.utc).isoformat()
 
-        self.conn.execute(
-            """
-            UPDATE applications
-            SET status = ?, notes = ?, updated_at = ?
-            WHERE job_id = ?
-            """,
-            (status, notes, now, job_id)
-        )
-        self.conn.commit()
+        with self.conn:
+            self.conn.execute(
+                """
+                UPDATE applications
+                SET status = ?, notes = ?, updated_at = ?
+                WHERE job_id = ?
+                """,
+                (status, notes, now, job_id)
+            )
         logger.info(f"Updated application for job {job_id} to status '{status}'")
         return True
 
@@ -847,28 +1262,46 @@ class JobDatabase:
         Returns:
             List of application dictionaries with job details
         """
-        if status:
-            cursor = self.conn.execute(
-                """
-                SELECT a.*, j.title, j.company, j.location
-                FROM applications a
-                JOIN jobs j ON a.job_id = j.job_id
-                WHERE a.status = ?
-                ORDER BY a.applied_at DESC
-                """,
-                (status,)
-            )
-        else:
-            cursor = self.conn.execute(
-                """
-                SELECT a.*, j.title, j.company, j.location
-                FROM applications a
-                JOIN jobs j ON a.job_id = j.job_id
-                ORDER BY a.applied_at DESC
-                """
-            )
+        return list(self.iter_applications(status))
 
-        return [dict(row) for row in cursor.fetchall()]
+    def iter_applications(self, status: str | None = None) -> Iterator[dict]:
+        """
+        Stream applications row by row, optionally filtered by status.
+
+        Rows are fetched from the cursor as the caller iterates, so large
+        result sets are never materialized. The pooled read connection is
+        held until the generator is exhausted or closed.
+
+        Args:
+            status: Filter by status (applied, interviewing, etc.)
+
+        Yields:
+            Application dictionaries with job details
+        """
+        with self.read_conn() as conn:
+            if status:
+                cursor = conn.execute(
+                    """
+                    SELECT a.*, j.title, j.company, j.location
+                    FROM applications a
+                    JOIN jobs j ON a.job_id = j.job_id
+                    WHERE a.status = ?
+                    ORDER BY a.applied_at DESC
+                    """,
+                    (status,)
+                )
+            else:
+                cursor = conn.execute(
+                    """
+                    SELECT a.*, j.title, j.company, j.location
+                    FROM applications a
+                    JOIN jobs j ON a.job_id = j.job_id
+                    ORDER BY a.applied_at DESC
+                    """
+                )
+
+            for row in cursor:
+                yield dict(row)
 
     # ========== Company Enrichment CRUD Operations ==========
 
@@ -879,10 +1312,11 @@ class JobDatabase:
         Args:
             company_data: Company metadata dictionary
         """
-        now = datetime.now(timezone.utc).isoformat()
+        scraped_at = datetime.now(timezone.utc)
+        now = scraped_at.isoformat()
 
         # Calculate next refresh (30 days from now)
-        next_refresh = (datetime.now(timezone.utc) + timedelta(days=30)).isoformat()
+        next_refresh = (scraped_at + timedelta(days=30)).isoformat()
 
         # Normalize company name
         normalized_name = normalize_company_name(company_data["company_name"])
@@ -892,43 +1326,24 @@ class JobDatabase:
         if isinstance(specialties, list):
             specialties = json.dumps(specialties)
 
-        self.conn.execute(
-            """
-            INSERT INTO company_enrichment (
-                company_name, normalized_company_name, company_size, company_industry,
-                company_description, company_website, company_headquarters,
-                company_founded, company_specialties, company_linkedin_url,
-                scraped_at, next_refresh_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(normalized_company_name) DO UPDATE SET
-                company_name = excluded.company_name,
-                company_size = excluded.company_size,
-                company_industry = excluded.company_industry,
-                company_description = excluded.company_description,
-                company_website = excluded.company_website,
-                company_headquarters = excluded.company_headquarters,
-                company_founded = excluded.company_founded,
-                company_specialties = excluded.company_specialties,
-                company_linkedin_url = excluded.company_linkedin_url,
-                scraped_at = excluded.scraped_at,
-                next_refresh_at = excluded.next_refresh_at
-            """,
-            (
-                company_data["company_name"],
-                normalized_name,
-                company_data.get("company_size"),
-                company_data.get("company_industry"),
-                company_data.get("company_description"),
-                company_data.get("company_website"),
-                company_data.get("company_headquarters"),
-                company_data.get("company_founded"),
-                specialties,
-                company_data.get("company_linkedin_url"),
-                now,
-                next_refresh,
+        with self.conn:
+            self.conn.execute(
+                _UPSERT_COMPANY_SQL,
+                (
+                    company_data["company_name"],
+                    normalized_name,
+                    company_data.get("company_size"),
+                    company_data.get("company_industry"),
+                    company_data.get("company_description"),
+                    company_data.get("company_website"),
+                    company_data.get("company_headquarters"),
+                    company_data.get("company_founded"),
+                    specialties,
+                    company_data.get("company_linkedin_url"),
+                    now,
+                    next_refresh,
+                )
             )
-        )
-        self.conn.commit()
         logger.info(f"Upserted company enrichment for {company_data['company_name']}")
 
     def get_company_enrichment(self, company_name: str) -> dict | None:
@@ -990,14 +1405,11 @@ class JobDatabase:
         """
         now = datetime.now(timezone.utc).isoformat()
 
-        self.conn.execute(
-            """
-            INSERT INTO job_changes (job_id, changed_at, field_name, old_value, new_value)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (job_id, now, field_name, old_value, new_value)
-        )
-        self.conn.commit()
+        with self.conn:
+            self.conn.execute(
+                _RECORD_JOB_CHANGE_SQL,
+                (job_id, now, field_name, old_value, new_value)
+            )
         logger.info(f"Recorded change for job {job_id}: {field_name} changed")
 
     def get_job_changes(self, since_hours: int = 24) -> list[dict]:
@@ -1010,20 +1422,37 @@ class JobDatabase:
         Returns:
             List of job change records
         """
+        return list(self.iter_job_changes(since_hours))
+
+    def iter_job_changes(self, since_hours: int = 24) -> Iterator[dict]:
+        """
+        Stream recent job changes row by row, newest first.
+
+        Like iter_applications, rows are fetched lazily and the pooled read
+        connection is held until the generator is exhausted or closed.
+
+        Args:
+            since_hours: How many hours back to query
+
+        Yields:
+            Job change records
+        """
         cutoff = (datetime.now(timezone.utc) - timedelta(hours=since_hours)).isoformat()
 
-        cursor = self.conn.execute(
-            """
-            SELECT jc.*, j.title, j.company
-            FROM job_changes jc
-            JOIN jobs j ON jc.job_id = j.job_id
-            WHERE jc.changed_at >= ?
-            ORDER BY jc.changed_at DESC
-            """,
-            (cutoff,)
-        )
+        with self.read_conn() as conn:
+            cursor = conn.execute(
+                """
+                SELECT jc.*, j.title, j.company
+                FROM job_changes jc
+                JOIN jobs j ON jc.job_id = j.job_id
+                WHERE jc.changed_at >= ?
+                ORDER BY jc.changed_at DESC
+                """,
+                (cutoff,)
+            )
 
-        return [dict(row) for row in cursor.fetchall()]
+            for row in cursor:
+                yield dict(row)
 
     # ========== Analytics Queries ==========
 
@@ -1031,197 +1460,214 @@ class JobDatabase:
         """
         Get comprehensive analytics across all tables.
 
+        The result is cached until the data changes: rows written through
+        this connection (total_changes) or commits by any other connection or
+        process (PRAGMA data_version) invalidate it. Time-relative buckets
+        are refreshed at least every ANALYTICS_CACHE_MAX_AGE seconds.
+
         Returns:
             Dictionary with analytics for jobs, profiles, applications,
             company enrichment, and cache health
         """
+        token = (self.conn.total_changes, self.conn.execute("PRAGMA data_version").fetchone()[0])
+        cached = self._analytics_cache
+        if cached and cached[0] == token and time.monotonic() - cached[1] < ANALYTICS_CACHE_MAX_AGE:
+            return copy.deepcopy(cached[2])
+
+        analytics = self._compute_cache_analytics()
+        self._analytics_cache = (token, time.monotonic(), analytics)
+        return copy.deepcopy(analytics)
+
+    def _compute_cache_analytics(self) -> dict:
+        """Run the analytics queries behind get_cache_analytics."""
+        # Read the clock once; every cutoff below is bound as a precomputed
+        # value so comparisons hit the bare (indexed) column
         now = datetime.now(timezone.utc)
+        now_iso = now.isoformat()
 
-        # ===== Job Analytics =====
-
-        # Total jobs
-        cursor = self.conn.execute("SELECT COUNT(*) FROM jobs")
-        total_jobs = cursor.fetchone()[0]
-
-        # Jobs by age buckets
-        day_1_cutoff = (now - timedelta(hours=24)).isoformat()
-        day_7_cutoff = (now - timedelta(days=7)).isoformat()
-        day_30_cutoff = (now - timedelta(days=30)).isoformat()
-
-        cursor = self.conn.execute(
-            "SELECT COUNT(*) FROM jobs WHERE scraped_at >= ?", (day_1_cutoff,)
-        )
-        fresh_24h = cursor.fetchone()[0]
-
-        cursor = self.conn.execute(
-            "SELECT COUNT(*) FROM jobs WHERE scraped_at >= ?", (day_7_cutoff,)
-        )
-        recent_7d = cursor.fetchone()[0]
-
-        cursor = self.conn.execute(
-            "SELECT COUNT(*) FROM jobs WHERE scraped_at >= ?", (day_30_cutoff,)
-        )
-        old_30d = cursor.fetchone()[0]
-
-        stale = total_jobs - old_30d
-
-        # Jobs by application status
-        status_counts = {
-            "not_applied": 0,
-            "applied": 0,
-            "interviewing": 0,
-            "rejected": 0,
-            "offered": 0,
-            "accepted": 0,
-        }
-
-        # Count not_applied (LEFT JOIN where application is NULL)
-        cursor = self.conn.execute(
-            """
-            SELECT COUNT(*)
-            FROM jobs j
-            LEFT JOIN applications a ON j.job_id = a.job_id
-            WHERE a.job_id IS NULL
-            """
-        )
-        status_counts["not_applied"] = cursor.fetchone()[0]
+        with self.read_conn() as conn:
+            # ===== Job Analytics =====
 
-        # Count by application status
-        cursor = self.conn.execute(
-            """
-            SELECT status, COUNT(*) as count
-            FROM applications
-            GROUP BY status
-            """
-        )
-        for row in cursor.fetchall():
-            status = row[0]
-            count = row[1]
-            if status in status_counts:
-                status_counts[status] = count
+            # Total jobs
+            total_jobs = conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
 
-        # Top 10 companies by job count
-        cursor = self.conn.execute(
-            """
-            SELECT company, normalized_company_name, COUNT(*) as count
-            FROM jobs
-            GROUP BY normalized_company_name
-            ORDER BY count DESC
-            LIMIT 10
-            """
-        )
-        top_companies = [
-            {"company": row[0], "normalized_name": row[1], "count": row[2]}
-            for row in cursor.fetchall()
-        ]
+            # Age buckets in one pass over the last 30 days of the epoch index;
+            # older rows are never visited
+            cursor = conn.execute(
+                """
+                SELECT
+                    COUNT(CASE WHEN scraped_at_epoch >= :day_1 THEN 1 END),
+                    COUNT(CASE WHEN scraped_at_epoch >= :day_7 THEN 1 END),
+                    COUNT(*)
+                FROM jobs
+                WHERE scraped_at_epoch >= :day_30
+                """,
+                {
+                    "day_1": int((now - timedelta(hours=24)).timestamp()),
+                    "day_7": int((now - timedelta(days=7)).timestamp()),
+                    "day_30": int((now - timedelta(days=30)).timestamp()),
+                }
+            )
+            fresh_24h, recent_7d, old_30d = cursor.fetchone()
+
+            stale = total_jobs - old_30d
+
+            # Jobs by application status
+            status_counts = {
+                "not_applied": 0,
+                "applied": 0,
+                "interviewing": 0,
+                "rejected": 0,
+                "offered": 0,
+                "accepted": 0,
+            }
+
+            # Count not_applied (LEFT JOIN where application is NULL)
+            cursor = conn.execute(
+                """
+                SELECT COUNT(*)
+                FROM jobs j
+                LEFT JOIN applications a ON j.job_id = a.job_id
+                WHERE a.job_id IS NULL
+                """
+            )
+            status_counts["not_applied"] = cursor.fetchone()[0]
 
-        # Top 10 locations by job count
-        cursor = self.conn.execute(
-            """
-            SELECT location, COUNT(*) as count
-            FROM jobs
-            GROUP BY location
-            ORDER BY count DESC
-            LIMIT 10
-            """
-        )
-        top_locations = [
-            {"location": row[0], "count": row[1]}
-            for row in cursor.fetchall()
-        ]
-
-        # ===== Scraping Profiles Analytics =====
-
-        profiles = []
-        cursor = self.conn.execute("SELECT * FROM profiles")
-        for profile_row in cursor.fetchall():
-            profile = dict(profile_row)
-
-            # Count jobs for this profile
-            job_count_cursor = self.conn.execute(
-                "SELECT COUNT(*) FROM jobs WHERE profile_id = ?",
-                (profile["id"],)
+            # Count by application status
+            cursor = conn.execute(
+                """
+                SELECT status, COUNT(*) as count
+                FROM applications
+                GROUP BY status
+                """
             )
-            total_jobs_cached = job_count_cursor.fetchone()[0]
-
-            # Compute next_scrape_at
-            next_scrape_at = None
-            if profile["last_scraped_at"]:
-                last_scraped = datetime.fromisoformat(profile["last_scraped_at"])
-                next_scrape = last_scraped + timedelta(seconds=profile["refresh_interval"])
-                next_scrape_at = next_scrape.isoformat()
-
-            profiles.append({
-                "profile_id": profile["id"],
-                "name": profile["name"],
-                "location": profile["location"],
-                "distance": profile["distance"],
-                "query": profile["keywords"],
-                "refresh_interval_hours": profile["refresh_interval"] / 3600,
-                "time_filter": profile["time_filter"],
-                "enabled": bool(profile["enabled"]),
-                "last_scraped_at": profile["last_scraped_at"],
-                "next_scrape_at": next_scrape_at,
-                "total_jobs_cached": total_jobs_cached,
-                "error_count_24h": 0,  # Not implemented (requires error logging)
-            })
-
-        # ===== Applications Analytics =====
-
-        cursor = self.conn.execute("SELECT COUNT(*) FROM applications")
-        total_applications = cursor.fetchone()[0]
-
-        app_status_counts = {
-            "applied": 0,
-            "interviewing": 0,
-            "rejected": 0,
-            "offered": 0,
-            "accepted": 0,
-        }
+            for row in cursor.fetchall():
+                status = row[0]
+                count = row[1]
+                if status in status_counts:
+                    status_counts[status] = count
+
+            # Top 10 companies by job count
+            cursor = conn.execute(
+                """
+                SELECT company, normalized_company_name, n
+                FROM company_counts
+                ORDER BY n DESC
+                LIMIT 10
+                """
+            )
+            top_companies = [
+                {"company": row[0], "normalized_name": row[1], "count": row[2]}
+                for row in cursor.fetchall()
+            ]
 
-        cursor = self.conn.execute(
-            """
-            SELECT status, COUNT(*) as count
-            FROM applications
-            GROUP BY status
-            """
-        )
-        for row in cursor.fetchall():
-            status = row[0]
-            count = row[1]
-            if status in app_status_counts:
-                app_status_counts[status] = count
+            # Top 10 locations by job count
+            cursor = conn.execute(
+                """
+                SELECT location, COUNT(*) as count
+                FROM jobs
+                GROUP BY location
+                ORDER BY count DESC
+                LIMIT 10
+                """
+            )
+            top_locations = [
+                {"location": row[0], "count": row[1]}
+                for row in cursor.fetchall()
+            ]
+
+            # ===== Scraping Profiles Analytics =====
+
+            profiles = []
+            cursor = conn.execute("SELECT * FROM profiles")
+            for profile_row in cursor.fetchall():
+                profile = dict(profile_row)
+
+                # Count jobs for this profile
+                job_count_cursor = conn.execute(
+                    "SELECT COUNT(*) FROM jobs WHERE profile_id = ?",
+                    (profile["id"],)
+                )
+                total_jobs_cached = job_count_cursor.fetchone()[0]
+
+                # Compute next_scrape_at
+                next_scrape_at = None
+                if profile["last_scraped_at"]:
+                    last_scraped = datetime.fromisoformat(profile["last_scraped_at"])
+                    next_scrape = last_scraped + timedelta(seconds=profile["refresh_interval"])
+                    next_scrape_at = next_scrape.isoformat()
+
+                profiles.append({
+                    "profile_id": profile["id"],
+                    "name": profile["name"],
+                    "location": profile["location"],
+                    "distance": profile["distance"],
+                    "query": profile["keywords"],
+                    "refresh_interval_hours": profile["refresh_interval"] / 3600,
+                    "time_filter": profile["time_filter"],
+                    "enabled": bool(profile["enabled"]),
+                    "last_scraped_at": profile["last_scraped_at"],
+                    "next_scrape_at": next_scrape_at,
+                    "total_jobs_cached": total_jobs_cached,
+                    "error_count_24h": 0,  # Not implemented (requires error logging)
+                })
+
+            # ===== Applications Analytics =====
+
+            cursor = conn.execute("SELECT COUNT(*) FROM applications")
+            total_applications = cursor.fetchone()[0]
+
+            app_status_counts = {
+                "applied": 0,
+                "interviewing": 0,
+                "rejected": 0,
+                "offered": 0,
+                "accepted": 0,
+            }
+
+            cursor = conn.execute(
+                """
+                SELECT status, COUNT(*) as count
+                FROM applications
+                GROUP BY status
+                """
+            )
+            for row in cursor.fetchall():
+                status = row[0]
+                count = row[1]
+                if status in app_status_counts:
+                    app_status_counts[status] = count
 
-        # ===== Company Enrichment Analytics =====
+            # ===== Company Enrichment Analytics =====
 
-        cursor = self.conn.execute("SELECT COUNT(*) FROM company_enrichment")
-        total_companies = cursor.fetchone()[0]
+            cursor = conn.execute("SELECT COUNT(*) FROM company_enrichment")
+            total_companies = cursor.fetchone()[0]
 
-        cursor = self.conn.execute(
-            "SELECT COUNT(*) FROM company_enrichment WHERE next_refresh_at < ?",
-            (now.isoformat(),)
-        )
-        companies_needing_refresh = cursor.fetchone()[0]
+            cursor = conn.execute(
+                "SELECT COUNT(*) FROM company_enrichment WHERE next_refresh_at < ?",
+                (now_iso,)
+            )
+            companies_needing_refresh = cursor.fetchone()[0]
 
-        # ===== Cache Health =====
+            # ===== Cache Health =====
 
-        # Database file size
-        size_mb = 0.0
-        if self.db_path.exists():
-            size_bytes = self.db_path.stat().st_size
-            size_mb = size_bytes / (1024 * 1024)
+            # Database file size
+            size_mb = 0.0
+            if not self.in_memory and self.db_path.exists():
+                size_bytes = self.db_path.stat().st_size
+                size_mb = size_bytes / (1024 * 1024)
 
-        # Oldest and newest job
-        oldest_job = None
-        newest_job = None
+            # Oldest and newest job
+            oldest_job = None
+            newest_job = None
 
-        cursor = self.conn.execute(
-            "SELECT MIN(scraped_at), MAX(scraped_at) FROM jobs"
-        )
-        row = cursor.fetchone()
-        if row[0]:
-            oldest_job = row[0]
-            newest_job = row[1]
+            cursor = conn.execute(
+                "SELECT MIN(scraped_at), MAX(scraped_at) FROM jobs"
+            )
+            row = cursor.fetchone()
+            if row[0]:
+                oldest_job = row[0]
+                newest_job = row[1]
 
         # ===== Assemble analytics =====
 
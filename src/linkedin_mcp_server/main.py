@@ -94,7 +94,7 @@ async def initialize_services():
     db_path = Path.home() / ".linkedin-mcp" / "jobs.db"
     db_path.parent.mkdir(parents=True, exist_ok=True)
 
-    db = JobDatabase(str(db_path))
+    db = JobDatabase.get_or_create(db_path)
     db.initialize_schema()
     logger.info(f"Database initialized at {db_path}")
 
@@ -641,6 +641,10 @@ async def update_scraping_profile(
         db.upsert_profile(profile)
         logger.info(f"Updated scraping profile {profile_id}")
 
+        # Wake the profile's worker so the edit applies without waiting out its interval
+        if scraper_service:
+            scraper_service.wake_worker(profile_id)
+
         # Return updated profile
         updated_profile = db.get_profile(profile_id)
         if not updated_profile:
@@ -676,6 +680,10 @@ async def delete_scraping_profile(profile_id: int, hard_delete: bool = False) ->
         # Delete profile
         db.delete_profile(profile_id, hard_delete=hard_delete)
 
+        # Wake the profile's worker so it stops now instead of after its interval
+        if scraper_service:
+            scraper_service.wake_worker(profile_id)
+
         action = "deleted" if hard_delete else "disabled"
         logger.info(f"{action.capitalize()} scraping profile {profile_id}")
 
@@ -1,9 +1,13 @@
 """One-time migration script: JSONL cache → SQLite database"""
 
-import json
+import mmap
+import os
 import shutil
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime, timezone
+from typing import Iterator
 
 from loguru import logger
 
@@ -15,6 +19,76 @@ from linkedin_mcp_server.scraper import (
     extract_skills,
 )
 
+# orjson (optional "speedups" extra) parses bytes natively and much faster;
+# the stdlib module accepts the same bytes input
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+# Jobs per upsert batch (one executemany + commit each)
+MIGRATION_BATCH_SIZE = 1000
+
+# Caches at least this large are parsed and transformed across worker
+# processes (the SQLite writer stays in the parent); smaller ones run inline
+PARALLEL_MIGRATION_MIN_BYTES = 64 * 1024 * 1024
+PARALLEL_CHUNK_BYTES = 8 * 1024 * 1024
+MIGRATION_WORKERS = os.cpu_count() or 1
+
+# orjson parses straight from a memoryview; stdlib json needs real bytes
+_LOADS_ACCEPTS_BUFFERS = _json.__name__ == "orjson"
+
+
+def _iter_jsonl_lines(jsonl_path: Path, start: int = 0, end: int | None = None) -> Iterator[bytes | memoryview]:
+    """
+    Yield the lines of a JSONL file from a read-only memory map.
+
+    Lines are sliced out of the mapping by newline offset, so the kernel pages
+    the file in on demand and no buffered reader copies it. Each memoryview is
+    only valid until the next line is requested. Files that can't be mapped
+    (e.g. empty ones) fall back to regular line iteration.
+
+    Args:
+        jsonl_path: Path to the JSONL file
+        start: Byte offset of the first line to yield (must start a line)
+        end: Byte offset to stop at (must end a line); defaults to end of file
+    """
+    with open(jsonl_path, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            yield from f
+            return
+
+    with mm, memoryview(mm) as buf:
+        size = len(mm) if end is None else end
+        while start < size:
+            line_end = mm.find(b"\n", start, size)
+            if line_end == -1:
+                line_end = size
+            line = buf[start:line_end]
+            try:
+                yield line if _LOADS_ACCEPTS_BUFFERS else line.tobytes()
+            finally:
+                line.release()
+            start = line_end + 1
+
+
+def _split_jsonl(jsonl_path: Path, chunk_bytes: int) -> list[tuple[int, int]]:
+    """Split a JSONL file into (start, end) byte ranges ending on line boundaries."""
+    size = jsonl_path.stat().st_size
+    ranges = []
+    if not size:
+        return ranges
+    with open(jsonl_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        start = 0
+        while start < size:
+            end = mm.find(b"\n", min(start + chunk_bytes, size) - 1)
+            end = size if end == -1 else end + 1
+            ranges.append((start, end))
+            start = end
+    return ranges
+
 
 def migrate_jsonl_to_sqlite(
     jsonl_path: Path,
@@ -39,43 +113,89 @@ def migrate_jsonl_to_sqlite(
     # Create backup
     if backup:
         backup_path = jsonl_path.with_suffix('.jsonl.backup')
-        shutil.copy(jsonl_path, backup_path)
+        shutil.copyfile(jsonl_path, backup_path)
         logger.info(f"Created backup at {backup_path}")
 
     # Initialize database
     db = JobDatabase(db_path)
     db.initialize_schema()
 
-    # Read JSONL records
-    jobs = []
-    with open(jsonl_path, 'r') as f:
-        for line_num, line in enumerate(f, 1):
-            try:
-                job = json.loads(line)
-
-                # Transform to new schema
-                transformed_job = transform_job_record(job)
-                jobs.append(transformed_job)
+    # Read JSONL records, upserting in fixed-size batches so memory stays
+    # bounded and each batch is one executemany in one transaction
+    if MIGRATION_WORKERS > 1 and jsonl_path.stat().st_size >= PARALLEL_MIGRATION_MIN_BYTES:
+        transformed_jobs = _transform_jsonl_parallel(jsonl_path, MIGRATION_WORKERS)
+    else:
+        transformed_jobs = _transform_jsonl_range(jsonl_path)
 
-            except json.JSONDecodeError as e:
-                logger.error(f"Error parsing JSONL line {line_num}: {e}")
-                continue
-            except Exception as e:
-                logger.error(f"Error transforming job on line {line_num}: {e}")
-                continue
+    count = 0
+    jobs = []
+    for transformed_job in transformed_jobs:
+        jobs.append(transformed_job)
+        if len(jobs) >= MIGRATION_BATCH_SIZE:
+            count += db.upsert_jobs(jobs)
+            jobs = []
 
-    # Batch insert
+    # Flush the final partial batch
     if jobs:
-        count = db.upsert_jobs(jobs)
+        count += db.upsert_jobs(jobs)
+
+    if count:
         logger.info(f"Migrated {count} jobs from JSONL to SQLite")
     else:
-        count = 0
         logger.info("No jobs to migrate")
 
     db.close()
     return count
 
 
+def _transform_jsonl_range(jsonl_path: Path, start: int = 0, end: int | None = None) -> Iterator[dict]:
+    """Parse and transform the JSONL records in a byte range, skipping bad lines."""
+    where = "" if start == 0 else f" (chunk at byte {start})"
+    for line_num, line in enumerate(_iter_jsonl_lines(jsonl_path, start, end), 1):
+        try:
+            job = _json.loads(line)
+        except ValueError as e:
+            # ValueError also covers undecodable (non-UTF-8) bytes under stdlib json
+            logger.error(f"Error parsing JSONL line {line_num}{where}: {e}")
+            continue
+
+        try:
+            # Transform to new schema
+            transformed_job = transform_job_record(job)
+        except Exception as e:
+            logger.error(f"Error transforming job on line {line_num}{where}: {e}")
+            continue
+
+        yield transformed_job
+
+
+def _transform_jsonl_chunk(jsonl_path: Path, start: int, end: int) -> list[dict]:
+    """Worker-process entry point: transform one byte range of the cache."""
+    return list(_transform_jsonl_range(jsonl_path, start, end))
+
+
+def _transform_jsonl_parallel(jsonl_path: Path, workers: int) -> Iterator[dict]:
+    """
+    Transform a large JSONL cache across worker processes.
+
+    The file is split into newline-aligned byte ranges that workers parse and
+    transform independently. Results are yielded in file order (so later
+    duplicates still win on upsert), with at most two chunks per worker in
+    flight to keep memory bounded.
+    """
+    ranges = _split_jsonl(jsonl_path, PARALLEL_CHUNK_BYTES)
+    logger.info(f"Transforming {len(ranges)} chunks across {workers} worker processes")
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for start, end in ranges:
+            pending.append(executor.submit(_transform_jsonl_chunk, jsonl_path, start, end))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
 def transform_job_record(old_job: dict) -> dict:
     """
     Transform old JSONL job record to new schema.
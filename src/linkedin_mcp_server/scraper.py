@@ -2,14 +2,21 @@
 
 import asyncio
 import random
+import re
 from dataclasses import asdict, dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Any
 
 import httpx
+import soupsieve
 from bs4 import BeautifulSoup, Tag
 from loguru import logger
 
+# Parse with lxml (libxml2's C parser), several times faster than the
+# pure-Python html.parser; BeautifulSoup exposes the same Tag API over it
+HTML_PARSER = "lxml"
+
 # URL constants
 SEARCH_URL = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search-results/"
 DETAIL_URL = "https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/{job_id}"
@@ -53,10 +60,21 @@ SELECTORS = {
     "detail_salary": "div.salary.compensation__salary",
     "detail_description": "div.show-more-less-html__markup, div.description__text",
     "detail_job_criteria": "li.description__job-criteria-item",
+    "detail_criteria_header": "h3",
+    "detail_criteria_value": "span",
+    "detail_easy_apply": ".jobs-apply-button--top-card, [aria-label*='Easy Apply']",
 }
 
+# Relative posting dates as LinkedIn renders them ("2 days ago", "1 week ago")
+_RELATIVE_DATE_RE = re.compile(r'(\d+)\+?\s*(minute|hour|day|week|month|year)s?\s+ago', re.I)
+_RELATIVE_DATE_UNIT_DAYS = {"minute": 0, "hour": 0, "day": 1, "week": 7, "month": 30, "year": 365}
+
+# Selectors compiled once; soup.select_one(str) re-resolves the selector
+# string through soupsieve's cache on every call
+_COMPILED_SELECTORS = {key: soupsieve.compile(css) for key, css in SELECTORS.items()}
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class JobSummary:
     """Summary data from a LinkedIn search result card"""
     job_id: str
@@ -70,7 +88,7 @@ class JobSummary:
     benefits_badge: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class JobDetail:
     """Full metadata from a LinkedIn job detail page"""
     job_id: str
@@ -104,6 +122,38 @@ class JobDetail:
     normalized_company_name: str
 
 
+def _select_with_attr(el: Tag | None, attr: str, selector_key: str, root: Tag) -> Tag | None:
+    """Return the first match of an attribute-restricted selector, reusing el if possible
+
+    el must be the first match of the same selector without the [attr]
+    restriction; when it carries attr it is also the first restricted match,
+    so the second tree walk is skipped.
+    """
+    if el is None or el.has_attr(attr):
+        return el
+    return _COMPILED_SELECTORS[selector_key].select_one(root)
+
+
+def relative_date_to_iso(text: str, now: datetime | None = None) -> str | None:
+    """Convert a relative posting date like "2 days ago" to an ISO date
+
+    Months and years are approximated as 30 and 365 days.
+
+    Args:
+        text: Relative date text from a job posting
+        now: Reference time (defaults to the current local time)
+
+    Returns:
+        ISO date (YYYY-MM-DD), or None if the text is not a relative date
+    """
+    match = _RELATIVE_DATE_RE.search(text) if text else None
+    if not match:
+        return None
+
+    days = int(match.group(1)) * _RELATIVE_DATE_UNIT_DAYS[match.group(2).lower()]
+    return ((now or datetime.now()) - timedelta(days=days)).date().isoformat()
+
+
 def parse_search_card(card: Tag) -> JobSummary:
     """Extract summary fields from a search result card element
 
@@ -119,7 +169,7 @@ def parse_search_card(card: Tag) -> JobSummary:
         urn = card.get("data-entity-urn")
         if not urn:
             # Check child elements if not on card itself
-            urn_element = card.select_one(SELECTORS["card_entity_urn"])
+            urn_element = _COMPILED_SELECTORS["card_entity_urn"].select_one(card)
             if urn_element:
                 urn = urn_element.get("data-entity-urn")
 
@@ -127,28 +177,28 @@ def parse_search_card(card: Tag) -> JobSummary:
             job_id = str(urn).split(":")[-1]
 
         # Extract other fields with fallbacks
-        title_el = card.select_one(SELECTORS["card_title"])
+        title_el = _COMPILED_SELECTORS["card_title"].select_one(card)
         title = title_el.get_text(strip=True) if title_el else "N/A"
 
-        company_el = card.select_one(SELECTORS["card_company"])
+        company_el = _COMPILED_SELECTORS["card_company"].select_one(card)
         company = company_el.get_text(strip=True) if company_el else "N/A"
 
-        company_url_el = card.select_one(SELECTORS["card_company_url"])
+        company_url_el = _select_with_attr(company_el, "href", "card_company_url", card)
         company_url = company_url_el.get("href", "N/A") if company_url_el else "N/A"
 
-        location_el = card.select_one(SELECTORS["card_location"])
+        location_el = _COMPILED_SELECTORS["card_location"].select_one(card)
         location = location_el.get_text(strip=True) if location_el else "N/A"
 
-        posted_date_el = card.select_one(SELECTORS["card_posted_date"])
+        posted_date_el = _COMPILED_SELECTORS["card_posted_date"].select_one(card)
         posted_date = posted_date_el.get_text(strip=True) if posted_date_el else "N/A"
 
-        posted_date_iso_el = card.select_one(SELECTORS["card_posted_date_iso"])
+        posted_date_iso_el = _select_with_attr(posted_date_el, "datetime", "card_posted_date_iso", card)
         posted_date_iso = posted_date_iso_el.get("datetime", "N/A") if posted_date_iso_el else "N/A"
 
-        job_url_el = card.select_one(SELECTORS["card_job_url"])
+        job_url_el = _COMPILED_SELECTORS["card_job_url"].select_one(card)
         job_url = job_url_el.get("href", "N/A") if job_url_el else "N/A"
 
-        benefits_el = card.select_one(SELECTORS["card_benefits"])
+        benefits_el = _COMPILED_SELECTORS["card_benefits"].select_one(card)
         benefits_badge = benefits_el.get_text(strip=True) if benefits_el else "N/A"
 
         return JobSummary(
@@ -177,55 +227,78 @@ def parse_search_card(card: Tag) -> JobSummary:
         )
 
 
-def parse_job_detail_page(html: str, job_id: str) -> JobDetail:
+def parse_search_page(html: str | bytes) -> list[JobSummary]:
+    """Parse every job card on a search results page
+
+    The page is parsed into a single tree and each card is read from that
+    tree in place; cards without a job ID are dropped.
+
+    Args:
+        html: HTML content of a search results page (raw bytes are
+            decoded by the parser, skipping a separate str copy)
+
+    Returns:
+        List of JobSummary objects, in page order
+    """
+    soup = BeautifulSoup(html, HTML_PARSER)
+    summaries = []
+    for card in _COMPILED_SELECTORS["search_card"].select(soup):
+        summary = parse_search_card(card)
+        if summary.job_id != "N/A":
+            summaries.append(summary)
+    return summaries
+
+
+def parse_job_detail_page(html: str | bytes, job_id: str) -> JobDetail:
     """Extract all metadata fields from a job detail HTML fragment
 
     Args:
-        html: HTML content of the job detail page
+        html: HTML content of the job detail page (raw bytes are
+            decoded by the parser, skipping a separate str copy)
         job_id: LinkedIn job ID
 
     Returns:
         JobDetail with extracted fields
     """
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, HTML_PARSER)
     url = DETAIL_URL.format(job_id=job_id)
 
     try:
         # Extract basic fields
-        title_el = soup.select_one(SELECTORS["detail_title"])
+        title_el = _COMPILED_SELECTORS["detail_title"].select_one(soup)
         title = title_el.get_text(strip=True) if title_el else "N/A"
 
-        company_el = soup.select_one(SELECTORS["detail_company"])
+        company_el = _COMPILED_SELECTORS["detail_company"].select_one(soup)
         company = company_el.get_text(strip=True) if company_el else "N/A"
 
-        company_url_el = soup.select_one(SELECTORS["detail_company_url"])
+        company_url_el = _select_with_attr(company_el, "href", "detail_company_url", soup)
         company_url = company_url_el.get("href", "N/A") if company_url_el else "N/A"
 
-        location_el = soup.select_one(SELECTORS["detail_location"])
+        location_el = _COMPILED_SELECTORS["detail_location"].select_one(soup)
         location = location_el.get_text(strip=True) if location_el else "N/A"
 
-        posted_date_el = soup.select_one(SELECTORS["detail_posted_date"])
+        posted_date_el = _COMPILED_SELECTORS["detail_posted_date"].select_one(soup)
         posted_date = posted_date_el.get_text(strip=True) if posted_date_el else "N/A"
 
-        applicants_el = soup.select_one(SELECTORS["detail_applicants"])
+        applicants_el = _COMPILED_SELECTORS["detail_applicants"].select_one(soup)
         applicants = applicants_el.get_text(strip=True) if applicants_el else "N/A"
 
-        salary_el = soup.select_one(SELECTORS["detail_salary"])
+        salary_el = _COMPILED_SELECTORS["detail_salary"].select_one(soup)
         salary = salary_el.get_text(strip=True) if salary_el else "N/A"
 
-        description_el = soup.select_one(SELECTORS["detail_description"])
+        description_el = _COMPILED_SELECTORS["detail_description"].select_one(soup)
         raw_description = str(description_el) if description_el else "N/A"
 
         # Extract job criteria (seniority, employment type, function, industries)
-        criteria_items = soup.select(SELECTORS["detail_job_criteria"])
+        criteria_items = _COMPILED_SELECTORS["detail_job_criteria"].select(soup)
         seniority = "N/A"
         employment_type = "N/A"
         job_function = "N/A"
         industries = "N/A"
 
         for item in enumerate(criteria_items):
-            header = item[1].select_one("h3")
-            value = item[1].select_one("span")
+            header = _COMPILED_SELECTORS["detail_criteria_header"].select_one(item[1])
+            value = _COMPILED_SELECTORS["detail_criteria_value"].select_one(item[1])
             if header and value:
                 header_text = header.get_text(strip=True)
                 value_text = value.get_text(strip=True)
@@ -252,14 +325,16 @@ def parse_job_detail_page(html: str, job_id: str) -> JobDetail:
         visa = extract_visa_sponsorship(description_text)
 
         # Detect easy apply (check for easy apply badge/button)
-        easy_apply_el = soup.select_one(".jobs-apply-button--top-card") or soup.select_one("[aria-label*='Easy Apply']")
+        easy_apply_el = _COMPILED_SELECTORS["detail_easy_apply"].select_one(soup)
         easy_apply = easy_apply_el is not None
 
         # Get posted_date_iso (extract from posted_date_el if datetime attribute exists)
         # Try to get ISO date from datetime attribute, fall back to posted_date text
-        posted_date_el = soup.select_one(SELECTORS["detail_posted_date"])
         posted_date_iso_raw = posted_date_el.get("datetime") if posted_date_el and hasattr(posted_date_el, "get") else None
-        posted_date_iso = str(posted_date_iso_raw) if posted_date_iso_raw else posted_date
+        if posted_date_iso_raw:
+            posted_date_iso = str(posted_date_iso_raw)
+        else:
+            posted_date_iso = relative_date_to_iso(posted_date) or posted_date
 
         return JobDetail(
             job_id=job_id,
@@ -451,16 +526,10 @@ async def search_jobs_pages(
             response = await client.get(url)
             response.raise_for_status()
 
-            # Parse cards
-            soup = BeautifulSoup(response.text, "html.parser")
-            cards = soup.select(SELECTORS["search_card"])
+            page_summaries = parse_search_page(response.text)
+            summaries.extend(page_summaries)
 
-            for card in cards:
-                summary = parse_search_card(card)
-                if summary.job_id != "N/A":
-                    summaries.append(summary)
-
-            logger.info(f"Parsed {len(cards)} jobs from page {page + 1}")
+            logger.info(f"Parsed {len(page_summaries)} jobs from page {page + 1}")
 
             # Random delay between pages
             if page < num_pages - 1:
@@ -559,6 +628,69 @@ async def fetch_job_details(
 
 # ========== Enhanced Extraction Functions (Phase 2) ==========
 
+# Patterns are compiled once at import; the extractors run per scraped job.
+
+# Salary amounts: optional currency symbol, digits, optional commas, optional K/k
+_SALARY_AMOUNT_RE = re.compile(r'[\$£€¥]?\s*(\d{1,3}(?:,\d{3})*(?:\.\d+)?)\s*[Kk]?')
+_EQUITY_KEYWORDS = ("equity", "stock options", "rsu", "options", "stock")
+_CURRENCY_SYMBOLS = {
+    "$": "USD",
+    "£": "GBP",
+    "€": "EUR",
+    "¥": "JPY",
+}
+
+# Common tech skills, matched in a single pass by one alternation
+_SKILL_PATTERNS = [
+    # Programming languages
+    r'\bPython\b', r'\bJava\b', r'\bC\+\+\b', r'\bGo\b', r'\bRust\b',
+    r'\bJavaScript\b', r'\bTypeScript\b', r'\bScala\b', r'\bKotlin\b',
+
+    # ML/AI frameworks
+    r'\bTensorFlow\b', r'\bPyTorch\b', r'\bKeras\b', r'\bscikit-learn\b',
+    r'\bHugging\s*Face\b', r'\bLangChain\b', r'\bOpenAI\b',
+
+    # Cloud platforms
+    r'\bAWS\b', r'\bGCP\b', r'\bGoogle\s*Cloud\b', r'\bAzure\b',
+
+    # Databases
+    r'\bPostgreSQL\b', r'\bMySQL\b', r'\bMongoDB\b', r'\bRedis\b',
+    r'\bSQLite\b', r'\bCassandra\b',
+
+    # DevOps/Tools
+    r'\bDocker\b', r'\bKubernetes\b', r'\bTerraform\b', r'\bGit\b',
+    r'\bCI/CD\b', r'\bJenkins\b', r'\bGitHub\s*Actions\b',
+
+    # Data tools
+    r'\bSpark\b', r'\bAirflow\b', r'\bKafka\b', r'\bdbt\b',
+    r'\bPandas\b', r'\bNumPy\b',
+]
+_SKILLS_RE = re.compile("|".join(_SKILL_PATTERNS), re.IGNORECASE)
+
+# Description insights
+_EXPERIENCE_RE = re.compile(r'(\d+)\+?\s*years?\s*(of\s*)?(experience|exp)', re.I)
+_DEGREE_RES = [
+    re.compile(r'(MS|Master|PhD|Doctorate|Bachelor|BS|BA)\s*(degree)?', re.I),
+    re.compile(r'(Graduate|Undergraduate)\s*degree', re.I),
+]
+
+# Remote / visa keywords, matched as case-insensitive substrings in one search
+_REMOTE_KEYWORDS = frozenset({
+    "remote", "work from home", "wfh", "distributed", "anywhere",
+    "fully remote", "remote-first", "remote work", "work remotely"
+})
+_VISA_KEYWORDS = frozenset({
+    "visa sponsorship", "h1b", "h-1b", "work authorization",
+    "sponsorship available", "sponsor visa", "visa support",
+    "eligible for visa", "can sponsor"
+})
+
+_REMOTE_RE = re.compile("|".join(map(re.escape, sorted(_REMOTE_KEYWORDS))), re.I)
+_VISA_RE = re.compile("|".join(map(re.escape, sorted(_VISA_KEYWORDS))), re.I)
+
+# Action verbs that mark a description line as a responsibility
+_RESPONSIBILITY_VERBS = ('Build', 'Design', 'Develop', 'Lead', 'Manage', 'Deploy', 'Create', 'Implement')
+
 
 def extract_salary_structured(salary_text: str) -> dict:
     """
@@ -575,61 +707,52 @@ def extract_salary_structured(salary_text: str) -> dict:
     Returns:
         Dictionary with min, max, currency, and equity_offered
     """
-    import re
+    min_val, max_val, currency, equity_offered = _parse_salary(salary_text)
+    return {"min": min_val, "max": max_val, "currency": currency, "equity_offered": equity_offered}
+
 
-    result = {"min": None, "max": None, "currency": "USD", "equity_offered": False}
+@lru_cache(maxsize=1024)
+def _parse_salary(salary_text: str) -> tuple[int | None, int | None, str, bool]:
+    """Parse salary text into an immutable (min, max, currency, equity) tuple.
 
+    Salary strings repeat heavily across postings ("N/A", common bands), so
+    parses are memoized; callers get a fresh dict built from the tuple.
+    """
     if not salary_text or salary_text == "N/A":
-        return result
+        return None, None, "USD", False
+
+    text_lower = salary_text.lower()
 
     # Detect equity
-    equity_keywords = ["equity", "stock options", "rsu", "options", "stock"]
-    result["equity_offered"] = any(kw in salary_text.lower() for kw in equity_keywords)
+    equity_offered = any(kw in text_lower for kw in _EQUITY_KEYWORDS)
 
     # Detect currency
-    currency_map = {
-        "$": "USD",
-        "£": "GBP",
-        "€": "EUR",
-        "¥": "JPY",
-    }
-    for symbol, code in currency_map.items():
+    currency = "USD"
+    for symbol, code in _CURRENCY_SYMBOLS.items():
         if symbol in salary_text:
-            result["currency"] = code
+            currency = code
             break
 
     # Extract numbers (handle K/k suffix and commas)
-    # Pattern: optional currency symbol, digits, optional comma, optional K/k
-    pattern = r'[\$£€¥]?\s*(\d{1,3}(?:,\d{3})*(?:\.\d+)?)\s*[Kk]?'
-    matches = re.findall(pattern, salary_text)
+    matches = _SALARY_AMOUNT_RE.findall(salary_text)
 
     if not matches:
-        return result
+        return None, None, currency, equity_offered
+
+    # Heuristic: if a K/k suffix appears, numbers < 1000 are in thousands
+    in_thousands = 'k' in text_lower
 
-    # Parse matches
     nums = []
     for match in matches:
-        # Remove commas
-        num_str = match.replace(',', '')
-        num = float(num_str)
-
-        # Check if K/k suffix present in original text
-        if 'k' in salary_text.lower():
-            # Heuristic: if number < 1000, assume it's in thousands
-            if num < 1000:
-                num *= 1000
-
+        num = float(match.replace(',', ''))
+        if in_thousands and num < 1000:
+            num *= 1000
         nums.append(int(num))
 
     # Assign min/max
     if len(nums) == 1:
-        result["min"] = nums[0]
-        result["max"] = nums[0]
-    elif len(nums) >= 2:
-        result["min"] = min(nums[0], nums[1])
-        result["max"] = max(nums[0], nums[1])
-
-    return result
+        return nums[0], nums[0], currency, equity_offered
+    return min(nums[0], nums[1]), max(nums[0], nums[1]), currency, equity_offered
 
 
 def extract_remote_eligibility(description: str) -> bool:
@@ -645,13 +768,7 @@ def extract_remote_eligibility(description: str) -> bool:
     if not description or description == "N/A":
         return False
 
-    desc_lower = description.lower()
-    remote_keywords = [
-        "remote", "work from home", "wfh", "distributed", "anywhere",
-        "fully remote", "remote-first", "remote work", "work remotely"
-    ]
-
-    return any(kw in desc_lower for kw in remote_keywords)
+    return _REMOTE_RE.search(description) is not None
 
 
 def extract_visa_sponsorship(description: str) -> bool:
@@ -667,14 +784,7 @@ def extract_visa_sponsorship(description: str) -> bool:
     if not description or description == "N/A":
         return False
 
-    desc_lower = description.lower()
-    visa_keywords = [
-        "visa sponsorship", "h1b", "h-1b", "work authorization",
-        "sponsorship available", "sponsor visa", "visa support",
-        "eligible for visa", "can sponsor"
-    ]
-
-    return any(kw in desc_lower for kw in visa_keywords)
+    return _VISA_RE.search(description) is not None
 
 
 def extract_skills(description: str) -> list[str]:
@@ -687,47 +797,17 @@ def extract_skills(description: str) -> list[str]:
     Returns:
         Sorted list of detected skills
     """
-    import re
-
     if not description or description == "N/A":
         return []
 
-    # Common tech skills to look for
-    skill_patterns = [
-        # Programming languages
-        r'\bPython\b', r'\bJava\b', r'\bC\+\+\b', r'\bGo\b', r'\bRust\b',
-        r'\bJavaScript\b', r'\bTypeScript\b', r'\bScala\b', r'\bKotlin\b',
-
-        # ML/AI frameworks
-        r'\bTensorFlow\b', r'\bPyTorch\b', r'\bKeras\b', r'\bscikit-learn\b',
-        r'\bHugging\s*Face\b', r'\bLangChain\b', r'\bOpenAI\b',
-
-        # Cloud platforms
-        r'\bAWS\b', r'\bGCP\b', r'\bGoogle\s*Cloud\b', r'\bAzure\b',
-
-        # Databases
-        r'\bPostgreSQL\b', r'\bMySQL\b', r'\bMongoDB\b', r'\bRedis\b',
-        r'\bSQLite\b', r'\bCassandra\b',
-
-        # DevOps/Tools
-        r'\bDocker\b', r'\bKubernetes\b', r'\bTerraform\b', r'\bGit\b',
-        r'\bCI/CD\b', r'\bJenkins\b', r'\bGitHub\s*Actions\b',
-
-        # Data tools
-        r'\bSpark\b', r'\bAirflow\b', r'\bKafka\b', r'\bdbt\b',
-        r'\bPandas\b', r'\bNumPy\b',
-    ]
-
     found_skills = set()
 
-    for pattern in skill_patterns:
-        matches = re.findall(pattern, description, re.IGNORECASE)
-        for match in matches:
-            # Normalize capitalization (preserve original casing for acronyms)
-            if match.isupper() and len(match) <= 4:
-                found_skills.add(match.upper())
-            else:
-                found_skills.add(match.title())
+    for match in _SKILLS_RE.findall(description):
+        # Normalize capitalization (preserve original casing for acronyms)
+        if match.isupper() and len(match) <= 4:
+            found_skills.add(match.upper())
+        else:
+            found_skills.add(match.title())
 
     return sorted(list(found_skills))
 
@@ -742,8 +822,6 @@ def extract_description_insights(description_text: str) -> dict:
     Returns:
         Dictionary with description_summary, key_requirements, and key_responsibilities_preview
     """
-    import re
-
     if not description_text or description_text == "N/A":
         return {
             "description_summary": None,
@@ -758,14 +836,13 @@ def extract_description_insights(description_text: str) -> dict:
     requirements = []
 
     # Years of experience
-    exp_match = re.search(r'(\d+)\+?\s*years?\s*(of\s*)?(experience|exp)', description_text, re.I)
+    exp_match = _EXPERIENCE_RE.search(description_text)
     if exp_match:
         requirements.append(f"{exp_match.group(1)}+ years experience")
 
     # Degree requirements
-    degree_patterns = [r'(MS|Master|PhD|Doctorate|Bachelor|BS|BA)\s*(degree)?', r'(Graduate|Undergraduate)\s*degree']
-    for pattern in degree_patterns:
-        match = re.search(pattern, description_text, re.I)
+    for pattern in _DEGREE_RES:
+        match = pattern.search(description_text)
         if match:
             requirements.append(match.group(0))
             break
@@ -774,17 +851,17 @@ def extract_description_insights(description_text: str) -> dict:
     found_skills = extract_skills(description_text)
     requirements.extend(found_skills[:5])
 
-    # Key responsibilities (extract sentences starting with action verbs)
-    resp_verbs = ['Build', 'Design', 'Develop', 'Lead', 'Manage', 'Deploy', 'Create', 'Implement']
+    # Key responsibilities (lines starting with action verbs; only 3 are shown)
     responsibilities = []
     for line in description_text.split('\n'):
-        for verb in resp_verbs:
-            if line.strip().startswith(verb):
-                responsibilities.append(line.strip()[:80])
+        line = line.strip()
+        if line.startswith(_RESPONSIBILITY_VERBS):
+            responsibilities.append(line[:80])
+            if len(responsibilities) == 3:
                 break
 
     return {
         "description_summary": summary,
         "key_requirements": requirements,
-        "key_responsibilities_preview": " • ".join(responsibilities[:3]) if responsibilities else None
+        "key_responsibilities_preview": " • ".join(responsibilities) if responsibilities else None
     }
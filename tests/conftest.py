@@ -0,0 +1,65 @@
+"""Shared pytest fixtures"""
+
+import shutil
+
+import pytest
+
+from linkedin_mcp_server.db import JobDatabase
+
+# Throwaway test databases need no durability: skip fsyncs and WAL files
+TEST_PRAGMAS = """
+    PRAGMA synchronous=OFF;
+    PRAGMA journal_mode=MEMORY;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA locking_mode=EXCLUSIVE;
+"""
+
+
+@pytest.fixture(scope="session")
+def golden_db():
+    """In-memory database with the full schema, initialized once per test session"""
+    with JobDatabase(":memory:") as golden:
+        golden.conn.executescript(TEST_PRAGMAS)
+        golden.initialize_schema()
+        yield golden
+
+
+@pytest.fixture(scope="session")
+def make_db(golden_db):
+    """Factory for fresh in-memory JobDatabases cloned page-by-page from the golden copy"""
+
+    def make() -> JobDatabase:
+        database = JobDatabase(":memory:")
+        database.conn.executescript(TEST_PRAGMAS)
+        golden_db.conn.backup(database.conn)
+        return database
+
+    return make
+
+
+@pytest.fixture
+def db(make_db):
+    """Fresh in-memory JobDatabase per test (no per-test DDL or disk I/O)"""
+    database = make_db()
+    yield database
+    database.close()
+
+
+@pytest.fixture(scope="session")
+def schema_template(tmp_path_factory):
+    """On-disk database file with the full schema, initialized once per test session"""
+    path = tmp_path_factory.mktemp("template") / "template.db"
+    # Closing the last connection checkpoints the WAL, so the file alone is complete
+    with JobDatabase(path) as template:
+        template.initialize_schema()
+    return path
+
+
+@pytest.fixture
+def fresh_db(tmp_path, schema_template):
+    """Fresh on-disk JobDatabase copied from the schema template (no per-test DDL)"""
+    db_path = tmp_path / "test.db"
+    shutil.copyfile(schema_template, db_path)
+    database = JobDatabase(db_path)
+    yield database
+    database.close()
@@ -1,6 +1,7 @@
 """Tests for background scraper service"""
 
 import asyncio
+from dataclasses import replace
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -17,8 +18,9 @@ def mock_db():
     """Create a mock JobDatabase"""
     db = MagicMock()
     db.list_profiles.return_value = []
-    db.seed_default_profile.return_value = 1
+    db.seed_default_profile.return_value = None
     db.update_profile_last_run.return_value = None
+    db.list_recent_job_ids.return_value = set()
     return db
 
 
@@ -54,6 +56,20 @@ async def test_scraping_profile_dataclass(sample_profile):
     assert profile.enabled is True
 
 
+def test_scraping_profile_search_kwargs(sample_profile):
+    """Test ScrapingProfile builds search arguments once and reuses them"""
+    profile = ScrapingProfile(**sample_profile)
+
+    assert profile.search_kwargs == {
+        "query": "ML Engineer",
+        "location": "San Francisco, CA",
+        "distance": 25,
+        "num_pages": 5,
+        "filters": {"f_TPR": "r7200"},
+    }
+    assert profile.search_kwargs is profile.search_kwargs
+
+
 @pytest.mark.asyncio
 async def test_service_initialization(mock_db):
     """Test BackgroundScraperService initialization"""
@@ -74,7 +90,7 @@ async def test_start_with_no_profiles(mock_db):
     # No profiles initially
     mock_db.list_profiles.return_value = []
 
-    # After seeding, return one default profile (disabled by default)
+    # Seeding returns the created default profile (disabled here)
     default_profile = {
         "id": 1,
         "name": "default",
@@ -88,12 +104,13 @@ async def test_start_with_no_profiles(mock_db):
         "created_at": "2026-02-15T10:00:00Z",
         "updated_at": "2026-02-15T10:00:00Z",
     }
-    mock_db.list_profiles.side_effect = [[], [default_profile]]
+    mock_db.seed_default_profile.return_value = default_profile
 
     await service.start()
 
-    # Verify seed_default_profile was called
+    # Verify seed_default_profile was called and its row used without a re-list
     mock_db.seed_default_profile.assert_called_once()
+    mock_db.list_profiles.assert_called_once()
 
     # No workers spawned because default profile is disabled
     assert len(service.worker_tasks) == 0
@@ -300,8 +317,34 @@ async def test_run_profile_worker_scrapes_and_waits(mock_db, sample_profile):
 
     # Verify scrape was called at least once
     assert service._scrape_profile_once.call_count >= 1
-    # Verify last_run was updated
-    assert mock_db.update_profile_last_run.call_count >= 1
+    # Verify last_run was buffered and flushed once on stop
+    mock_db.update_profile_last_run.assert_not_called()
+    mock_db.update_profiles_last_run.assert_called_once()
+    assert list(mock_db.update_profiles_last_run.call_args.args[0]) == [profile.id]
+
+
+@pytest.mark.asyncio
+async def test_flush_last_runs_batches_all_profiles(mock_db):
+    """Test _flush_last_runs writes all pending timestamps in one batch"""
+    service = BackgroundScraperService(mock_db)
+    service._pending_last_run = {
+        1: "2026-02-15T10:00:00",
+        2: "2026-02-15T10:01:00",
+        3: "2026-02-15T10:02:00",
+    }
+
+    service._flush_last_runs()
+
+    mock_db.update_profiles_last_run.assert_called_once_with({
+        1: "2026-02-15T10:00:00",
+        2: "2026-02-15T10:01:00",
+        3: "2026-02-15T10:02:00",
+    })
+    assert service._pending_last_run == {}
+
+    # Nothing pending → no DB write
+    service._flush_last_runs()
+    assert mock_db.update_profiles_last_run.call_count == 1
 
 
 @pytest.mark.asyncio
@@ -331,6 +374,117 @@ async def test_run_profile_worker_handles_scrape_errors(mock_db, sample_profile)
     assert service._scrape_profile_once.call_count >= 1
 
 
+@pytest.mark.asyncio
+async def test_wake_worker_applies_profile_edit_immediately(mock_db, sample_profile):
+    """Test wake_worker interrupts the wait and the worker reloads its profile"""
+    service = BackgroundScraperService(mock_db)
+    profile = ScrapingProfile(**sample_profile)
+    service._scrape_profile_once = AsyncMock(return_value=5)
+
+    # Edited profile returned by the DB after the wake
+    mock_db.get_profile.return_value = {**sample_profile, "keywords": "AI Engineer"}
+
+    await service._spawn_worker(profile)
+    await asyncio.sleep(0.05)
+    assert service._scrape_profile_once.call_count == 1
+
+    # refresh_interval is 3600s, but the wake triggers the next scrape right away
+    service.wake_worker(profile.id)
+    await asyncio.sleep(0.05)
+
+    assert service._scrape_profile_once.call_count == 2
+    assert service._scrape_profile_once.call_args.args[0].keywords == "AI Engineer"
+
+    await service.stop()
+
+
+@pytest.mark.asyncio
+async def test_wake_worker_stops_disabled_profile(mock_db, sample_profile):
+    """Test a woken worker exits and deregisters when its profile was disabled"""
+    service = BackgroundScraperService(mock_db)
+    profile = ScrapingProfile(**sample_profile)
+    service._scrape_profile_once = AsyncMock(return_value=5)
+    mock_db.get_profile.return_value = {**sample_profile, "enabled": False}
+
+    await service._spawn_worker(profile)
+    await asyncio.sleep(0.05)
+    task = service.worker_tasks[profile.id]
+
+    service.wake_worker(profile.id)
+    await asyncio.sleep(0.05)
+
+    assert task.done()
+    assert profile.id not in service.worker_tasks
+    assert service._scrape_profile_once.call_count == 1
+
+    await service.stop()
+
+
+@pytest.mark.asyncio
+async def test_wake_during_error_backoff_reloads_profile(mock_db, sample_profile):
+    """Test a wake during the error backoff reloads the profile before retrying"""
+    service = BackgroundScraperService(mock_db)
+    profile = ScrapingProfile(**sample_profile)
+    service._scrape_profile_once = AsyncMock(side_effect=[Exception("Scraping failed"), 5])
+    mock_db.get_profile.return_value = {**sample_profile, "keywords": "AI Engineer"}
+
+    await service._spawn_worker(profile)
+    await asyncio.sleep(0.05)
+    assert service._scrape_profile_once.call_count == 1
+
+    # Backoff is min(refresh_interval, 300)s, but the wake retries right away
+    service.wake_worker(profile.id)
+    await asyncio.sleep(0.05)
+
+    mock_db.get_profile.assert_called_once_with(profile.id)
+    assert service._scrape_profile_once.call_count == 2
+    assert service._scrape_profile_once.call_args.args[0].keywords == "AI Engineer"
+
+    await service.stop()
+
+
+@pytest.mark.asyncio
+async def test_wake_during_error_backoff_stops_disabled_profile(mock_db, sample_profile):
+    """Test a failing worker woken for a disabled profile exits instead of retrying"""
+    service = BackgroundScraperService(mock_db)
+    profile = ScrapingProfile(**sample_profile)
+    service._scrape_profile_once = AsyncMock(side_effect=Exception("Scraping failed"))
+    mock_db.get_profile.return_value = {**sample_profile, "enabled": False}
+
+    await service._spawn_worker(profile)
+    await asyncio.sleep(0.05)
+    task = service.worker_tasks[profile.id]
+
+    service.wake_worker(profile.id)
+    await asyncio.sleep(0.05)
+
+    assert task.done()
+    assert profile.id not in service.worker_tasks
+    assert service._scrape_profile_once.call_count == 1
+
+    await service.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_wakes_sleeping_workers(mock_db, sample_profile):
+    """Test stop() wakes workers out of their refresh_interval wait"""
+    service = BackgroundScraperService(mock_db)
+    profile = ScrapingProfile(**sample_profile)
+    service._scrape_profile_once = AsyncMock(return_value=5)
+
+    await service._spawn_worker(profile)
+    await asyncio.sleep(0.05)
+    task = service.worker_tasks[profile.id]
+
+    # Set shutdown and wake without cancelling: worker must exit on its own
+    service.shutdown_event.set()
+    service.wake_worker(profile.id)
+    await asyncio.wait_for(task, timeout=1)
+
+    assert not task.cancelled()
+    mock_db.get_profile.assert_not_called()
+
+
 # ========== Scraping Logic Tests (Step 9) ==========
 
 
@@ -441,78 +595,80 @@ async def test_scrape_profile_once_with_mock(
 
 
 @pytest.mark.asyncio
-async def test_scrape_profile_once_no_jobs_found(mock_db, sample_profile):
-    """Test _scrape_profile_once when no jobs found"""
+async def test_scrape_profile_once_skips_recent_jobs(
+    mock_db, sample_profile, mock_job_summary, mock_job_detail
+):
+    """Test _scrape_profile_once only fetches details for jobs not seen recently"""
     service = BackgroundScraperService(mock_db)
     profile = ScrapingProfile(**sample_profile)
+    known_summary = replace(mock_job_summary, job_id="4271043000")
+    mock_db.list_recent_job_ids.return_value = {"4271043000"}
+    mock_db.upsert_jobs.return_value = 1
 
-    # Mock search_jobs_pages to return empty list
     with patch(
         "linkedin_mcp_server.background_scraper.search_jobs_pages",
         new_callable=AsyncMock,
     ) as mock_search:
-        mock_search.return_value = []
+        with patch(
+            "linkedin_mcp_server.background_scraper.fetch_job_details",
+            new_callable=AsyncMock,
+        ) as mock_fetch:
+            mock_search.return_value = [known_summary, mock_job_summary]
+            mock_fetch.return_value = [mock_job_detail]
 
-        count = await service._scrape_profile_once(profile)
+            # First scrape only fetches the unknown job
+            assert await service._scrape_profile_once(profile) == 1
+            assert mock_fetch.call_args.args[1] == ["4271043001"]
 
-        assert count == 0
-        # Verify upsert not called
-        mock_db.upsert_jobs.assert_not_called()
+            # Second scrape finds both jobs known and fetches nothing
+            assert await service._scrape_profile_once(profile) == 0
+            assert mock_fetch.call_count == 1
+
+    # Recent IDs are loaded from the DB once, not per scrape
+    mock_db.list_recent_job_ids.assert_called_once()
 
 
 @pytest.mark.asyncio
-async def test_detect_job_changes(mock_db):
-    """Test _detect_job_changes detects and records changes"""
+async def test_scrape_profile_once_shares_search_results(
+    mock_db, sample_profile, mock_job_summary
+):
+    """Test profiles with identical searches reuse cached search results"""
     service = BackgroundScraperService(mock_db)
+    profile = ScrapingProfile(**sample_profile)
+    twin_profile = ScrapingProfile(**{**sample_profile, "id": 2, "name": "twin"})
+    other_profile = ScrapingProfile(**{**sample_profile, "id": 3, "keywords": "Data Scientist"})
+    mock_db.list_recent_job_ids.return_value = {mock_job_summary.job_id}
 
-    old_job = {
-        "job_id": "123",
-        "salary": "$100K - $150K",
-        "number_of_applicants": "50 applicants",
-        "raw_description": "Old description",
-    }
-
-    new_job = {
-        "job_id": "123",
-        "salary": "$120K - $170K",  # Changed
-        "number_of_applicants": "75 applicants",  # Changed
-        "raw_description": "Old description",  # Unchanged
-    }
-
-    await service._detect_job_changes(old_job, new_job)
+    with patch(
+        "linkedin_mcp_server.background_scraper.search_jobs_pages",
+        new_callable=AsyncMock,
+    ) as mock_search:
+        mock_search.return_value = [mock_job_summary]
 
-    # Verify record_job_change called twice (salary and applicants changed)
-    assert mock_db.record_job_change.call_count == 2
+        await service._scrape_profile_once(profile)
+        await service._scrape_profile_once(twin_profile)
+        assert mock_search.call_count == 1
 
-    # Verify correct calls
-    calls = mock_db.record_job_change.call_args_list
-    assert any(
-        call.kwargs["field_name"] == "salary"
-        and call.kwargs["old_value"] == "$100K - $150K"
-        and call.kwargs["new_value"] == "$120K - $170K"
-        for call in calls
-    )
-    assert any(
-        call.kwargs["field_name"] == "number_of_applicants"
-        and call.kwargs["old_value"] == "50 applicants"
-        and call.kwargs["new_value"] == "75 applicants"
-        for call in calls
-    )
+        # A different search is not served from the cache
+        await service._scrape_profile_once(other_profile)
+        assert mock_search.call_count == 2
 
 
 @pytest.mark.asyncio
-async def test_detect_job_changes_no_changes(mock_db):
-    """Test _detect_job_changes when no fields changed"""
+async def test_scrape_profile_once_no_jobs_found(mock_db, sample_profile):
+    """Test _scrape_profile_once when no jobs found"""
     service = BackgroundScraperService(mock_db)
+    profile = ScrapingProfile(**sample_profile)
 
-    job = {
-        "job_id": "123",
-        "salary": "$100K - $150K",
-        "number_of_applicants": "50 applicants",
-        "raw_description": "Same description",
-    }
+    # Mock search_jobs_pages to return empty list
+    with patch(
+        "linkedin_mcp_server.background_scraper.search_jobs_pages",
+        new_callable=AsyncMock,
+    ) as mock_search:
+        mock_search.return_value = []
 
-    await service._detect_job_changes(job, job)
+        count = await service._scrape_profile_once(profile)
 
-    # Verify record_job_change not called
-    mock_db.record_job_change.assert_not_called()
+        assert count == 0
+        # Verify upsert not called
+        mock_db.upsert_jobs.assert_not_called()
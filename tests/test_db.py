@@ -4,10 +4,29 @@ Tests for database schema and connection lifecycle.
 
 import sqlite3
 import tempfile
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 import pytest
 from linkedin_mcp_server.db import JobDatabase, normalize_company_name
 
+# Fixed timestamp for rows whose scrape time is irrelevant to the test
+_NOW_ISO = "2026-02-15T10:00:00+00:00"
+
+# Minimal valid job row; tests derive jobs via {**BASE_JOB, "job_id": ..., ...}
+BASE_JOB = {
+    "title": "Job",
+    "company": "Test Co",
+    "location": "SF",
+    "posted_date": "2026-02-15",
+    "posted_date_iso": "2026-02-15T10:00:00Z",
+    "scraped_at": _NOW_ISO,
+}
+
+
+def _count(db, table="jobs"):
+    """Row count of a table; one SQL string per table so the statement cache is reused."""
+    return db.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
 
 def test_normalize_company_name():
     """Test company name normalization removes common suffixes."""
@@ -29,19 +48,16 @@ def test_initialize_schema():
         db.initialize_schema()
 
         # Verify tables exist
-        cursor = db.conn.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name"
-        )
-        tables = [row[0] for row in cursor.fetchall()]
+        tables = {name for (name,) in db.conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
 
         expected_tables = [
             "applications",
+            "company_counts",
             "company_enrichment",
             "job_changes",
             "jobs",
             "jobs_fts",
             "jobs_fts_config",
-            "jobs_fts_content",
             "jobs_fts_data",
             "jobs_fts_docsize",
             "jobs_fts_idx",
@@ -49,8 +65,8 @@ def test_initialize_schema():
         ]
 
         # FTS5 creates additional internal tables
-        for table in ["applications", "company_enrichment", "job_changes", "jobs", "jobs_fts", "profiles"]:
-            assert table in tables, f"Table {table} not found"
+        missing = set(expected_tables) - tables
+        assert not missing, f"Missing tables: {missing}"
 
         # Verify WAL mode enabled
         cursor = db.conn.execute("PRAGMA journal_mode")
@@ -65,1109 +81,1060 @@ def test_initialize_schema():
         db.close()
 
 
-def test_initialize_schema_idempotent():
-    """Test that initialize_schema() can be called multiple times without errors."""
+def test_connection_pragmas():
+    """Test on-disk databases use WAL with relaxed fsync and in-memory temp storage."""
     with tempfile.TemporaryDirectory() as tmpdir:
         db_path = Path(tmpdir) / "test.db"
         db = JobDatabase(db_path)
 
-        # Call initialize_schema() twice
-        db.initialize_schema()
-        db.initialize_schema()  # Should not raise
-
-        # Verify database still works
-        cursor = db.conn.execute("SELECT COUNT(*) FROM jobs")
-        count = cursor.fetchone()[0]
-        assert count == 0
+        assert db.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert db.conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert db.conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+        assert db.conn.execute("PRAGMA mmap_size").fetchone()[0] == 268435456
 
         db.close()
 
 
-def test_context_manager():
-    """Test database context manager."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
+def test_in_memory_database():
+    """Test ":memory:" databases work without touching the filesystem."""
+    with JobDatabase(":memory:") as db:
+        db.initialize_schema()
 
-        with JobDatabase(db_path) as db:
-            db.initialize_schema()
+        assert db.in_memory
+        assert db.conn.execute("PRAGMA journal_mode").fetchone()[0] == "memory"
+        assert db.get_cache_analytics()["cache_health"]["size_mb"] == 0.0
 
-            # Verify database works inside context
-            cursor = db.conn.execute("SELECT COUNT(*) FROM jobs")
-            count = cursor.fetchone()[0]
-            assert count == 0
 
-        # Verify connection closed after context
-        # Attempting to use connection should fail
+def test_read_connection_pool():
+    """Test on-disk reads go through a lazily-filled, bounded pool of read-only connections."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = Path(tmpdir) / "test.db"
+        with JobDatabase(db_path, max_readers=2) as db:
+            db.initialize_schema()
+            assert db._readers == []
+
+            # Readers see committed writes from the writer connection
+            db.upsert_jobs([{**BASE_JOB, "job_id": "1"}])
+            assert [job["job_id"] for job in db.query_jobs()] == ["1"]
+            assert len(db._readers) == 1
+
+            # Nested borrows open a second reader, then reuse returned ones
+            with db.read_conn() as first, db.read_conn() as second:
+                assert first is not second
+                assert first is not db.conn and second is not db.conn
+                with pytest.raises(sqlite3.OperationalError):
+                    first.execute("DELETE FROM jobs")
+            with db.read_conn() as reused:
+                assert reused in (first, second)
+            assert len(db._readers) == 2
+
+        # Closing the database closes pooled readers too
         with pytest.raises(sqlite3.ProgrammingError):
-            db.conn.execute("SELECT COUNT(*) FROM jobs")
+            first.execute("SELECT 1")
 
 
-def test_indexes_created():
-    """Test that all indexes are created."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        db = JobDatabase(db_path)
+def test_read_connection_pool_exhausted(tmp_path, monkeypatch):
+    """Test reads fall back to the writer instead of blocking once every reader is checked out."""
+    monkeypatch.setattr("linkedin_mcp_server.db.READ_POOL_TIMEOUT", 0.01)
+    with JobDatabase(tmp_path / "test.db", max_readers=1) as db:
         db.initialize_schema()
+        db.upsert_jobs([{**BASE_JOB, "job_id": "1"}])
 
-        # Get all indexes
-        cursor = db.conn.execute(
-            "SELECT name FROM sqlite_master WHERE type='index' ORDER BY name"
-        )
-        indexes = [row[0] for row in cursor.fetchall()]
-
-        expected_indexes = [
-            "idx_jobs_company",
-            "idx_jobs_location",
-            "idx_jobs_posted_date",
-            "idx_jobs_scraped_at",
-            "idx_jobs_remote",
-            "idx_jobs_visa",
-            "idx_jobs_profile",
-            "idx_applications_job_id",
-            "idx_applications_status",
-            "idx_company_normalized",
-            "idx_company_refresh",
-        ]
+        with db.read_conn() as held:
+            with db.read_conn() as fallback:
+                assert fallback is db.conn
+                assert fallback.execute("SELECT COUNT(*) FROM jobs").fetchone()[0] == 1
 
-        for index in expected_indexes:
-            assert index in indexes, f"Index {index} not found"
+        # The writer is never returned to the pool
+        with db.read_conn() as reused:
+            assert reused is held
+        assert db._read_pool.qsize() == 1
 
-        db.close()
 
-
-def test_fts5_triggers_created():
-    """Test that FTS5 sync triggers are created."""
+def test_initialize_schema_idempotent():
+    """Test that initialize_schema() can be called multiple times without errors."""
     with tempfile.TemporaryDirectory() as tmpdir:
         db_path = Path(tmpdir) / "test.db"
         db = JobDatabase(db_path)
-        db.initialize_schema()
-
-        # Get all triggers
-        cursor = db.conn.execute(
-            "SELECT name FROM sqlite_master WHERE type='trigger' ORDER BY name"
-        )
-        triggers = [row[0] for row in cursor.fetchall()]
 
-        expected_triggers = [
-            "jobs_fts_delete",
-            "jobs_fts_insert",
-            "jobs_fts_update",
-        ]
+        # Call initialize_schema() twice
+        db.initialize_schema()
+        db.initialize_schema()  # Should not raise
 
-        for trigger in expected_triggers:
-            assert trigger in triggers, f"Trigger {trigger} not found"
+        # Verify database still works
+        assert _count(db) == 0
 
         db.close()
 
 
-# ========== CRUD Operation Tests (Step 2) ==========
+def test_get_or_create_shares_instance_per_path(tmp_path):
+    """get_or_create returns one shared instance per file until it is closed."""
+    db_path = tmp_path / "shared.db"
 
-def test_upsert_jobs_insert():
-    """Test inserting new jobs."""
-    from datetime import datetime, timezone
+    db = JobDatabase.get_or_create(db_path)
+    holders = [db]
+    try:
+        holders.append(JobDatabase.get_or_create(str(db_path)))
+        holders.append(JobDatabase.get_or_create(tmp_path / "." / "shared.db"))
+        assert all(holder is db for holder in holders)
+    finally:
+        for holder in holders:
+            holder.close()
+    assert db._closed
 
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        db = JobDatabase(db_path)
-        db.initialize_schema()
-
-        # Create test jobs
-        jobs = [
-            {
-                "job_id": "123",
-                "title": "ML Engineer",
-                "company": "Anthropic, Inc.",
-                "location": "San Francisco, CA",
-                "posted_date": "2026-02-15",
-                "posted_date_iso": "2026-02-15T10:00:00Z",
-                "scraped_at": datetime.now(timezone.utc).isoformat(),
-            },
-            {
-                "job_id": "456",
-                "title": "Data Scientist",
-                "company": "Google LLC",
-                "location": "Mountain View, CA",
-                "posted_date": "2026-02-14",
-                "posted_date_iso": "2026-02-14T14:00:00Z",
-                "scraped_at": datetime.now(timezone.utc).isoformat(),
-            },
-        ]
+    reopened = JobDatabase.get_or_create(db_path)
+    try:
+        assert reopened is not db
+        assert not reopened._closed
+    finally:
+        reopened.close()
 
-        count = db.upsert_jobs(jobs)
-        assert count == 2
+    assert JobDatabase.get_or_create(":memory:") is not JobDatabase.get_or_create(":memory:")
 
-        # Verify jobs exist
-        cursor = db.conn.execute("SELECT COUNT(*) FROM jobs")
-        assert cursor.fetchone()[0] == 2
 
-        # Verify company name normalization
-        job = db.get_job("123")
-        assert job["normalized_company_name"] == "anthropic"
+def test_get_or_create_holders_survive_one_close(tmp_path):
+    """Closing one holder of a shared instance leaves it open for the others."""
+    db_path = tmp_path / "shared.db"
+    first = JobDatabase.get_or_create(db_path)
+    second = JobDatabase.get_or_create(db_path)
+    first.initialize_schema()
 
-        db.close()
+    first.close()
+    assert not second._closed
+    assert _count(second) == 0
+    assert JobDatabase.get_or_create(db_path) is second
 
+    second.close()
+    assert not second._closed
+    second.close()
+    assert second._closed
+    assert db_path.resolve() not in JobDatabase._instances
 
-def test_upsert_jobs_update():
-    """Test updating existing jobs (no duplicates)."""
-    from datetime import datetime, timezone
 
+def test_context_manager():
+    """Test database context manager."""
     with tempfile.TemporaryDirectory() as tmpdir:
         db_path = Path(tmpdir) / "test.db"
-        db = JobDatabase(db_path)
-        db.initialize_schema()
-
-        # Insert job
-        job = {
-            "job_id": "123",
-            "title": "ML Engineer",
-            "company": "Anthropic",
-            "location": "San Francisco, CA",
-            "posted_date": "2026-02-15",
-            "posted_date_iso": "2026-02-15T10:00:00Z",
-            "scraped_at": datetime.now(timezone.utc).isoformat(),
-        }
-        db.upsert_jobs([job])
 
-        # Update same job with different title
-        job["title"] = "Senior ML Engineer"
-        db.upsert_jobs([job])
+        with JobDatabase(db_path) as db:
+            db.initialize_schema()
 
-        # Verify no duplicate (still 1 job)
-        cursor = db.conn.execute("SELECT COUNT(*) FROM jobs")
-        assert cursor.fetchone()[0] == 1
+            # Verify database works inside context
+            assert _count(db) == 0
 
-        # Verify title updated
-        updated_job = db.get_job("123")
-        assert updated_job["title"] == "Senior ML Engineer"
+        # Verify connection closed after context
+        assert db._closed
 
+        # Closing again is a no-op
         db.close()
 
 
-def test_get_job():
-    """Test retrieving a single job by ID."""
-    from datetime import datetime, timezone
+def test_close_survives_optimize_failure(tmp_path):
+    """Test a failing PRAGMA optimize still closes the connection and evicts the shared instance."""
 
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        db = JobDatabase(db_path)
-        db.initialize_schema()
+    class FailingOptimize:
+        def __init__(self, conn):
+            self._conn = conn
 
-        job = {
-            "job_id": "123",
-            "title": "ML Engineer",
-            "company": "Anthropic",
-            "location": "San Francisco, CA",
-            "posted_date": "2026-02-15",
-            "posted_date_iso": "2026-02-15T10:00:00Z",
-            "scraped_at": datetime.now(timezone.utc).isoformat(),
-        }
-        db.upsert_jobs([job])
+        def execute(self, sql, *args):
+            if sql == "PRAGMA optimize":
+                raise sqlite3.OperationalError("database is locked")
+            return self._conn.execute(sql, *args)
 
-        # Get existing job
-        fetched = db.get_job("123")
-        assert fetched is not None
-        assert fetched["job_id"] == "123"
-        assert fetched["title"] == "ML Engineer"
+        def __getattr__(self, name):
+            return getattr(self._conn, name)
 
-        # Get non-existent job
-        missing = db.get_job("999")
-        assert missing is None
+    db = JobDatabase.get_or_create(tmp_path / "test.db")
+    raw_conn = db.conn
+    db.conn = FailingOptimize(raw_conn)
+    db.close()
 
-        db.close()
+    assert db._closed
+    with pytest.raises(sqlite3.ProgrammingError):
+        raw_conn.execute("SELECT 1")
+    assert tmp_path.joinpath("test.db").resolve() not in JobDatabase._instances
 
 
-def test_query_jobs_no_filters():
-    """Test querying all jobs without filters."""
-    from datetime import datetime, timezone
+def test_indexes_created(db):
+    """Test that all indexes are created."""
+    # Get all indexes
+    indexes = {name for (name,) in db.conn.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+
+    expected_indexes = [
+        "idx_jobs_company",
+        "idx_jobs_location",
+        "idx_jobs_posted_date",
+        "idx_jobs_scraped_at",
+        "idx_jobs_scraped_epoch",
+        "idx_jobs_remote_posted",
+        "idx_jobs_visa_posted",
+        "idx_jobs_profile",
+        "idx_applications_job_id",
+        "idx_applications_status_applied",
+        "idx_job_changes_changed_at",
+        "idx_job_changes_job_id",
+        "idx_company_normalized",
+        "idx_company_refresh",
+        "idx_company_counts_n",
+    ]
+
+    missing = set(expected_indexes) - indexes
+    assert not missing, f"Missing indexes: {missing}"
+    assert not {"idx_applications_status", "idx_jobs_remote", "idx_jobs_visa"} & indexes
+
+
+def test_fts5_triggers_created(db):
+    """Test that FTS5 sync triggers are created."""
+    # Get all triggers
+    triggers = {name for (name,) in db.conn.execute("SELECT name FROM sqlite_master WHERE type='trigger'")}
 
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        db = JobDatabase(db_path)
-        db.initialize_schema()
+    expected_triggers = [
+        "company_counts_delete",
+        "company_counts_insert",
+        "company_counts_update",
+        "jobs_fts_delete",
+        "jobs_fts_insert",
+        "jobs_fts_update",
+        "jobs_track_changes",
+    ]
 
-        jobs = [
-            {
-                "job_id": str(i),
-                "title": f"Job {i}",
-                "company": "Test Co",
-                "location": "San Francisco, CA",
-                "posted_date": "2026-02-15",
-                "posted_date_iso": f"2026-02-15T{i:02d}:00:00Z",
-                "scraped_at": datetime.now(timezone.utc).isoformat(),
-            }
-            for i in range(30)
-        ]
-        db.upsert_jobs(jobs)
+    missing = set(expected_triggers) - triggers
+    assert not missing, f"Missing triggers: {missing}"
 
-        # Query with default limit
-        results = db.query_jobs(limit=20, offset=0)
-        assert len(results) == 20
 
-        # Query with pagination
-        results_page2 = db.query_jobs(limit=20, offset=20)
-        assert len(results_page2) == 10
+# ========== CRUD Operation Tests (Step 2) ==========
 
-        db.close()
+def test_upsert_jobs_insert(db):
+    """Test inserting new jobs."""
+    # Create test jobs
+    jobs = [
+        {
+            **BASE_JOB,
+            "job_id": "123",
+            "title": "ML Engineer",
+            "company": "Anthropic, Inc.",
+            "location": "San Francisco, CA",
+        },
+        {
+            **BASE_JOB,
+            "job_id": "456",
+            "title": "Data Scientist",
+            "company": "Google LLC",
+            "location": "Mountain View, CA",
+            "posted_date": "2026-02-14",
+            "posted_date_iso": "2026-02-14T14:00:00Z",
+        },
+    ]
 
+    count = db.upsert_jobs(jobs)
+    assert count == 2
 
-def test_query_jobs_company_filter():
-    """Test filtering by company name."""
-    from datetime import datetime, timezone
+    # Verify jobs exist
+    assert _count(db) == 2
 
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        db = JobDatabase(db_path)
-        db.initialize_schema()
+    # Verify company name normalization
+    job = db.get_job("123")
+    assert job["normalized_company_name"] == "anthropic"
 
-        jobs = [
-            {
-                "job_id": "1",
-                "title": "Job 1",
-                "company": "Anthropic, Inc.",
-                "location": "San Francisco, CA",
-                "posted_date": "2026-02-15",
-                "posted_date_iso": "2026-02-15T10:00:00Z",
-                "scraped_at": datetime.now(timezone.utc).isoformat(),
-            },
-            {
-                "job_id": "2",
-                "title": "Job 2",
-                "company": "Google LLC",
-                "location": "Mountain View, CA",
-                "posted_date": "2026-02-15",
-                "posted_date_iso": "2026-02-15T11:00:00Z",
-                "scraped_at": datetime.now(timezone.utc).isoformat(),
-            },
-        ]
-        db.upsert_jobs(jobs)
 
-        # Filter by normalized company name
-        results = db.query_jobs(company="Anthropic")
-        assert len(results) == 1
-        assert results[0]["company"] == "Anthropic, Inc."
+def test_upsert_jobs_streams_iterable(db):
+    """Test upsert_jobs consumes a generator without materializing it first."""
+    count = db.upsert_jobs({**BASE_JOB, "job_id": str(i)} for i in range(5))
+    assert count == 5
+    assert _count(db) == 5
+    assert db.get_job("3")["normalized_company_name"] == "test co"
 
-        db.close()
 
+def test_upsert_jobs_rows(db):
+    """Test bulk upsert from column-ordered tuples, filling last_seen and rejecting unknown columns."""
+    columns = ("job_id", "title", "company", "normalized_company_name", "location",
+               "posted_date", "posted_date_iso", "scraped_at")
+    rows = ((str(i), f"Job {i}", "Test Co", "test co", "SF", "2026-02-15", _NOW_ISO, _NOW_ISO)
+            for i in range(3))
 
-def test_query_jobs_location_filter():
-    """Test filtering by location."""
-    from datetime import datetime, timezone
+    assert db.upsert_jobs_rows(columns, rows) == 3
+    job = db.get_job("2")
+    assert job["title"] == "Job 2"
+    assert job["last_seen"] is not None
 
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        db = JobDatabase(db_path)
-        db.initialize_schema()
+    with pytest.raises(ValueError):
+        db.upsert_jobs_rows(("job_id", "title; DROP TABLE jobs"), [("1", "x")])
+    with pytest.raises(ValueError):
+        db.upsert_jobs_rows(("title",), [("x",)])
 
-        jobs = [
-            {
-                "job_id": "1",
-                "title": "Job 1",
-                "company": "Test Co",
-                "location": "San Francisco, CA",
-                "posted_date": "2026-02-15",
-                "posted_date_iso": "2026-02-15T10:00:00Z",
-                "scraped_at": datetime.now(timezone.utc).isoformat(),
-            },
-            {
-                "job_id": "2",
-                "title": "Job 2",
-                "company": "Test Co",
-                "location": "New York, NY",
-                "posted_date": "2026-02-15",
-                "posted_date_iso": "2026-02-15T11:00:00Z",
-                "scraped_at": datetime.now(timezone.utc).isoformat(),
-            },
-        ]
-        db.upsert_jobs(jobs)
 
-        results = db.query_jobs(location="San Francisco")
-        assert len(results) == 1
-        assert results[0]["location"] == "San Francisco, CA"
+def test_bulk_upsert_refreshes_planner_stats(db, monkeypatch):
+    """Test ANALYZE runs once upserts since the last refresh cross the threshold."""
+    monkeypatch.setattr("linkedin_mcp_server.db.ANALYZE_THRESHOLD", 10)
 
-        db.close()
+    def analyzed():
+        return db.conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone() is not None
 
+    db.upsert_jobs({**BASE_JOB, "job_id": str(i)} for i in range(6))
+    assert not analyzed()
 
-def test_query_jobs_remote_filter():
-    """Test filtering by remote eligibility."""
-    from datetime import datetime, timezone
+    # Small batches accumulate toward the threshold
+    db.upsert_jobs({**BASE_JOB, "job_id": str(i)} for i in range(6, 12))
+    assert analyzed()
+    assert db.conn.execute("SELECT COUNT(*) FROM sqlite_stat1 WHERE tbl = 'jobs'").fetchone()[0] > 0
+    assert db._rows_since_analyze == 0
 
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        db = JobDatabase(db_path)
-        db.initialize_schema()
-
-        jobs = [
-            {
-                "job_id": "1",
-                "title": "Remote Job",
-                "company": "Test Co",
-                "location": "San Francisco, CA",
-                "posted_date": "2026-02-15",
-                "posted_date_iso": "2026-02-15T10:00:00Z",
-                "scraped_at": datetime.now(timezone.utc).isoformat(),
-                "remote_eligible": 1,
-            },
-            {
-                "job_id": "2",
-                "title": "On-site Job",
-                "company": "Test Co",
-                "location": "New York, NY",
-                "posted_date": "2026-02-15",
-                "posted_date_iso": "2026-02-15T11:00:00Z",
-                "scraped_at": datetime.now(timezone.utc).isoformat(),
-                "remote_eligible": 0,
-            },
-        ]
-        db.upsert_jobs(jobs)
 
-        results = db.query_jobs(remote_only=True)
-        assert len(results) == 1
-        assert results[0]["title"] == "Remote Job"
-
-        db.close()
+def test_upsert_jobs_rolls_back_failed_batch(db):
+    """Test a failing row rolls back the whole batch (single transaction)."""
+    jobs = [{**BASE_JOB, "job_id": "1"}, {"job_id": "2"}]  # second row has no company
 
+    with pytest.raises(KeyError):
+        db.upsert_jobs(jobs)
 
-def test_query_jobs_fts_search():
-    """Test full-text search with FTS5."""
-    from datetime import datetime, timezone
+    assert _count(db) == 0
+    assert not db.conn.in_transaction
 
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        db = JobDatabase(db_path)
-        db.initialize_schema()
 
-        jobs = [
-            {
-                "job_id": "1",
-                "title": "ML Engineer",
-                "company": "Test Co",
-                "location": "San Francisco, CA",
-                "posted_date": "2026-02-15",
-                "posted_date_iso": "2026-02-15T10:00:00Z",
-                "scraped_at": datetime.now(timezone.utc).isoformat(),
-                "raw_description": "Looking for machine learning expert with Python and TensorFlow experience",
-            },
-            {
-                "job_id": "2",
-                "title": "Frontend Developer",
-                "company": "Test Co",
-                "location": "New York, NY",
-                "posted_date": "2026-02-15",
-                "posted_date_iso": "2026-02-15T11:00:00Z",
-                "scraped_at": datetime.now(timezone.utc).isoformat(),
-                "raw_description": "React and TypeScript developer needed",
-            },
-        ]
-        db.upsert_jobs(jobs)
+def test_upsert_jobs_update(db):
+    """Test updating existing jobs (no duplicates)."""
+    # Insert job
+    job = {
+        **BASE_JOB,
+        "job_id": "123",
+        "title": "ML Engineer",
+        "company": "Anthropic",
+        "location": "San Francisco, CA",
+    }
+    db.upsert_jobs([job])
 
-        # Search for "machine learning"
-        results = db.query_jobs(keywords="machine learning")
-        assert len(results) == 1
-        assert results[0]["job_id"] == "1"
+    # Update same job with different title
+    job["title"] = "Senior ML Engineer"
+    db.upsert_jobs([job])
 
-        # Search for "Python"
-        results = db.query_jobs(keywords="Python")
-        assert len(results) == 1
-        assert results[0]["job_id"] == "1"
+    # Verify no duplicate (still 1 job)
+    assert _count(db) == 1
 
-        db.close()
+    # Verify title updated
+    updated_job = db.get_job("123")
+    assert updated_job["title"] == "Senior ML Engineer"
 
 
-def test_fts_survives_upsert():
-    """Test FTS5 index stays consistent after INSERT OR REPLACE (upsert).
+def test_get_job(db):
+    """Test retrieving a single job by ID."""
+    job = {
+        **BASE_JOB,
+        "job_id": "123",
+        "title": "ML Engineer",
+        "company": "Anthropic",
+        "location": "San Francisco, CA",
+    }
+    db.upsert_jobs([job])
+
+    # Get existing job
+    fetched = db.get_job("123")
+    assert fetched is not None
+    assert fetched["job_id"] == "123"
+    assert fetched["title"] == "ML Engineer"
+
+    # Get non-existent job
+    missing = db.get_job("999")
+    assert missing is None
+
+
+def test_list_recent_job_ids(db):
+    """Test listing IDs of jobs seen within a time window."""
+    now = datetime.now(timezone.utc)
+    base = {
+        "title": "Engineer",
+        "company": "Co",
+        "location": "SF",
+        "posted_date": "2026-02-15",
+        "posted_date_iso": "2026-02-15T10:00:00Z",
+        "scraped_at": now.isoformat(),
+    }
+    db.upsert_jobs([
+        {**base, "job_id": "fresh"},
+        {**base, "job_id": "stale", "last_seen": (now - timedelta(hours=48)).isoformat()},
+    ])
+
+    assert db.list_recent_job_ids(since_hours=24) == {"fresh"}
+    assert db.list_recent_job_ids(since_hours=72) == {"fresh", "stale"}
+
+
+def test_query_jobs_pagination(db):
+    """Test paging through all jobs without filters."""
+    jobs = tuple(
+        {
+            **BASE_JOB,
+            "job_id": str(i),
+            "title": f"Job {i}",
+            "location": "San Francisco, CA",
+            "posted_date_iso": f"2026-02-15T{i:02d}:00:00Z",
+        }
+        for i in range(30)
+    )
+
+    # All 30 rows must be written in one transaction (one journal sync), then committed
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    db.upsert_jobs(jobs)
+    db.conn.set_trace_callback(None)
+    assert [s.split()[0] for s in statements if s.split()[0] in ("BEGIN", "COMMIT")] == ["BEGIN", "COMMIT"]
+    assert db.conn.in_transaction is False
+
+    # Query with default limit
+    results = db.query_jobs(limit=20, offset=0)
+    assert len(results) == 20
+
+    # Query with pagination
+    results_page2 = db.query_jobs(limit=20, offset=20)
+    assert len(results_page2) == 10
+
+
+@pytest.fixture(scope="module")
+def seeded_db(make_db):
+    """Read-only DB with one job per query-filter flavor, shared by the module."""
+    db = make_db()
+    db.upsert_jobs([
+        {
+            **BASE_JOB,
+            "job_id": "1",
+            "title": "ML Engineer",
+            "company": "Anthropic, Inc.",
+            "location": "San Francisco, CA",
+            "remote_eligible": 1,
+            "raw_description": "Looking for machine learning expert with Python and TensorFlow experience",
+        },
+        {
+            **BASE_JOB,
+            "job_id": "2",
+            "title": "Frontend Developer",
+            "company": "Google LLC",
+            "location": "New York, NY",
+            "posted_date_iso": "2026-02-15T11:00:00Z",
+            "remote_eligible": 0,
+            "raw_description": "React and TypeScript developer needed",
+        },
+    ])
+    yield db
+    db.close()
+
+
+@pytest.mark.parametrize(
+    "kwargs,expected",
+    [
+        ({}, ["2", "1"]),  # newest posted first
+        ({"company": "Anthropic"}, ["1"]),  # normalized company name
+        ({"location": "San Francisco"}, ["1"]),
+        ({"location": "New York"}, ["2"]),
+        ({"remote_only": True}, ["1"]),
+        ({"keywords": "machine learning"}, ["1"]),  # FTS5
+        ({"keywords": "Python"}, ["1"]),
+        ({"keywords": "React"}, ["2"]),
+    ],
+)
+def test_query_jobs_filters(seeded_db, kwargs, expected):
+    """Test composable query filters against a shared seeded DB."""
+    results = seeded_db.query_jobs(**kwargs)
+    assert [job["job_id"] for job in results] == expected
+
+
+def test_job_filters_put_cheap_predicates_first():
+    """Test filter clauses are ordered flags/ranges first, LIKE scans next, FTS last."""
+    clauses, params = JobDatabase._build_job_filters(
+        company="Anthropic",
+        keywords="python",
+        posted_after_hours=24,
+        remote_only=True,
+        application_status="applied",
+    )
+
+    assert clauses[0] == "j.remote_eligible = 1"
+    assert clauses[-2] == "j.normalized_company_name LIKE ?"
+    assert "jobs_fts MATCH ?" in clauses[-1]
+    assert params[0] == "applied"
+    assert params[-2:] == ["%anthropic%", "python"]
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "index"),
+    [
+        ({"remote_only": True}, "idx_jobs_remote_posted"),
+        ({"visa_sponsorship": True}, "idx_jobs_visa_posted"),
+    ],
+)
+def test_query_jobs_flag_filters_use_partial_index(db, kwargs, index):
+    """Test remote/visa listings walk their partial index in sort order (no scan of jobs, no sort)."""
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    db.query_jobs(**kwargs, limit=25)
+    db.conn.set_trace_callback(None)
+
+    plan = " ".join(row["detail"] for row in db.conn.execute(f"EXPLAIN QUERY PLAN {statements[-1]}"))
+    assert f"SCAN j USING INDEX {index}" in plan
+    assert "USE TEMP B-TREE FOR ORDER BY" not in plan
+
+
+def test_fts_survives_upsert(db):
+    """Test FTS5 index stays consistent after an upsert of an existing job.
 
     This was the root cause of the FTS corruption: external content FTS5
     requires the special 'delete' command in triggers, not regular DELETE.
     """
-    from datetime import datetime, timezone
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        db = JobDatabase(db_path)
-        db.initialize_schema()
-
-        now = datetime.now(timezone.utc).isoformat()
-
-        # Insert job with description about Python
-        job = {
-            "job_id": "42",
-            "title": "ML Engineer",
-            "company": "Acme Corp",
-            "location": "SF",
-            "posted_date": "2026-02-15",
-            "posted_date_iso": "2026-02-15T10:00:00Z",
-            "scraped_at": now,
-            "raw_description": "Expert in Python and TensorFlow required",
-        }
-        db.upsert_jobs([job])
-
-        # FTS search should find by old description
-        results = db.query_jobs(keywords="Python")
-        assert len(results) == 1
-        assert results[0]["job_id"] == "42"
-
-        # Upsert same job with different description (triggers INSERT OR REPLACE)
-        job["raw_description"] = "Expert in Rust and CUDA required"
-        db.upsert_jobs([job])
-
-        # FTS should find by new description
-        results = db.query_jobs(keywords="Rust")
-        assert len(results) == 1
-        assert results[0]["job_id"] == "42"
-
-        # FTS should NOT find by old description
-        results = db.query_jobs(keywords="Python")
-        assert len(results) == 0
-
-        # Still only one job in the table
-        assert db.count_jobs() == 1
-
-        db.close()
-
-
-def test_rebuild_fts():
+    # Insert job with description about Python
+    job = {
+        **BASE_JOB,
+        "job_id": "42",
+        "title": "ML Engineer",
+        "company": "Acme Corp",
+        "raw_description": "Expert in Python and TensorFlow required",
+    }
+    db.upsert_jobs([job])
+
+    # FTS search should find by old description
+    results = db.query_jobs(keywords="Python")
+    assert len(results) == 1
+    assert results[0]["job_id"] == "42"
+
+    # Upsert same job with different description (triggers the update path)
+    job["raw_description"] = "Expert in Rust and CUDA required"
+    db.upsert_jobs([job])
+
+    # FTS should find by new description
+    results = db.query_jobs(keywords="Rust")
+    assert len(results) == 1
+    assert results[0]["job_id"] == "42"
+
+    # FTS should NOT find by old description
+    results = db.query_jobs(keywords="Python")
+    assert len(results) == 0
+
+    # Still only one job in the table
+    assert db.count_jobs() == 1
+
+
+def test_rebuild_fts(db):
     """Test manual FTS5 index rebuild."""
-    from datetime import datetime, timezone
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        db = JobDatabase(db_path)
-        db.initialize_schema()
-
-        now = datetime.now(timezone.utc).isoformat()
-
-        jobs = [
-            {
-                "job_id": "1",
-                "title": "ML Engineer",
-                "company": "Test Co",
-                "location": "SF",
-                "posted_date": "2026-02-15",
-                "posted_date_iso": "2026-02-15T10:00:00Z",
-                "scraped_at": now,
-                "raw_description": "Machine learning and deep learning",
-            },
-            {
-                "job_id": "2",
-                "title": "Frontend Dev",
-                "company": "Test Co",
-                "location": "SF",
-                "posted_date": "2026-02-15",
-                "posted_date_iso": "2026-02-15T11:00:00Z",
-                "scraped_at": now,
-                "raw_description": "React and TypeScript expert",
-            },
-        ]
-        db.upsert_jobs(jobs)
-
-        # Rebuild should not raise and index should still work
-        db.rebuild_fts()
-
-        results = db.query_jobs(keywords="machine learning")
-        assert len(results) == 1
-        assert results[0]["job_id"] == "1"
-
-        results = db.query_jobs(keywords="React")
-        assert len(results) == 1
-        assert results[0]["job_id"] == "2"
-
-        db.close()
-
-
-def test_query_jobs_sort_by():
+    jobs = [
+        {
+            **BASE_JOB,
+            "job_id": "1",
+            "title": "ML Engineer",
+            "raw_description": "Machine learning and deep learning",
+        },
+        {
+            **BASE_JOB,
+            "job_id": "2",
+            "title": "Frontend Dev",
+            "posted_date_iso": "2026-02-15T11:00:00Z",
+            "raw_description": "React and TypeScript expert",
+        },
+    ]
+    db.upsert_jobs(jobs)
+
+    # Rebuild should not raise and index should still work
+    db.rebuild_fts()
+
+    results = db.query_jobs(keywords="machine learning")
+    assert len(results) == 1
+    assert results[0]["job_id"] == "1"
+
+    results = db.query_jobs(keywords="React")
+    assert len(results) == 1
+    assert results[0]["job_id"] == "2"
+
+
+def test_query_jobs_sort_by(db):
     """Test sorting results."""
-    from datetime import datetime, timezone, timedelta
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        db = JobDatabase(db_path)
-        db.initialize_schema()
-
-        now = datetime.now(timezone.utc)
-
-        jobs = [
-            {
-                "job_id": "1",
-                "title": "Job 1",
-                "company": "Test Co",
-                "location": "SF",
-                "posted_date": "2026-02-13",
-                "posted_date_iso": (now - timedelta(days=2)).isoformat(),
-                "scraped_at": (now - timedelta(hours=5)).isoformat(),
-            },
-            {
-                "job_id": "2",
-                "title": "Job 2",
-                "company": "Test Co",
-                "location": "SF",
-                "posted_date": "2026-02-15",
-                "posted_date_iso": now.isoformat(),
-                "scraped_at": (now - timedelta(hours=1)).isoformat(),
-            },
-        ]
-        db.upsert_jobs(jobs)
-
-        # Sort by posted_date DESC (newest first)
-        results = db.query_jobs(sort_by="posted_date")
-        assert results[0]["job_id"] == "2"
-
-        # Sort by scraped_at DESC (most recent scrape first)
-        results = db.query_jobs(sort_by="scraped_at")
-        assert results[0]["job_id"] == "2"
-
-        db.close()
-
-
-def test_count_jobs():
+    now = datetime.now(timezone.utc)
+
+    jobs = [
+        {
+            **BASE_JOB,
+            "job_id": "1",
+            "title": "Job 1",
+            "posted_date": "2026-02-13",
+            "posted_date_iso": (now - timedelta(days=2)).isoformat(),
+            "scraped_at": (now - timedelta(hours=5)).isoformat(),
+        },
+        {
+            **BASE_JOB,
+            "job_id": "2",
+            "title": "Job 2",
+            "posted_date_iso": now.isoformat(),
+            "scraped_at": (now - timedelta(hours=1)).isoformat(),
+        },
+    ]
+    db.upsert_jobs(jobs)
+
+    # Sort by posted_date DESC (newest first)
+    results = db.query_jobs(sort_by="posted_date")
+    assert results[0]["job_id"] == "2"
+
+    # Sort by scraped_at DESC (most recent scrape first)
+    results = db.query_jobs(sort_by="scraped_at")
+    assert results[0]["job_id"] == "2"
+
+
+def test_count_jobs(db):
     """Test counting jobs with filters."""
-    from datetime import datetime, timezone
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        db = JobDatabase(db_path)
-        db.initialize_schema()
-
-        jobs = [
-            {
-                "job_id": str(i),
-                "title": f"Job {i}",
-                "company": "Anthropic" if i % 2 == 0 else "Google",
-                "location": "San Francisco, CA",
-                "posted_date": "2026-02-15",
-                "posted_date_iso": "2026-02-15T10:00:00Z",
-                "scraped_at": datetime.now(timezone.utc).isoformat(),
-                "remote_eligible": 1 if i % 3 == 0 else 0,
-            }
-            for i in range(10)
-        ]
-        db.upsert_jobs(jobs)
+    jobs = [
+        {
+            **BASE_JOB,
+            "job_id": str(i),
+            "title": f"Job {i}",
+            "company": "Anthropic" if i % 2 == 0 else "Google",
+            "location": "San Francisco, CA",
+            "remote_eligible": 1 if i % 3 == 0 else 0,
+        }
+        for i in range(10)
+    ]
+    db.upsert_jobs(jobs)
 
-        # Count all jobs
-        total = db.count_jobs()
-        assert total == 10
+    # Count all jobs
+    total = db.count_jobs()
+    assert total == 10
 
-        # Count by company
-        anthropic_count = db.count_jobs(company="Anthropic")
-        assert anthropic_count == 5
+    # Count by company
+    anthropic_count = db.count_jobs(company="Anthropic")
+    assert anthropic_count == 5
 
-        # Count remote jobs
-        remote_count = db.count_jobs(remote_only=True)
-        assert remote_count in [3, 4]  # Divisible by 3 in range 0-9
+    # Count remote jobs
+    remote_count = db.count_jobs(remote_only=True)
+    assert remote_count in [3, 4]  # Divisible by 3 in range 0-9
 
-        db.close()
 
-
-def test_delete_old_jobs():
+def test_delete_old_jobs(db):
     """Test deleting old jobs."""
-    from datetime import datetime, timezone, timedelta
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        db = JobDatabase(db_path)
-        db.initialize_schema()
-
-        now = datetime.now(timezone.utc)
-
-        jobs = [
-            {
-                "job_id": "old1",
-                "title": "Old Job 1",
-                "company": "Test Co",
-                "location": "SF",
-                "posted_date": "2026-02-01",
-                "posted_date_iso": (now - timedelta(days=14)).isoformat(),
-                "scraped_at": (now - timedelta(days=14)).isoformat(),
-            },
-            {
-                "job_id": "recent1",
-                "title": "Recent Job 1",
-                "company": "Test Co",
-                "location": "SF",
-                "posted_date": "2026-02-15",
-                "posted_date_iso": now.isoformat(),
-                "scraped_at": now.isoformat(),
-            },
-        ]
-        db.upsert_jobs(jobs)
-
-        # Delete jobs older than 7 days
-        deleted = db.delete_old_jobs(max_age_seconds=7 * 24 * 3600)
-        assert deleted == 1
-
-        # Verify only recent job remains
-        remaining = db.query_jobs()
-        assert len(remaining) == 1
-        assert remaining[0]["job_id"] == "recent1"
-
-        db.close()
+    now = datetime.now(timezone.utc)
+
+    jobs = [
+        {
+            **BASE_JOB,
+            "job_id": "old1",
+            "title": "Old Job 1",
+            "posted_date": "2026-02-01",
+            "posted_date_iso": (now - timedelta(days=14)).isoformat(),
+            "scraped_at": (now - timedelta(days=14)).isoformat(),
+        },
+        {
+            **BASE_JOB,
+            "job_id": "recent1",
+            "title": "Recent Job 1",
+            "posted_date_iso": now.isoformat(),
+            "scraped_at": now.isoformat(),
+        },
+    ]
+    db.upsert_jobs(jobs)
+
+    # Delete jobs older than 7 days
+    deleted = db.delete_old_jobs(max_age_seconds=7 * 24 * 3600)
+    assert deleted == 1
+
+    # Verify only recent job remains
+    remaining = db.query_jobs()
+    assert len(remaining) == 1
+    assert remaining[0]["job_id"] == "recent1"
 
 
 # ========== Profile CRUD Tests (Step 3) ==========
 
-def test_upsert_profile_insert():
-    """Test creating a new profile."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        db = JobDatabase(db_path)
-        db.initialize_schema()
-
-        profile = {
-            "name": "test_profile",
-            "location": "San Francisco, CA",
-            "keywords": "ML Engineer",
-            "distance": 25,
-            "time_filter": "r7200",
-            "refresh_interval": 3600,
-        }
-
-        profile_id = db.upsert_profile(profile)
-        assert profile_id > 0
+@pytest.fixture(scope="module")
+def _module_db(make_db):
+    """Single DB shared by the profile and application tests."""
+    db = make_db()
+    yield db
+    db.close()
 
-        # Verify profile exists
-        fetched = db.get_profile(profile_id)
-        assert fetched is not None
-        assert fetched["name"] == "test_profile"
-        assert fetched["location"] == "San Francisco, CA"
 
-        db.close()
+@pytest.fixture
+def shared_db(_module_db):
+    """Module-wide DB, emptied after each test instead of rebuilt."""
+    yield _module_db
+    _module_db.conn.executescript(
+        "DELETE FROM applications; DELETE FROM profiles; DELETE FROM jobs;"
+    )
 
 
-def test_upsert_profile_update():
+def test_upsert_profile_insert(shared_db):
+    """Test creating a new profile."""
+    profile = {
+        "name": "test_profile",
+        "location": "San Francisco, CA",
+        "keywords": "ML Engineer",
+        "distance": 25,
+        "time_filter": "r7200",
+        "refresh_interval": 3600,
+    }
+
+    profile_id = shared_db.upsert_profile(profile)
+    assert profile_id > 0
+
+    # Verify profile exists
+    fetched = shared_db.get_profile(profile_id)
+    assert fetched is not None
+    assert fetched["name"] == "test_profile"
+    assert fetched["location"] == "San Francisco, CA"
+
+
+def test_upsert_profile_update(shared_db):
     """Test updating an existing profile."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        db = JobDatabase(db_path)
-        db.initialize_schema()
+    profile = {
+        "name": "test_profile",
+        "location": "San Francisco, CA",
+        "keywords": "ML Engineer",
+    }
 
-        profile = {
-            "name": "test_profile",
-            "location": "San Francisco, CA",
-            "keywords": "ML Engineer",
-        }
+    profile_id = shared_db.upsert_profile(profile)
 
-        profile_id = db.upsert_profile(profile)
+    # Update same profile
+    profile["keywords"] = "AI Engineer"
+    updated_id = shared_db.upsert_profile(profile)
 
-        # Update same profile
-        profile["keywords"] = "AI Engineer"
-        updated_id = db.upsert_profile(profile)
+    # Should return same ID
+    assert updated_id == profile_id
 
-        # Should return same ID
-        assert updated_id == profile_id
+    # Verify keywords updated
+    fetched = shared_db.get_profile(profile_id)
+    assert fetched["keywords"] == "AI Engineer"
 
-        # Verify keywords updated
-        fetched = db.get_profile(profile_id)
-        assert fetched["keywords"] == "AI Engineer"
 
-        db.close()
-
-
-def test_list_profiles():
+def test_list_profiles(shared_db):
     """Test listing profiles with enabled filter."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        db = JobDatabase(db_path)
-        db.initialize_schema()
-
-        # Create enabled profile
-        db.upsert_profile({
-            "name": "enabled_profile",
-            "location": "SF",
-            "keywords": "test",
-            "enabled": 1,
-        })
-
-        # Create disabled profile
-        profile_id = db.upsert_profile({
-            "name": "disabled_profile",
-            "location": "SF",
-            "keywords": "test",
-            "enabled": 0,
-        })
-
-        # List enabled only
-        enabled_profiles = db.list_profiles(enabled_only=True)
-        assert len(enabled_profiles) == 1
-        assert enabled_profiles[0]["name"] == "enabled_profile"
-
-        # List all
-        all_profiles = db.list_profiles(enabled_only=False)
-        assert len(all_profiles) == 2
-
-        db.close()
-
-
-def test_delete_profile_soft():
+    # Create enabled profile
+    shared_db.upsert_profile({
+        "name": "enabled_profile",
+        "location": "SF",
+        "keywords": "test",
+        "enabled": 1,
+    })
+
+    # Create disabled profile
+    profile_id = shared_db.upsert_profile({
+        "name": "disabled_profile",
+        "location": "SF",
+        "keywords": "test",
+        "enabled": 0,
+    })
+
+    # List enabled only
+    enabled_profiles = shared_db.list_profiles(enabled_only=True)
+    assert len(enabled_profiles) == 1
+    assert enabled_profiles[0]["name"] == "enabled_profile"
+
+    # List all
+    all_profiles = shared_db.list_profiles(enabled_only=False)
+    assert len(all_profiles) == 2
+
+
+def test_delete_profile_soft(shared_db):
     """Test soft deleting a profile."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        db = JobDatabase(db_path)
-        db.initialize_schema()
-
-        profile_id = db.upsert_profile({
-            "name": "test",
-            "location": "SF",
-            "keywords": "test",
-        })
+    profile_id = shared_db.upsert_profile({
+        "name": "test",
+        "location": "SF",
+        "keywords": "test",
+    })
 
-        # Soft delete
-        db.delete_profile(profile_id, hard_delete=False)
+    # Soft delete
+    shared_db.delete_profile(profile_id, hard_delete=False)
 
-        # Verify still exists but disabled
-        profile = db.get_profile(profile_id)
-        assert profile is not None
-        assert profile["enabled"] == 0
-
-        db.close()
+    # Verify still exists but disabled
+    profile = shared_db.get_profile(profile_id)
+    assert profile is not None
+    assert profile["enabled"] == 0
 
 
-def test_delete_profile_hard():
+def test_delete_profile_hard(shared_db):
     """Test hard deleting a profile."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        db = JobDatabase(db_path)
-        db.initialize_schema()
-
-        profile_id = db.upsert_profile({
-            "name": "test",
-            "location": "SF",
-            "keywords": "test",
-        })
+    profile_id = shared_db.upsert_profile({
+        "name": "test",
+        "location": "SF",
+        "keywords": "test",
+    })
 
-        # Hard delete
-        db.delete_profile(profile_id, hard_delete=True)
+    # Hard delete
+    shared_db.delete_profile(profile_id, hard_delete=True)
 
-        # Verify doesn't exist
-        profile = db.get_profile(profile_id)
-        assert profile is None
-
-        db.close()
+    # Verify doesn't exist
+    profile = shared_db.get_profile(profile_id)
+    assert profile is None
 
 
-def test_update_profile_last_run():
+def test_update_profile_last_run(shared_db):
     """Test updating profile last_scraped_at timestamp."""
-    from datetime import datetime, timezone
+    profile_id = shared_db.upsert_profile({
+        "name": "test",
+        "location": "SF",
+        "keywords": "test",
+    })
 
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        db = JobDatabase(db_path)
-        db.initialize_schema()
+    timestamp = datetime.now(timezone.utc).isoformat()
+    shared_db.update_profile_last_run(profile_id, timestamp)
 
-        profile_id = db.upsert_profile({
-            "name": "test",
-            "location": "SF",
-            "keywords": "test",
-        })
+    profile = shared_db.get_profile(profile_id)
+    assert profile["last_scraped_at"] == timestamp
 
-        timestamp = datetime.now(timezone.utc).isoformat()
-        db.update_profile_last_run(profile_id, timestamp)
 
-        profile = db.get_profile(profile_id)
-        assert profile["last_scraped_at"] == timestamp
+def test_update_profiles_last_run(shared_db):
+    """Test batch update of last_scraped_at for several profiles."""
+    first_id = shared_db.upsert_profile({"name": "first", "location": "SF", "keywords": "ml"})
+    second_id = shared_db.upsert_profile({"name": "second", "location": "NYC", "keywords": "ai"})
 
-        db.close()
+    shared_db.update_profiles_last_run({
+        first_id: "2026-02-15T10:00:00",
+        second_id: "2026-02-15T11:00:00",
+    })
 
+    assert shared_db.get_profile(first_id)["last_scraped_at"] == "2026-02-15T10:00:00"
+    assert shared_db.get_profile(second_id)["last_scraped_at"] == "2026-02-15T11:00:00"
 
-def test_seed_default_profile():
-    """Test seeding default profile."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        db = JobDatabase(db_path)
-        db.initialize_schema()
 
-        # Seed default profile
-        profile_id = db.seed_default_profile()
-        assert profile_id is not None
+def test_seed_default_profile(shared_db):
+    """Test seeding default profile."""
+    # Seed default profile
+    profile = shared_db.seed_default_profile()
+    assert profile is not None
 
-        # Verify default profile created
-        profile = db.get_profile(profile_id)
-        assert profile["name"] == "default"
-        assert profile["location"] == "San Francisco, CA"
-        assert profile["keywords"] == "AI Engineer OR ML Engineer OR Research Engineer"
+    # Verify default profile created (returned directly, no re-fetch)
+    assert profile["id"] is not None
+    assert profile["name"] == "default"
+    assert profile["location"] == "San Francisco, CA"
+    assert profile["keywords"] == "AI Engineer OR ML Engineer OR Research Engineer"
+    assert profile["refresh_interval"] == 7200
 
-        # Seed again - should return None (idempotent)
-        second_seed = db.seed_default_profile()
-        assert second_seed is None
-
-        db.close()
+    # Seed again - should return None (idempotent)
+    second_seed = shared_db.seed_default_profile()
+    assert second_seed is None
 
 
 # ========== Application CRUD Tests (Step 3) ==========
 
-def test_mark_job_applied():
+def test_mark_job_applied(shared_db):
     """Test marking a job as applied."""
-    from datetime import datetime, timezone
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        db = JobDatabase(db_path)
-        db.initialize_schema()
-
-        # Create job
-        job = {
-            "job_id": "123",
-            "title": "ML Engineer",
-            "company": "Test Co",
-            "location": "SF",
-            "posted_date": "2026-02-15",
-            "posted_date_iso": "2026-02-15T10:00:00Z",
-            "scraped_at": datetime.now(timezone.utc).isoformat(),
-        }
-        db.upsert_jobs([job])
-
-        # Mark as applied
-        result = db.mark_job_applied("123", notes="Applied via LinkedIn")
-        assert result is True
-
-        # Verify application exists
-        apps = db.list_applications()
-        assert len(apps) == 1
-        assert apps[0]["job_id"] == "123"
-        assert apps[0]["status"] == "applied"
-        assert apps[0]["notes"] == "Applied via LinkedIn"
-
-        db.close()
-
-
-def test_mark_job_applied_nonexistent():
+    # Create job
+    job = {
+        **BASE_JOB,
+        "job_id": "123",
+        "title": "ML Engineer",
+    }
+    shared_db.upsert_jobs([job])
+
+    # Mark as applied
+    result = shared_db.mark_job_applied("123", notes="Applied via LinkedIn")
+    assert result is True
+
+    # Verify application exists
+    apps = shared_db.list_applications()
+    assert len(apps) == 1
+    assert apps[0]["job_id"] == "123"
+    assert apps[0]["status"] == "applied"
+    assert apps[0]["notes"] == "Applied via LinkedIn"
+
+
+def test_mark_job_applied_nonexistent(shared_db):
     """Test marking a nonexistent job as applied."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        db = JobDatabase(db_path)
-        db.initialize_schema()
+    # Try to mark nonexistent job
+    result = shared_db.mark_job_applied("999")
+    assert result is False
 
-        # Try to mark nonexistent job
-        result = db.mark_job_applied("999")
-        assert result is False
 
-        db.close()
-
-
-def test_update_application_status():
+def test_update_application_status(shared_db):
     """Test updating application status."""
-    from datetime import datetime, timezone
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        db = JobDatabase(db_path)
-        db.initialize_schema()
-
-        # Create job and mark as applied
-        job = {
-            "job_id": "123",
-            "title": "ML Engineer",
-            "company": "Test Co",
-            "location": "SF",
-            "posted_date": "2026-02-15",
-            "posted_date_iso": "2026-02-15T10:00:00Z",
-            "scraped_at": datetime.now(timezone.utc).isoformat(),
-        }
-        db.upsert_jobs([job])
-        db.mark_job_applied("123")
-
-        # Update status
-        result = db.update_application_status("123", "interviewing", notes="Phone screen scheduled")
-        assert result is True
-
-        # Verify status updated
-        apps = db.list_applications()
-        assert len(apps) == 1
-        assert apps[0]["status"] == "interviewing"
-        assert apps[0]["notes"] == "Phone screen scheduled"
-
-        db.close()
-
-
-def test_list_applications_filter_by_status():
+    # Create job and mark as applied
+    job = {
+        **BASE_JOB,
+        "job_id": "123",
+        "title": "ML Engineer",
+    }
+    shared_db.upsert_jobs([job])
+    shared_db.mark_job_applied("123")
+
+    # Update status
+    result = shared_db.update_application_status("123", "interviewing", notes="Phone screen scheduled")
+    assert result is True
+
+    # Verify status updated
+    apps = shared_db.list_applications()
+    assert len(apps) == 1
+    assert apps[0]["status"] == "interviewing"
+    assert apps[0]["notes"] == "Phone screen scheduled"
+
+
+def test_list_applications_filter_by_status(shared_db):
     """Test filtering applications by status."""
-    from datetime import datetime, timezone
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        db = JobDatabase(db_path)
-        db.initialize_schema()
-
-        # Create jobs
-        jobs = [
-            {
-                "job_id": "1",
-                "title": "Job 1",
-                "company": "Test Co",
-                "location": "SF",
-                "posted_date": "2026-02-15",
-                "posted_date_iso": "2026-02-15T10:00:00Z",
-                "scraped_at": datetime.now(timezone.utc).isoformat(),
-            },
-            {
-                "job_id": "2",
-                "title": "Job 2",
-                "company": "Test Co",
-                "location": "SF",
-                "posted_date": "2026-02-15",
-                "posted_date_iso": "2026-02-15T11:00:00Z",
-                "scraped_at": datetime.now(timezone.utc).isoformat(),
-            },
-        ]
-        db.upsert_jobs(jobs)
-
-        # Mark jobs with different statuses
-        db.mark_job_applied("1")
-        db.mark_job_applied("2")
-        db.update_application_status("2", "interviewing")
-
-        # Filter by status
-        applied = db.list_applications(status="applied")
-        assert len(applied) == 1
-        assert applied[0]["job_id"] == "1"
-
-        interviewing = db.list_applications(status="interviewing")
-        assert len(interviewing) == 1
-        assert interviewing[0]["job_id"] == "2"
+    # Create jobs
+    jobs = [
+        {
+            **BASE_JOB,
+            "job_id": "1",
+            "title": "Job 1",
+        },
+        {
+            **BASE_JOB,
+            "job_id": "2",
+            "title": "Job 2",
+            "posted_date_iso": "2026-02-15T11:00:00Z",
+        },
+    ]
+    shared_db.upsert_jobs(jobs)
+
+    # Mark jobs with different statuses
+    shared_db.mark_job_applied("1")
+    shared_db.mark_job_applied("2")
+    shared_db.update_application_status("2", "interviewing")
+
+    # Filter by status
+    applied = shared_db.list_applications(status="applied")
+    assert len(applied) == 1
+    assert applied[0]["job_id"] == "1"
+
+    interviewing = shared_db.list_applications(status="interviewing")
+    assert len(interviewing) == 1
+    assert interviewing[0]["job_id"] == "2"
+
+    # List all
+    all_apps = shared_db.list_applications()
+    assert len(all_apps) == 2
+
+
+def test_iter_applications_streams_rows(db):
+    """Test iter_applications yields rows lazily in applied_at order."""
+    db.upsert_jobs([{**BASE_JOB, "job_id": str(i)} for i in range(3)])
+    for i in range(3):
+        db.mark_job_applied(str(i))
+
+    applications = db.iter_applications(status="applied")
+    assert not isinstance(applications, list)
+    assert next(applications)["job_id"] == "2"  # Most recently applied first
+    assert [app["job_id"] for app in applications] == ["1", "0"]
+
+
+def test_list_applications_status_filter_uses_index(db):
+    """Test status-filtered application listing seeks the composite index without a sort."""
+    plan = " ".join(
+        row["detail"] for row in db.conn.execute(
+            """
+            EXPLAIN QUERY PLAN
+            SELECT a.*, j.title, j.company, j.location
+            FROM applications a
+            JOIN jobs j ON a.job_id = j.job_id
+            WHERE a.status = ?
+            ORDER BY a.applied_at DESC
+            """,
+            ("applied",)
+        )
+    )
 
-        # List all
-        all_apps = db.list_applications()
-        assert len(all_apps) == 2
-
-        db.close()
+    assert "SEARCH a USING INDEX idx_applications_status_applied (status=?)" in plan
+    assert "USE TEMP B-TREE FOR ORDER BY" not in plan
 
 
 # ========== Company Enrichment Tests (Step 3) ==========
 
-def test_upsert_company_enrichment():
+def test_upsert_company_enrichment(db):
     """Test inserting and updating company enrichment."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        db = JobDatabase(db_path)
-        db.initialize_schema()
+    company_data = {
+        "company_name": "Anthropic, Inc.",
+        "company_size": "51-200 employees",
+        "company_industry": "AI",
+        "company_description": "AI safety research",
+        "company_specialties": ["AI", "Machine Learning"],
+    }
 
-        company_data = {
-            "company_name": "Anthropic, Inc.",
-            "company_size": "51-200 employees",
-            "company_industry": "AI",
-            "company_description": "AI safety research",
-            "company_specialties": ["AI", "Machine Learning"],
-        }
+    db.upsert_company_enrichment(company_data)
 
-        db.upsert_company_enrichment(company_data)
+    # Verify company exists
+    fetched = db.get_company_enrichment("Anthropic")
+    assert fetched is not None
+    assert fetched["company_size"] == "51-200 employees"
+    assert fetched["company_specialties"] == ["AI", "Machine Learning"]
 
-        # Verify company exists
-        fetched = db.get_company_enrichment("Anthropic")
-        assert fetched is not None
-        assert fetched["company_size"] == "51-200 employees"
-        assert fetched["company_specialties"] == ["AI", "Machine Learning"]
+    # Update company
+    company_data["company_size"] = "201-500 employees"
+    db.upsert_company_enrichment(company_data)
 
-        # Update company
-        company_data["company_size"] = "201-500 employees"
-        db.upsert_company_enrichment(company_data)
+    # Verify updated
+    fetched = db.get_company_enrichment("Anthropic")
+    assert fetched["company_size"] == "201-500 employees"
 
-        # Verify updated
-        fetched = db.get_company_enrichment("Anthropic")
-        assert fetched["company_size"] == "201-500 employees"
 
-        db.close()
-
-
-def test_get_companies_needing_refresh():
+def test_get_companies_needing_refresh(db):
     """Test getting companies that need refresh."""
-    from datetime import datetime, timezone, timedelta
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        db = JobDatabase(db_path)
-        db.initialize_schema()
-
-        # Insert company with old refresh date
-        now = datetime.now(timezone.utc)
-        old_company = {
-            "company_name": "Old Company",
-            "company_size": "100",
-        }
-        db.upsert_company_enrichment(old_company)
-
-        # Manually set next_refresh_at to past
+    # Insert company with old refresh date
+    now = datetime.now(timezone.utc)
+    old_company = {
+        "company_name": "Old Company",
+        "company_size": "100",
+    }
+    db.upsert_company_enrichment(old_company)
+
+    # Manually set next_refresh_at to past
+    with db.conn:
         db.conn.execute(
             "UPDATE company_enrichment SET next_refresh_at = ? WHERE company_name = ?",
             ((now - timedelta(days=1)).isoformat(), "Old Company")
         )
-        db.conn.commit()
 
-        # Insert company with future refresh date
-        recent_company = {
-            "company_name": "Recent Company",
-            "company_size": "50",
-        }
-        db.upsert_company_enrichment(recent_company)
+    # Insert company with future refresh date
+    recent_company = {
+        "company_name": "Recent Company",
+        "company_size": "50",
+    }
+    db.upsert_company_enrichment(recent_company)
 
-        # Get companies needing refresh
-        companies = db.get_companies_needing_refresh()
-        assert len(companies) == 1
-        assert companies[0] == "Old Company"
+    # Get companies needing refresh
+    companies = db.get_companies_needing_refresh()
+    assert len(companies) == 1
+    assert companies[0] == "Old Company"
 
-        db.close()
 
+def test_get_companies_needing_refresh_uses_index(db):
+    """Test the refresh cutoff is an index range scan over next_refresh_at."""
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    db.get_companies_needing_refresh()
+    db.conn.set_trace_callback(None)
 
-# ========== Job Changes Tests (Step 3) ==========
+    plan = " ".join(row["detail"] for row in db.conn.execute(f"EXPLAIN QUERY PLAN {statements[-1]}"))
+    assert "USING INDEX idx_company_refresh (next_refresh_at<?)" in plan
 
-def test_record_job_change():
-    """Test recording a job change."""
-    from datetime import datetime, timezone
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        db = JobDatabase(db_path)
-        db.initialize_schema()
-
-        # Create job first (foreign key constraint)
-        job = {
-            "job_id": "123",
-            "title": "ML Engineer",
-            "company": "Test Co",
-            "location": "SF",
-            "posted_date": "2026-02-15",
-            "posted_date_iso": "2026-02-15T10:00:00Z",
-            "scraped_at": datetime.now(timezone.utc).isoformat(),
-        }
-        db.upsert_jobs([job])
-
-        # Record change
-        db.record_job_change("123", "salary_max", "150000", "160000")
-
-        # Verify change recorded
-        cursor = db.conn.execute("SELECT * FROM job_changes WHERE job_id = ?", ("123",))
-        row = cursor.fetchone()
-        assert row is not None
-        assert dict(row)["field_name"] == "salary_max"
-        assert dict(row)["old_value"] == "150000"
-        assert dict(row)["new_value"] == "160000"
-
-        db.close()
 
+# ========== Job Changes Tests (Step 3) ==========
 
-def test_get_job_changes():
+def test_record_job_change(db):
+    """Test recording a job change."""
+    # Create job first (foreign key constraint)
+    job = {
+        **BASE_JOB,
+        "job_id": "123",
+        "title": "ML Engineer",
+    }
+    db.upsert_jobs([job])
+
+    # Record change
+    db.record_job_change("123", "salary_max", "150000", "160000")
+
+    # Verify change recorded
+    cursor = db.conn.execute("SELECT * FROM job_changes WHERE job_id = ?", ("123",))
+    row = cursor.fetchone()
+    assert row is not None
+    assert dict(row)["field_name"] == "salary_max"
+    assert dict(row)["old_value"] == "150000"
+    assert dict(row)["new_value"] == "160000"
+
+
+def test_get_job_changes(db):
     """Test querying job changes."""
-    from datetime import datetime, timezone, timedelta
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        db = JobDatabase(db_path)
-        db.initialize_schema()
-
-        # Create job
-        job = {
-            "job_id": "123",
-            "title": "ML Engineer",
-            "company": "Test Co",
-            "location": "SF",
-            "posted_date": "2026-02-15",
-            "posted_date_iso": "2026-02-15T10:00:00Z",
-            "scraped_at": datetime.now(timezone.utc).isoformat(),
-        }
-        db.upsert_jobs([job])
-
-        # Record recent change
-        db.record_job_change("123", "salary_max", "150000", "160000")
-
-        # Record old change
-        old_time = (datetime.now(timezone.utc) - timedelta(days=2)).isoformat()
+    # Create job
+    job = {
+        **BASE_JOB,
+        "job_id": "123",
+        "title": "ML Engineer",
+    }
+    db.upsert_jobs([job])
+
+    # Record recent change
+    db.record_job_change("123", "salary_max", "150000", "160000")
+
+    # Record old change
+    old_time = (datetime.now(timezone.utc) - timedelta(days=2)).isoformat()
+    with db.conn:
         db.conn.execute(
             """
             INSERT INTO job_changes (job_id, changed_at, field_name, old_value, new_value)
@@ -1175,284 +1142,427 @@ def test_get_job_changes():
             """,
             ("123", old_time, "salary_min", "120000", "130000")
         )
-        db.conn.commit()
 
-        # Get changes from last 24 hours
-        changes = db.get_job_changes(since_hours=24)
-        assert len(changes) == 1
-        assert changes[0]["field_name"] == "salary_max"
+    # Get changes from last 24 hours
+    changes = db.get_job_changes(since_hours=24)
+    assert len(changes) == 1
+    assert changes[0]["field_name"] == "salary_max"
 
-        # Get changes from last 3 days
-        changes = db.get_job_changes(since_hours=72)
-        assert len(changes) == 2
+    # Get changes from last 3 days
+    changes = db.get_job_changes(since_hours=72)
+    assert len(changes) == 2
 
-        db.close()
+
+def test_get_job_changes_uses_changed_at_index(db):
+    """Test the recent-changes cutoff is an index range scan, not a full table scan."""
+    plan = " ".join(
+        row["detail"] for row in db.conn.execute(
+            """
+            EXPLAIN QUERY PLAN
+            SELECT jc.*, j.title, j.company
+            FROM job_changes jc
+            JOIN jobs j ON jc.job_id = j.job_id
+            WHERE jc.changed_at >= ?
+            ORDER BY jc.changed_at DESC
+            """,
+            (datetime.now(timezone.utc).isoformat(),)
+        )
+    )
+
+    assert "SEARCH jc USING INDEX idx_job_changes_changed_at (changed_at>?)" in plan
+    assert "USE TEMP B-TREE FOR ORDER BY" not in plan
+
+
+def test_upsert_records_tracked_field_changes(db):
+    """Test the change-tracking trigger records diffs of tracked fields on upsert."""
+    job = {
+        **BASE_JOB,
+        "job_id": "123",
+        "title": "ML Engineer",
+        "salary_min": 100000,
+        "salary_max": 150000,
+        "number_of_applicants": "50 applicants",
+        "raw_description": "Old description",
+    }
+    db.upsert_jobs([job])
+
+    # First insert is not a change
+    assert _count(db, "job_changes") == 0
+
+    # Change salary_max and applicants, keep description
+    db.upsert_jobs([{
+        **job,
+        "salary_max": 170000,
+        "number_of_applicants": "75 applicants",
+    }])
+
+    changes = db.get_job_changes(since_hours=1)
+    by_field = {c["field_name"]: c for c in changes}
+    assert set(by_field) == {"salary_max", "number_of_applicants"}
+    assert by_field["number_of_applicants"]["old_value"] == "50 applicants"
+    assert by_field["number_of_applicants"]["new_value"] == "75 applicants"
+    assert float(by_field["salary_max"]["old_value"]) == 150000
+    assert float(by_field["salary_max"]["new_value"]) == 170000
+    assert all(c["job_id"] == "123" for c in changes)
+
+
+def test_upsert_without_changes_records_nothing(db):
+    """Test re-upserting an identical job does not record changes."""
+    job = {
+        **BASE_JOB,
+        "job_id": "123",
+        "title": "ML Engineer",
+        "salary_min": 100000,
+        "number_of_applicants": "50 applicants",
+        "raw_description": "Same description",
+    }
+    db.upsert_jobs([job])
+    db.upsert_jobs([dict(job, scraped_at=datetime.now(timezone.utc).isoformat())])
+
+    assert _count(db, "job_changes") == 0
+
+
+def test_upsert_preserves_application_and_change_history(db):
+    """Test re-scraping a job keeps its application and change history."""
+    job = {
+        **BASE_JOB,
+        "job_id": "123",
+        "title": "ML Engineer",
+        "number_of_applicants": "50 applicants",
+    }
+    db.upsert_jobs([job])
+    db.mark_job_applied("123", notes="Referral")
+    db.upsert_jobs([dict(job, number_of_applicants="75 applicants")])
+
+    # Re-scrape the job again; nothing above should be cascaded away
+    db.upsert_jobs([dict(job, number_of_applicants="75 applicants")])
+
+    applications = db.list_applications()
+    assert len(applications) == 1
+    assert applications[0]["notes"] == "Referral"
+    assert len(db.get_job_changes(since_hours=1)) == 1
 
 
 # ========== Analytics Tests (Step 4) ==========
 
-def test_get_cache_analytics_empty():
+def test_get_cache_analytics_empty(db):
     """Test analytics with empty database."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        db = JobDatabase(db_path)
-        db.initialize_schema()
+    analytics = db.get_cache_analytics()
 
-        analytics = db.get_cache_analytics()
+    # Verify structure
+    assert "jobs" in analytics
+    assert "scraping_profiles" in analytics
+    assert "applications" in analytics
+    assert "company_enrichment" in analytics
+    assert "cache_health" in analytics
 
-        # Verify structure
-        assert "jobs" in analytics
-        assert "scraping_profiles" in analytics
-        assert "applications" in analytics
-        assert "company_enrichment" in analytics
-        assert "cache_health" in analytics
-
-        # Verify empty counts
-        assert analytics["jobs"]["total"] == 0
-        assert analytics["applications"]["total"] == 0
-        assert analytics["company_enrichment"]["total"] == 0
-
-        db.close()
+    # Verify empty counts
+    assert analytics["jobs"]["total"] == 0
+    assert analytics["applications"]["total"] == 0
+    assert analytics["company_enrichment"]["total"] == 0
 
 
-def test_get_cache_analytics_populated():
+def test_get_cache_analytics_populated(db):
     """Test analytics with populated database."""
-    from datetime import datetime, timezone, timedelta
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        db = JobDatabase(db_path)
+    now = datetime.now(timezone.utc)
+
+    # Create jobs with different ages
+    jobs = [
+        {
+            **BASE_JOB,
+            "job_id": "fresh1",
+            "title": "Fresh Job",
+            "company": "Anthropic",
+            "location": "San Francisco, CA",
+            "posted_date_iso": now.isoformat(),
+            "scraped_at": (now - timedelta(hours=1)).isoformat(),  # Fresh (24h)
+        },
+        {
+            **BASE_JOB,
+            "job_id": "recent1",
+            "title": "Recent Job",
+            "company": "Google",
+            "location": "Mountain View, CA",
+            "posted_date": "2026-02-10",
+            "posted_date_iso": (now - timedelta(days=5)).isoformat(),
+            "scraped_at": (now - timedelta(days=5)).isoformat(),  # Recent (7d)
+        },
+        {
+            **BASE_JOB,
+            "job_id": "old1",
+            "title": "Old Job",
+            "company": "Meta",
+            "location": "Menlo Park, CA",
+            "posted_date": "2026-01-20",
+            "posted_date_iso": (now - timedelta(days=20)).isoformat(),
+            "scraped_at": (now - timedelta(days=20)).isoformat(),  # Old (30d)
+        },
+    ]
+    db.upsert_jobs(jobs)
+
+    # Create profile
+    profile_id = db.seed_default_profile()["id"]
+    db.update_profile_last_run(profile_id, (now - timedelta(hours=1)).isoformat())
+
+    # Mark one job as applied
+    db.mark_job_applied("fresh1")
+
+    # Add company enrichment
+    db.upsert_company_enrichment({
+        "company_name": "Anthropic",
+        "company_size": "51-200",
+    })
+
+    # Get analytics
+    analytics = db.get_cache_analytics()
+
+    # Verify job analytics
+    assert analytics["jobs"]["total"] == 3
+    assert analytics["jobs"]["by_age"]["fresh_24h"] == 1
+    assert analytics["jobs"]["by_age"]["recent_7d"] == 2
+    assert analytics["jobs"]["by_age"]["old_30d"] == 3
+    assert analytics["jobs"]["by_age"]["stale"] == 0
+
+    # Verify application status
+    assert analytics["jobs"]["by_application_status"]["not_applied"] == 2
+    assert analytics["jobs"]["by_application_status"]["applied"] == 1
+
+    # Verify top companies
+    assert len(analytics["jobs"]["top_companies"]) == 3
+    assert analytics["jobs"]["top_companies"][0]["company"] == "Anthropic"
+
+    # Verify top locations
+    assert len(analytics["jobs"]["top_locations"]) == 3
+
+    # Verify profiles
+    assert len(analytics["scraping_profiles"]) == 1
+    assert analytics["scraping_profiles"][0]["name"] == "default"
+    assert analytics["scraping_profiles"][0]["enabled"] is True
+
+    # Verify applications
+    assert analytics["applications"]["total"] == 1
+    assert analytics["applications"]["applied"] == 1
+
+    # Verify company enrichment
+    assert analytics["company_enrichment"]["total"] == 1
+
+    # Verify cache health
+    assert analytics["cache_health"]["size_mb"] >= 0  # May be 0 in test environment
+    assert analytics["cache_health"]["oldest_job"] is not None
+    assert analytics["cache_health"]["newest_job"] is not None
+
+
+def test_get_cache_analytics_cached_until_write(db, monkeypatch):
+    """Analytics are served from cache until a write lands, and callers get copies."""
+    calls = []
+    compute = JobDatabase._compute_cache_analytics
+
+    def counting_compute(self):
+        calls.append(1)
+        return compute(self)
+
+    monkeypatch.setattr(JobDatabase, "_compute_cache_analytics", counting_compute)
+
+    first = db.get_cache_analytics()
+    first["jobs"]["top_companies"].append("mutated")
+    second = db.get_cache_analytics()
+    assert len(calls) == 1
+    assert second["jobs"]["top_companies"] == []
+
+    db.upsert_jobs([{**BASE_JOB, "job_id": "a1", "company": "Anthropic"}])
+    assert db.get_cache_analytics()["jobs"]["total"] == 1
+    assert len(calls) == 2
+
+    monkeypatch.setattr("linkedin_mcp_server.db.ANALYTICS_CACHE_MAX_AGE", 0)
+    db.get_cache_analytics()
+    assert len(calls) == 3
+
+
+def test_get_cache_analytics_sees_other_connection_writes(tmp_path):
+    """Commits from another connection invalidate the cache via data_version."""
+    db_path = tmp_path / "analytics.db"
+    with JobDatabase(db_path) as db:
         db.initialize_schema()
+        assert db.get_cache_analytics()["company_enrichment"]["total"] == 0
 
-        now = datetime.now(timezone.utc)
-
-        # Create jobs with different ages
-        jobs = [
-            {
-                "job_id": "fresh1",
-                "title": "Fresh Job",
-                "company": "Anthropic",
-                "location": "San Francisco, CA",
-                "posted_date": "2026-02-15",
-                "posted_date_iso": now.isoformat(),
-                "scraped_at": (now - timedelta(hours=1)).isoformat(),  # Fresh (24h)
-            },
-            {
-                "job_id": "recent1",
-                "title": "Recent Job",
-                "company": "Google",
-                "location": "Mountain View, CA",
-                "posted_date": "2026-02-10",
-                "posted_date_iso": (now - timedelta(days=5)).isoformat(),
-                "scraped_at": (now - timedelta(days=5)).isoformat(),  # Recent (7d)
-            },
-            {
-                "job_id": "old1",
-                "title": "Old Job",
-                "company": "Meta",
-                "location": "Menlo Park, CA",
-                "posted_date": "2026-01-20",
-                "posted_date_iso": (now - timedelta(days=20)).isoformat(),
-                "scraped_at": (now - timedelta(days=20)).isoformat(),  # Old (30d)
-            },
-        ]
-        db.upsert_jobs(jobs)
+        with JobDatabase(db_path) as other:
+            other.upsert_company_enrichment({"company_name": "Anthropic"})
 
-        # Create profile
-        profile_id = db.seed_default_profile()
-        db.update_profile_last_run(profile_id, (now - timedelta(hours=1)).isoformat())
+        assert db.get_cache_analytics()["company_enrichment"]["total"] == 1
 
-        # Mark one job as applied
-        db.mark_job_applied("fresh1")
 
-        # Add company enrichment
-        db.upsert_company_enrichment({
-            "company_name": "Anthropic",
-            "company_size": "51-200",
-        })
+def test_scraped_at_epoch_normalizes_offsets(db):
+    """Test the generated epoch column agrees across equivalent ISO spellings."""
+    db.upsert_jobs([
+        {**BASE_JOB, "job_id": "1", "scraped_at": "2026-02-15T10:00:00+00:00"},
+        {**BASE_JOB, "job_id": "2", "scraped_at": "2026-02-15T10:00:00Z"},
+        {**BASE_JOB, "job_id": "3", "scraped_at": "2026-02-15T12:00:00.123456+02:00"},
+    ])
 
-        # Get analytics
-        analytics = db.get_cache_analytics()
+    epochs = {epoch for (epoch,) in db.conn.execute("SELECT scraped_at_epoch FROM jobs")}
+    assert epochs == {int(datetime(2026, 2, 15, 10, tzinfo=timezone.utc).timestamp())}
 
-        # Verify job analytics
-        assert analytics["jobs"]["total"] == 3
-        assert analytics["jobs"]["by_age"]["fresh_24h"] == 1
-        assert analytics["jobs"]["by_age"]["recent_7d"] == 2
-        assert analytics["jobs"]["by_age"]["old_30d"] == 3
-        assert analytics["jobs"]["by_age"]["stale"] == 0
 
-        # Verify application status
-        assert analytics["jobs"]["by_application_status"]["not_applied"] == 2
-        assert analytics["jobs"]["by_application_status"]["applied"] == 1
+def test_scraped_at_epoch_not_in_job_rows(db):
+    """Test the internal epoch column stays out of the job dicts callers get."""
+    db.upsert_jobs([{**BASE_JOB, "job_id": "1"}])
 
-        # Verify top companies
-        assert len(analytics["jobs"]["top_companies"]) == 3
-        assert analytics["jobs"]["top_companies"][0]["company"] == "Anthropic"
+    job = db.get_job("1")
+    assert "scraped_at_epoch" not in job
+    assert all("scraped_at_epoch" not in row for row in db.query_jobs())
 
-        # Verify top locations
-        assert len(analytics["jobs"]["top_locations"]) == 3
 
-        # Verify profiles
-        assert len(analytics["scraping_profiles"]) == 1
-        assert analytics["scraping_profiles"][0]["name"] == "default"
-        assert analytics["scraping_profiles"][0]["enabled"] is True
+def test_analytics_age_buckets_use_epoch_index(db):
+    """Test the age-bucket pass binds precomputed epoch cutoffs and range-scans idx_jobs_scraped_epoch."""
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    db.get_cache_analytics()
+    db.conn.set_trace_callback(None)
 
-        # Verify applications
-        assert analytics["applications"]["total"] == 1
-        assert analytics["applications"]["applied"] == 1
+    (bucket_sql,) = [sql for sql in statements if "COUNT(CASE" in sql]
+    assert "datetime(" not in bucket_sql and "strftime(" not in bucket_sql
 
-        # Verify company enrichment
-        assert analytics["company_enrichment"]["total"] == 1
+    plan = " ".join(row["detail"] for row in db.conn.execute(f"EXPLAIN QUERY PLAN {bucket_sql}"))
+    assert "SEARCH jobs USING INDEX idx_jobs_scraped_epoch (scraped_at_epoch>?)" in plan
 
-        # Verify cache health
-        assert analytics["cache_health"]["size_mb"] >= 0  # May be 0 in test environment
-        assert analytics["cache_health"]["oldest_job"] is not None
-        assert analytics["cache_health"]["newest_job"] is not None
 
-        db.close()
-
-
-def test_analytics_by_age_buckets():
+def test_analytics_by_age_buckets(db):
     """Test job age bucket counts."""
-    from datetime import datetime, timezone, timedelta
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        db = JobDatabase(db_path)
-        db.initialize_schema()
-
-        now = datetime.now(timezone.utc)
-
-        jobs = [
-            # Fresh (< 24h)
-            {
-                "job_id": "1",
-                "title": "Job 1",
-                "company": "A",
-                "location": "SF",
-                "posted_date": "2026-02-15",
-                "posted_date_iso": now.isoformat(),
-                "scraped_at": (now - timedelta(hours=12)).isoformat(),
-            },
-            # Recent (< 7d)
-            {
-                "job_id": "2",
-                "title": "Job 2",
-                "company": "A",
-                "location": "SF",
-                "posted_date": "2026-02-10",
-                "posted_date_iso": now.isoformat(),
-                "scraped_at": (now - timedelta(days=3)).isoformat(),
-            },
-            # Old (< 30d)
-            {
-                "job_id": "3",
-                "title": "Job 3",
-                "company": "A",
-                "location": "SF",
-                "posted_date": "2026-01-20",
-                "posted_date_iso": now.isoformat(),
-                "scraped_at": (now - timedelta(days=15)).isoformat(),
-            },
-            # Stale (> 30d)
-            {
-                "job_id": "4",
-                "title": "Job 4",
-                "company": "A",
-                "location": "SF",
-                "posted_date": "2025-12-01",
+    now = datetime.now(timezone.utc)
+
+    jobs = [
+        # Fresh (< 24h)
+        {
+            **BASE_JOB,
+            "job_id": "1",
+            "title": "Job 1",
+            "company": "A",
+            "posted_date_iso": now.isoformat(),
+            "scraped_at": (now - timedelta(hours=12)).isoformat(),
+        },
+        # Recent (< 7d)
+        {
+            **BASE_JOB,
+            "job_id": "2",
+            "title": "Job 2",
+            "company": "A",
+            "posted_date": "2026-02-10",
+            "posted_date_iso": now.isoformat(),
+            "scraped_at": (now - timedelta(days=3)).isoformat(),
+        },
+        # Old (< 30d)
+        {
+            **BASE_JOB,
+            "job_id": "3",
+            "title": "Job 3",
+            "company": "A",
+            "posted_date": "2026-01-20",
+            "posted_date_iso": now.isoformat(),
+            "scraped_at": (now - timedelta(days=15)).isoformat(),
+        },
+        # Stale (> 30d)
+        {
+            **BASE_JOB,
+            "job_id": "4",
+            "title": "Job 4",
+            "company": "A",
+            "posted_date": "2025-12-01",
+            "posted_date_iso": now.isoformat(),
+            "scraped_at": (now - timedelta(days=40)).isoformat(),
+        },
+    ]
+    db.upsert_jobs(jobs)
+
+    analytics = db.get_cache_analytics()
+
+    assert analytics["jobs"]["by_age"]["fresh_24h"] == 1
+    assert analytics["jobs"]["by_age"]["recent_7d"] == 2
+    assert analytics["jobs"]["by_age"]["old_30d"] == 3
+    assert analytics["jobs"]["by_age"]["stale"] == 1
+
+
+def test_analytics_top_companies(db):
+    """Test top companies ranking."""
+    now = datetime.now(timezone.utc)
+
+    # Create jobs from different companies
+    jobs = []
+    companies = [
+        ("Anthropic", 5),
+        ("Google", 3),
+        ("Meta", 2),
+    ]
+
+    for company, count in companies:
+        for i in range(count):
+            jobs.append({
+                **BASE_JOB,
+                "job_id": f"{company}_{i}",
+                "title": f"Job {i}",
+                "company": company,
                 "posted_date_iso": now.isoformat(),
-                "scraped_at": (now - timedelta(days=40)).isoformat(),
-            },
-        ]
-        db.upsert_jobs(jobs)
+                "scraped_at": now.isoformat(),
+            })
 
-        analytics = db.get_cache_analytics()
+    db.upsert_jobs(jobs)
 
-        assert analytics["jobs"]["by_age"]["fresh_24h"] == 1
-        assert analytics["jobs"]["by_age"]["recent_7d"] == 2
-        assert analytics["jobs"]["by_age"]["old_30d"] == 3
-        assert analytics["jobs"]["by_age"]["stale"] == 1
+    analytics = db.get_cache_analytics()
 
-        db.close()
+    # Verify top companies ordered by count
+    top_companies = analytics["jobs"]["top_companies"]
+    assert len(top_companies) == 3
+    assert top_companies[0]["company"] == "Anthropic"
+    assert top_companies[0]["count"] == 5
+    assert top_companies[1]["company"] == "Google"
+    assert top_companies[1]["count"] == 3
+    assert top_companies[2]["company"] == "Meta"
+    assert top_companies[2]["count"] == 2
 
 
-def test_analytics_top_companies():
-    """Test top companies ranking."""
-    from datetime import datetime, timezone
+def test_company_counts_follow_job_writes(db):
+    """Test the company_counts triggers track inserts, renames and deletes."""
+    def counts():
+        return dict(db.conn.execute("SELECT normalized_company_name, n FROM company_counts"))
 
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        db = JobDatabase(db_path)
-        db.initialize_schema()
-
-        now = datetime.now(timezone.utc)
-
-        # Create jobs from different companies
-        jobs = []
-        companies = [
-            ("Anthropic", 5),
-            ("Google", 3),
-            ("Meta", 2),
-        ]
-
-        for company, count in companies:
-            for i in range(count):
-                jobs.append({
-                    "job_id": f"{company}_{i}",
-                    "title": f"Job {i}",
-                    "company": company,
-                    "location": "SF",
-                    "posted_date": "2026-02-15",
-                    "posted_date_iso": now.isoformat(),
-                    "scraped_at": now.isoformat(),
-                })
-
-        db.upsert_jobs(jobs)
+    db.upsert_jobs([
+        {**BASE_JOB, "job_id": "1", "company": "Anthropic"},
+        {**BASE_JOB, "job_id": "2", "company": "Anthropic, Inc."},
+        {**BASE_JOB, "job_id": "3", "company": "Google"},
+    ])
+    assert counts() == {"anthropic": 2, "google": 1}
 
-        analytics = db.get_cache_analytics()
+    # Re-upserting an existing job doesn't double count; moving it to another company does
+    db.upsert_jobs([{**BASE_JOB, "job_id": "3", "company": "Meta"}])
+    assert counts() == {"anthropic": 2, "meta": 1}
 
-        # Verify top companies ordered by count
-        top_companies = analytics["jobs"]["top_companies"]
-        assert len(top_companies) == 3
-        assert top_companies[0]["company"] == "Anthropic"
-        assert top_companies[0]["count"] == 5
-        assert top_companies[1]["company"] == "Google"
-        assert top_companies[1]["count"] == 3
-        assert top_companies[2]["company"] == "Meta"
-        assert top_companies[2]["count"] == 2
+    with db.conn:
+        db.conn.execute("DELETE FROM jobs WHERE job_id IN ('1', '2')")
+    assert counts() == {"meta": 1}
 
-        db.close()
+    # A rebuild from jobs matches the trigger-maintained counts
+    db.rebuild_company_counts()
+    assert counts() == {"meta": 1}
 
 
-def test_analytics_profile_next_scrape():
+def test_analytics_profile_next_scrape(db):
     """Test profile next_scrape_at computation."""
-    from datetime import datetime, timezone, timedelta
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        db = JobDatabase(db_path)
-        db.initialize_schema()
-
-        # Create profile with last_scraped_at
-        profile_id = db.upsert_profile({
-            "name": "test",
-            "location": "SF",
-            "keywords": "ML",
-            "refresh_interval": 7200,  # 2 hours
-        })
-
-        now = datetime.now(timezone.utc)
-        last_scraped = now - timedelta(hours=1)
-        db.update_profile_last_run(profile_id, last_scraped.isoformat())
-
-        analytics = db.get_cache_analytics()
-
-        profile = analytics["scraping_profiles"][0]
-        assert profile["last_scraped_at"] == last_scraped.isoformat()
-
-        # next_scrape_at should be last_scraped + refresh_interval
-        expected_next = last_scraped + timedelta(seconds=7200)
-        assert profile["next_scrape_at"] == expected_next.isoformat()
-
-        db.close()
+    # Create profile with last_scraped_at
+    profile_id = db.upsert_profile({
+        "name": "test",
+        "location": "SF",
+        "keywords": "ML",
+        "refresh_interval": 7200,  # 2 hours
+    })
+
+    now = datetime.now(timezone.utc)
+    last_scraped = now - timedelta(hours=1)
+    db.update_profile_last_run(profile_id, last_scraped.isoformat())
+
+    analytics = db.get_cache_analytics()
+
+    profile = analytics["scraping_profiles"][0]
+    assert profile["last_scraped_at"] == last_scraped.isoformat()
+
+    # next_scrape_at should be last_scraped + refresh_interval
+    expected_next = last_scraped + timedelta(seconds=7200)
+    assert profile["next_scrape_at"] == expected_next.isoformat()
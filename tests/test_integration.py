@@ -6,16 +6,14 @@ from pathlib import Path
 
 import pytest
 
-from linkedin_mcp_server.db import JobDatabase
 from linkedin_mcp_server.background_scraper import BackgroundScraperService
 
 
 @pytest.mark.asyncio
-async def test_database_and_scraper_lifecycle(tmp_path):
+async def test_database_and_scraper_lifecycle(fresh_db):
     """Test database + background scraper initialization and shutdown"""
-    db_path = tmp_path / "test.db"
-    db = JobDatabase(db_path)
-    db.initialize_schema()
+    # On disk on purpose: exercises WAL and the reader pool alongside workers
+    db = fresh_db
     db.seed_default_profile()
 
     # Verify default profile created
@@ -35,42 +33,31 @@ async def test_database_and_scraper_lifecycle(tmp_path):
     # Verify all workers cancelled (tasks remain in dict but are cancelled)
     assert all(task.cancelled() or task.done() for task in scraper.worker_tasks.values())
 
-    db.close()
-
 
 @pytest.mark.asyncio
-async def test_cache_query_performance(tmp_path):
+async def test_cache_query_performance(db):
     """Test that database queries are fast (<100ms)"""
-    db_path = tmp_path / "test.db"
-    db = JobDatabase(db_path)
-    db.initialize_schema()
 
-    # Insert 1000 test jobs
-    jobs = [
-        {
-            "job_id": str(i),
-            "title": f"Engineer {i}",
-            "company": "Test Company",
-            "normalized_company_name": "test company",
-            "location": "San Francisco, CA",
-            "posted_date": "2 days ago",
-            "posted_date_iso": "2026-02-13T10:00:00Z",
-            "scraped_at": "2026-02-15T10:00:00Z",
-            "url": f"https://linkedin.com/jobs/{i}",
-            "source": "linkedin",
-            "raw_description": f"Description for job {i}",
-            "employment_type": "Full-time",
-            "seniority_level": "Mid-Senior level",
-            "job_function": "Engineering",
-            "industries": "Technology",
-            "number_of_applicants": "10-50",
-            "benefits_badge": "N/A",
-            "remote_eligible": i % 2 == 0,  # Half remote
-            "visa_sponsorship": i % 3 == 0,  # One third visa
-        }
+    # Insert 1000 test jobs, streamed as column-ordered tuples
+    columns = (
+        "job_id", "title", "company", "normalized_company_name", "location",
+        "posted_date", "posted_date_iso", "scraped_at", "url", "source",
+        "raw_description", "employment_type", "seniority_level", "job_function",
+        "industries", "number_of_applicants", "benefits_badge",
+        "remote_eligible", "visa_sponsorship",
+    )
+    rows = (
+        (
+            str(i), f"Engineer {i}", "Test Company", "test company", "San Francisco, CA",
+            "2 days ago", "2026-02-13T10:00:00Z", "2026-02-15T10:00:00Z",
+            f"https://linkedin.com/jobs/{i}", "linkedin", f"Description for job {i}",
+            "Full-time", "Mid-Senior level", "Engineering", "Technology", "10-50", "N/A",
+            i % 2 == 0,  # Half remote
+            i % 3 == 0,  # One third visa
+        )
         for i in range(1000)
-    ]
-    db.upsert_jobs(jobs)
+    )
+    assert db.upsert_jobs_rows(columns, rows) == 1000
 
     # Measure query time
     start = time.time()
@@ -90,15 +77,10 @@ async def test_cache_query_performance(tmp_path):
     assert len(remote_jobs) <= 25
     assert all(job["remote_eligible"] == 1 for job in remote_jobs)
 
-    db.close()
-
 
 @pytest.mark.asyncio
-async def test_profile_management_workflow(tmp_path):
+async def test_profile_management_workflow(db):
     """Test profile add → update → disable → delete"""
-    db_path = tmp_path / "test.db"
-    db = JobDatabase(db_path)
-    db.initialize_schema()
 
     # Add profile
     profile = {
@@ -138,15 +120,10 @@ async def test_profile_management_workflow(tmp_path):
     deleted = db.get_profile(profile_id)
     assert deleted is None
 
-    db.close()
-
 
 @pytest.mark.asyncio
-async def test_application_tracking_workflow(tmp_path):
+async def test_application_tracking_workflow(db):
     """Test mark applied → update status → query by status"""
-    db_path = tmp_path / "test.db"
-    db = JobDatabase(db_path)
-    db.initialize_schema()
 
     # Create test jobs
     jobs = [
@@ -199,15 +176,10 @@ async def test_application_tracking_workflow(tmp_path):
     all_apps = db.list_applications()
     assert len(all_apps) == 3
 
-    db.close()
-
 
 @pytest.mark.asyncio
-async def test_analytics_completeness(tmp_path):
+async def test_analytics_completeness(db):
     """Test get_cache_analytics returns complete structure"""
-    db_path = tmp_path / "test.db"
-    db = JobDatabase(db_path)
-    db.initialize_schema()
     db.seed_default_profile()
 
     # Insert sample data
@@ -253,15 +225,10 @@ async def test_analytics_completeness(tmp_path):
     assert "applications" in analytics
     assert analytics["applications"]["total"] == 2
 
-    db.close()
-
 
 @pytest.mark.asyncio
-async def test_job_changes_tracking(tmp_path):
+async def test_job_changes_tracking(db):
     """Test get_job_changes detects field changes"""
-    db_path = tmp_path / "test.db"
-    db = JobDatabase(db_path)
-    db.initialize_schema()
 
     # Insert initial job
     job = {
@@ -300,5 +267,3 @@ async def test_job_changes_tracking(tmp_path):
 
     assert len(changes) >= 1
     assert any(c["job_id"] == "test123" and c["field_name"] == "salary_max" for c in changes)
-
-    db.close()
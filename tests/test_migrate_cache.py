@@ -5,8 +5,14 @@ from pathlib import Path
 from datetime import datetime, timezone
 
 import pytest
-
-from linkedin_mcp_server.migrate_cache import migrate_jsonl_to_sqlite, transform_job_record
+from loguru import logger
+
+from linkedin_mcp_server.migrate_cache import (
+    _iter_jsonl_lines,
+    _split_jsonl,
+    migrate_jsonl_to_sqlite,
+    transform_job_record,
+)
 from linkedin_mcp_server.db import JobDatabase
 
 
@@ -99,6 +105,77 @@ def test_migrate_jsonl_to_sqlite_empty(tmp_path):
     assert count == 0
 
 
+def test_iter_jsonl_lines(tmp_path):
+    """Test memory-mapped line splitting, including a final line without newline and empty files"""
+    jsonl_path = tmp_path / "jobs.jsonl"
+    jsonl_path.write_bytes(b'{"a": 1}\n\n{"b": 2}')
+    assert [bytes(line) for line in _iter_jsonl_lines(jsonl_path)] == [b'{"a": 1}', b"", b'{"b": 2}']
+
+    empty_path = tmp_path / "empty.jsonl"
+    empty_path.write_bytes(b"")
+    assert list(_iter_jsonl_lines(empty_path)) == []
+
+    assert migrate_jsonl_to_sqlite(empty_path, tmp_path / "test.db", backup=False) == 0
+
+
+def test_migrate_jsonl_to_sqlite_batches(tmp_path, monkeypatch):
+    """Test migration upserts in fixed-size batches and flushes the remainder"""
+    monkeypatch.setattr("linkedin_mcp_server.migrate_cache.MIGRATION_BATCH_SIZE", 2)
+    batch_sizes = []
+    upsert_jobs = JobDatabase.upsert_jobs
+
+    def recording_upsert(self, jobs):
+        batch_sizes.append(len(jobs))
+        return upsert_jobs(self, jobs)
+
+    monkeypatch.setattr(JobDatabase, "upsert_jobs", recording_upsert)
+
+    jsonl_path = tmp_path / "jobs.jsonl"
+    jsonl_path.write_text("".join(json.dumps({"job_id": str(i), "title": f"Job {i}"}) + "\n" for i in range(5)))
+
+    assert migrate_jsonl_to_sqlite(jsonl_path, tmp_path / "test.db", backup=False) == 5
+    assert batch_sizes == [2, 2, 1]
+
+
+def test_split_jsonl(tmp_path):
+    """Test byte ranges cover the file exactly and end on line boundaries"""
+    jsonl_path = tmp_path / "jobs.jsonl"
+    data = b'{"a": 1}\n{"bb": 22}\n\n{"c": 3}'
+    jsonl_path.write_bytes(data)
+
+    ranges = _split_jsonl(jsonl_path, chunk_bytes=4)
+
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    assert all(prev_end == start for (_, prev_end), (start, _) in zip(ranges, ranges[1:]))
+    assert all(data[end - 1:end] == b"\n" for _, end in ranges[:-1])
+    lines = [bytes(line) for start, end in ranges for line in _iter_jsonl_lines(jsonl_path, start, end)]
+    assert lines == [b'{"a": 1}', b'{"bb": 22}', b"", b'{"c": 3}']
+
+    empty_path = tmp_path / "empty.jsonl"
+    empty_path.write_bytes(b"")
+    assert _split_jsonl(empty_path, chunk_bytes=4) == []
+
+
+def test_migrate_jsonl_to_sqlite_parallel(tmp_path, monkeypatch):
+    """Test large caches are transformed in worker processes with the same result"""
+    monkeypatch.setattr("linkedin_mcp_server.migrate_cache.PARALLEL_MIGRATION_MIN_BYTES", 0)
+    monkeypatch.setattr("linkedin_mcp_server.migrate_cache.PARALLEL_CHUNK_BYTES", 64)
+    monkeypatch.setattr("linkedin_mcp_server.migrate_cache.MIGRATION_WORKERS", 2)
+
+    jsonl_path = tmp_path / "jobs.jsonl"
+    lines = [json.dumps({"job_id": str(i), "title": f"Job {i}"}) for i in range(20)]
+    lines.insert(7, "invalid json line")
+    lines.append(json.dumps({"job_id": "0", "title": "Job 0 updated"}))
+    jsonl_path.write_text("\n".join(lines) + "\n")
+
+    assert migrate_jsonl_to_sqlite(jsonl_path, tmp_path / "test.db", backup=False) == 21
+
+    db = JobDatabase(tmp_path / "test.db")
+    assert db.conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0] == 20
+    assert db.get_job("0")["title"] == "Job 0 updated"  # later duplicates still win
+    db.close()
+
+
 def test_migrate_jsonl_to_sqlite_with_jobs(tmp_path):
     """Test migration with sample jobs"""
     # Create sample JSONL file
@@ -179,6 +256,27 @@ def test_migrate_jsonl_to_sqlite_malformed_json(tmp_path):
     db.close()
 
 
+@pytest.mark.parametrize("use_stdlib_json", [False, True], ids=["default", "stdlib_json"])
+def test_migrate_jsonl_to_sqlite_undecodable_line(tmp_path, monkeypatch, use_stdlib_json):
+    """Test a non-UTF-8 line is reported as a parse error and skipped"""
+    if use_stdlib_json:
+        monkeypatch.setattr("linkedin_mcp_server.migrate_cache._json", json)
+        monkeypatch.setattr("linkedin_mcp_server.migrate_cache._LOADS_ACCEPTS_BUFFERS", False)
+
+    jsonl_path = tmp_path / "jobs.jsonl"
+    jsonl_path.write_bytes(b'{"job_id": "123", "title": "Valid"}\n{"title": "\xff\xfe"}\n')
+
+    messages = []
+    sink_id = logger.add(messages.append, level="ERROR", format="{message}")
+    try:
+        assert migrate_jsonl_to_sqlite(jsonl_path, tmp_path / "test.db", backup=False) == 1
+    finally:
+        logger.remove(sink_id)
+
+    assert len(messages) == 1
+    assert messages[0].startswith("Error parsing JSONL line 2")
+
+
 def test_migrate_jsonl_to_sqlite_no_backup(tmp_path):
     """Test migration without backup"""
     jsonl_path = tmp_path / "jobs.jsonl"
@@ -1,9 +1,16 @@
+import asyncio
+import time
+from dataclasses import asdict
+from datetime import datetime
 from pathlib import Path
+from types import MappingProxyType
+from unittest.mock import MagicMock, patch
 
 import pytest
 from bs4 import BeautifulSoup
 
 from linkedin_mcp_server.scraper import (
+    HTML_PARSER,
     JobDetail,
     JobSummary,
     extract_description_insights,
@@ -11,49 +18,68 @@ from linkedin_mcp_server.scraper import (
     extract_salary_structured,
     extract_skills,
     extract_visa_sponsorship,
+    fetch_job_details,
     parse_job_detail_page,
     parse_search_card,
+    parse_search_page,
+    relative_date_to_iso,
 )
 
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
 
-
-@pytest.fixture
+# Exact field values parsed from the HTML fixtures (substring checks stay
+# separate); read-only so no test can mutate them for the rest of the session
+EXPECTED_SUMMARY = MappingProxyType({
+    "job_id": "4271043001",
+    "title": "ML Engineer",
+    "company": "Instawork",
+    "location": "San Francisco, CA",
+    "posted_date": "2 days ago",
+    "posted_date_iso": "2026-01-29",
+    "benefits_badge": "Actively Hiring",
+})
+EXPECTED_DETAIL = MappingProxyType({
+    "job_id": "4271043001",
+    "source": "linkedin",
+    "title": "ML Engineer",
+    "company": "Instawork",
+    "location": "San Francisco, CA",
+    "posted_date": "2 days ago",
+    "number_of_applicants": "Over 200 applicants",
+})
+
+
+@pytest.fixture(scope="session")
 def search_card_html():
-    """Load search card HTML fixture"""
-    return (FIXTURES_DIR / "search_card.html").read_text()
+    """Load search card HTML fixture (raw bytes; the parser decodes them)"""
+    return (FIXTURES_DIR / "search_card.html").read_bytes()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def detail_page_html():
-    """Load detail page HTML fixture"""
-    return (FIXTURES_DIR / "detail_page.html").read_text()
+    """Load detail page HTML fixture (raw bytes; the parser decodes them)"""
+    return (FIXTURES_DIR / "detail_page.html").read_bytes()
 
 
 def test_parse_search_card(search_card_html):
     """Test parsing a search result card"""
-    soup = BeautifulSoup(search_card_html, "html.parser")
+    soup = BeautifulSoup(search_card_html, HTML_PARSER)
     card = soup.select_one("li.base-card")
 
     summary = parse_search_card(card)
 
     assert isinstance(summary, JobSummary)
-    assert summary.job_id == "4271043001"
-    assert summary.title == "ML Engineer"
-    assert summary.company == "Instawork"
+    fields = asdict(summary)
+    assert {key: fields[key] for key in EXPECTED_SUMMARY} == EXPECTED_SUMMARY
     assert "instawork" in summary.company_url.lower()
-    assert summary.location == "San Francisco, CA"
-    assert summary.posted_date == "2 days ago"
-    assert summary.posted_date_iso == "2026-01-29"
     assert "4271043001" in summary.job_url
-    assert summary.benefits_badge == "Actively Hiring"
 
 
 def test_parse_search_card_missing_fields():
     """Test parsing a card with missing elements returns sensible defaults"""
     # Empty card
     html = '<li class="base-card"></li>'
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, HTML_PARSER)
     card = soup.select_one("li.base-card")
 
     summary = parse_search_card(card)
@@ -64,20 +90,55 @@ def test_parse_search_card_missing_fields():
     assert summary.company == "N/A"
 
 
+def test_parse_search_page():
+    """Test parsing all cards from one results page, skipping cards without an ID"""
+    html = """
+    <ul>
+      <li><div class="job-search-card" data-entity-urn="urn:li:jobPosting:111">
+        <h3 class="base-search-card__title">First</h3></div></li>
+      <li><div class="job-search-card"><h3 class="base-search-card__title">No ID</h3></div></li>
+      <li><div class="job-search-card" data-entity-urn="urn:li:jobPosting:222">
+        <h3 class="base-search-card__title">Second</h3></div></li>
+    </ul>
+    """
+    summaries = parse_search_page(html)
+
+    assert [(s.job_id, s.title) for s in summaries] == [("111", "First"), ("222", "Second")]
+    assert parse_search_page("") == []
+
+
+def test_parse_search_card_attribute_fields():
+    """URL/date attributes come from the text element, or the first later element that has them"""
+    html = """
+    <div class="job-search-card" data-entity-urn="urn:li:jobPosting:111">
+      <h4 class="base-search-card__subtitle"><a href="https://www.linkedin.com/company/acme">Acme</a></h4>
+      <time class="job-search-card__listdate" datetime="2026-01-29">2 days ago</time>
+    </div>
+    """
+    summary = parse_search_page(html)[0]
+    assert (summary.company, summary.company_url) == ("Acme", "https://www.linkedin.com/company/acme")
+    assert (summary.posted_date, summary.posted_date_iso) == ("2 days ago", "2026-01-29")
+
+    html = """
+    <div class="job-search-card" data-entity-urn="urn:li:jobPosting:222">
+      <h4 class="base-search-card__subtitle"><a>Acme</a><a href="/company/acme">link</a></h4>
+      <time class="job-search-card__listdate">2 days ago</time>
+    </div>
+    """
+    summary = parse_search_page(html)[0]
+    assert (summary.company, summary.company_url) == ("Acme", "/company/acme")
+    assert (summary.posted_date, summary.posted_date_iso) == ("2 days ago", "N/A")
+
+
 def test_parse_job_detail_page(detail_page_html):
     """Test parsing a job detail page"""
     job_id = "4271043001"
     detail = parse_job_detail_page(detail_page_html, job_id)
 
     assert isinstance(detail, JobDetail)
-    assert detail.job_id == job_id
-    assert detail.source == "linkedin"
-    assert detail.title == "ML Engineer"
-    assert detail.company == "Instawork"
+    fields = asdict(detail)
+    assert {key: fields[key] for key in EXPECTED_DETAIL} == EXPECTED_DETAIL
     assert "instawork" in detail.company_url.lower()
-    assert detail.location == "San Francisco, CA"
-    assert detail.posted_date == "2 days ago"
-    assert detail.number_of_applicants == "Over 200 applicants"
     assert "$160,000" in detail.salary
     assert "We are seeking an innovative ML Engineer" in detail.raw_description
     assert "Entry level" in detail.seniority_level
@@ -86,37 +147,121 @@ def test_parse_job_detail_page(detail_page_html):
     assert "Technology" in detail.industries
 
 
-def test_parse_job_detail_page_partial():
-    """Test detail page with missing optional fields returns N/A"""
-    # Minimal HTML with only required fields
+def test_parse_job_detail_page_criteria_and_easy_apply():
+    """Criteria items and either easy-apply marker are picked up from inline HTML"""
     html = """
     <div>
       <h2 class="top-card-layout__title">Test Job</h2>
+      <button aria-label="Easy Apply to Test Job">Apply</button>
+      <ul>
+        <li class="description__job-criteria-item"><h3>Seniority level</h3><span>Mid-Senior level</span></li>
+        <li class="description__job-criteria-item"><h3>Employment type</h3><span>Full-time</span></li>
+      </ul>
     </div>
     """
-    job_id = "123"
-    detail = parse_job_detail_page(html, job_id)
+    detail = parse_job_detail_page(html, "123")
+
+    assert detail.easy_apply is True
+    assert detail.seniority_level == "Seniority level\nMid-Senior level"
+    assert detail.employment_type == "Employment type\nFull-time"
+
+    detail = parse_job_detail_page('<div><a class="jobs-apply-button--top-card">Apply</a></div>', "124")
+    assert detail.easy_apply is True
+    assert parse_job_detail_page("<div></div>", "125").easy_apply is False
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("2 days ago", "2026-01-29"),
+    ("1 week ago", "2026-01-24"),
+    ("3 weeks ago", "2026-01-10"),
+    ("1 month ago", "2026-01-01"),
+    ("5 hours ago", "2026-01-31"),
+    ("Reposted 30+ minutes ago", "2026-01-31"),
+    ("2 Days Ago", "2026-01-29"),
+    ("Yesterday", None),
+    ("N/A", None),
+    ("", None),
+])
+def test_relative_date_to_iso(text, expected):
+    """Test relative posting dates convert to ISO dates against a fixed clock"""
+    assert relative_date_to_iso(text, now=datetime(2026, 1, 31, 12, 0)) == expected
 
-    assert isinstance(detail, JobDetail)
-    assert detail.job_id == job_id
-    assert detail.title == "Test Job"
-    assert detail.company == "N/A"
-    assert detail.salary == "N/A"
-    assert detail.skills == []  # Changed from "N/A" to [] since skills is now list[str]
-    assert detail.company_details == "N/A"
 
+def test_parse_job_detail_page_relative_posted_date(monkeypatch):
+    """Detail pages without a datetime attribute derive posted_date_iso from the text"""
 
-def test_parse_job_detail_page_invalid_html():
-    """Test parsing invalid HTML gracefully"""
-    html = "<div>Invalid</div>"
-    job_id = "999"
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return cls(2026, 1, 31, 12, 0)
+
+    monkeypatch.setattr("linkedin_mcp_server.scraper.datetime", FrozenDatetime)
+    html = '<div><span class="posted-time-ago__text">1 day ago</span></div>'
+    detail = parse_job_detail_page(html, "123")
+
+    assert detail.posted_date == "1 day ago"
+    assert detail.posted_date_iso == "2026-01-30"
+
+
+def test_parse_job_detail_page_bytes():
+    """Raw UTF-8 bytes parse the same as the decoded text"""
+    html = """
+    <div>
+      <h2 class="top-card-layout__title">Ingénieur ML</h2>
+      <div class="salary compensation__salary">€60K - €80K</div>
+    </div>
+    """
+    detail = parse_job_detail_page(html.encode("utf-8"), "123")
+
+    assert detail.title == "Ingénieur ML"
+    assert detail.salary == "€60K - €80K"
+    assert detail.salary_currency == "EUR"
+
+
+@pytest.mark.parametrize("html, job_id, expected", [
+    pytest.param(
+        '<div><h2 class="top-card-layout__title">Test Job</h2></div>',
+        "123",
+        # skills is a list[str], so missing skills are [] rather than "N/A"
+        {"title": "Test Job", "company": "N/A", "salary": "N/A", "skills": [], "company_details": "N/A"},
+        id="partial",
+    ),
+    pytest.param(
+        "<div>Invalid</div>",
+        "999",
+        # Most fields should be N/A since selectors won't match
+        {"company": "N/A", "location": "N/A"},
+        id="invalid_html",
+    ),
+])
+def test_parse_job_detail_page_missing_fields(html, job_id, expected):
+    """Test detail pages with missing or unmatched elements fall back to N/A"""
     detail = parse_job_detail_page(html, job_id)
 
     assert isinstance(detail, JobDetail)
+    fields = asdict(detail)
+    assert {key: fields[key] for key in expected} == expected
     assert detail.job_id == job_id
-    # Most fields should be N/A since selectors won't match
-    assert detail.company == "N/A"
-    assert detail.location == "N/A"
+
+
+async def test_fetch_job_details_runs_concurrently():
+    """Test detail fetches overlap up to the semaphore limit instead of running serially"""
+    latency = 0.05
+
+    async def fake_request(client, url, semaphore):
+        async with semaphore:
+            await asyncio.sleep(latency)
+        return MagicMock(text="<div>Invalid</div>")
+
+    job_ids = [str(i) for i in range(10)]
+    with patch("linkedin_mcp_server.scraper.request_with_backoff", side_effect=fake_request):
+        start = time.perf_counter()
+        details = await fetch_job_details(MagicMock(), job_ids, asyncio.Semaphore(5))
+        elapsed = time.perf_counter() - start
+
+    assert [d.job_id for d in details] == job_ids
+    # 10 jobs / 5 concurrent ≈ 2 × latency; serial would take 10 × latency
+    assert elapsed < 5 * latency
 
 
 # ========== Salary Parsing Tests (Step 5) ==========
@@ -228,6 +373,16 @@ def test_extract_salary_structured_invalid():
     assert result["max"] is None
 
 
+def test_extract_salary_structured_returns_fresh_dict():
+    """Parses are memoized, but each call returns its own mutable dict."""
+    first = extract_salary_structured("$120K - $180K")
+    first["min"] = 0
+
+    second = extract_salary_structured("$120K - $180K")
+    assert second is not first
+    assert second["min"] == 120000
+
+
 # ========== Remote/Visa/Skills/Description Insights Tests (Step 6) ==========
 
 
@@ -247,6 +402,13 @@ def test_extract_remote_eligibility_negative():
     assert extract_remote_eligibility("") is False
 
 
+def test_extract_remote_eligibility_case_and_substring():
+    """Keywords match case-insensitively anywhere in the text, as substrings."""
+    assert extract_remote_eligibility("WFH two days a week") is True
+    assert extract_remote_eligibility("Engineers work REMOTELY across time zones") is True
+    assert extract_remote_eligibility("A distributedteam") is True
+
+
 def test_extract_visa_sponsorship_positive():
     """Test visa sponsorship detection with positive keywords."""
     assert extract_visa_sponsorship("H1B sponsorship available") is True
@@ -349,6 +511,21 @@ A Master's degree in Computer Science is required."""
     assert "Build" in resp_preview or "Design" in resp_preview or "Develop" in resp_preview
 
 
+def test_extract_description_insights_responsibilities_capped():
+    """Only the first three responsibility lines make the preview, stripped and in order."""
+    description = "\n".join([
+        "About us.",
+        "  Build pipelines.  ",
+        "Lead the team.",
+        "Deploy models.",
+        "Create dashboards.",
+    ])
+
+    insights = extract_description_insights(description)
+
+    assert insights["key_responsibilities_preview"] == "Build pipelines. • Lead the team. • Deploy models."
+
+
 def test_extract_description_insights_empty():
     """Test extracting insights from empty description."""
     insights = extract_description_insights("")